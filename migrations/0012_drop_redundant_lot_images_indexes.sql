@@ -0,0 +1,15 @@
+-- Migration 0012: Drop lot_images indexes covered by the polling indexes
+-- Schema version: 17
+--
+-- download_status and analysis_status are the leading columns of
+-- idx_lot_images_dl_status_created and idx_lot_images_an_status_created, so the
+-- single-column indexes only add write cost.  The partial failed-images index
+-- was never chosen by the planner for get_failed().
+
+BEGIN TRANSACTION;
+
+DROP INDEX IF EXISTS idx_lot_images_download_status;
+DROP INDEX IF EXISTS idx_lot_images_analysis_status;
+DROP INDEX IF EXISTS idx_lot_images_failed_created;
+
+COMMIT;
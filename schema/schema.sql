@@ -1,4 +1,4 @@
--- Troostwatch schema version: 8
+-- Troostwatch schema version: 17
 -- SQLite schema for Troostwatch
 --
 -- This file is the canonical source of truth for new databases. The schema
@@ -96,6 +96,9 @@ CREATE TABLE IF NOT EXISTS lots (
 );
 
 CREATE INDEX IF NOT EXISTS idx_lots_auction_id ON lots (auction_id);
+-- Lot code lookups without an auction code (LotRepository.get_id); lookups
+-- scoped to an auction use the UNIQUE (auction_id, lot_code) index.
+CREATE INDEX IF NOT EXISTS idx_lots_lot_code ON lots (lot_code);
 CREATE INDEX IF NOT EXISTS idx_lots_current_bid_buyer_id ON lots (current_bid_buyer_id);
 
 -- Table storing the positions a buyer has on individual lots. Each record
@@ -141,6 +144,8 @@ CREATE TABLE IF NOT EXISTS bid_history (
 );
 
 CREATE INDEX IF NOT EXISTS idx_bid_history_lot_id ON bid_history (lot_id);
+-- Serves the per-lot "most recent first" bid history read without a sort.
+CREATE INDEX IF NOT EXISTS idx_bid_history_lot_time ON bid_history (lot_id, bid_time);
 
 CREATE TABLE IF NOT EXISTS lot_items (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -208,6 +213,10 @@ CREATE TABLE IF NOT EXISTS product_layers (
     FOREIGN KEY (template_id) REFERENCES spec_templates (id) ON DELETE SET NULL
 );
 CREATE INDEX IF NOT EXISTS idx_product_layers_lot_id ON product_layers (lot_id);
+-- The unique (lot_id, COALESCE(parent_id, -1), title) index used by spec
+-- upserts is created by schema.manager once existing duplicates are merged.
+-- Serves the per-lot spec tree read (ORDER BY parent_id, layer) without a sort.
+CREATE INDEX IF NOT EXISTS idx_product_layers_lot_parent_layer ON product_layers (lot_id, parent_id, layer);
 CREATE INDEX IF NOT EXISTS idx_product_layers_parent_id ON product_layers (parent_id);
 CREATE INDEX IF NOT EXISTS idx_product_layers_template_id ON product_layers (template_id);
 CREATE INDEX IF NOT EXISTS idx_product_layers_category ON product_layers (category);
@@ -226,6 +235,7 @@ CREATE TABLE IF NOT EXISTS reference_prices (
     FOREIGN KEY (lot_id) REFERENCES lots (id) ON DELETE CASCADE
 );
 CREATE INDEX IF NOT EXISTS idx_reference_prices_lot_id ON reference_prices (lot_id);
+CREATE INDEX IF NOT EXISTS idx_reference_prices_lot_created ON reference_prices (lot_id, created_at);
 
 CREATE TABLE IF NOT EXISTS sync_runs (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -270,9 +280,14 @@ CREATE TABLE IF NOT EXISTS lot_images (
 );
 
 CREATE INDEX IF NOT EXISTS idx_lot_images_lot_id ON lot_images (lot_id);
-CREATE INDEX IF NOT EXISTS idx_lot_images_download_status ON lot_images (download_status);
-CREATE INDEX IF NOT EXISTS idx_lot_images_analysis_status ON lot_images (analysis_status);
 CREATE INDEX IF NOT EXISTS idx_lot_images_phash ON lot_images (phash);
+-- Polling indexes (get_pending_download, get_pending_analysis,
+-- get_needs_review): equality on status plus ORDER BY created_at becomes an
+-- index range scan.  get_failed() ORs both indexes and sorts the failed rows.
+CREATE INDEX IF NOT EXISTS idx_lot_images_dl_status_created
+    ON lot_images (download_status, created_at);
+CREATE INDEX IF NOT EXISTS idx_lot_images_an_status_created
+    ON lot_images (analysis_status, created_at);
 
 -- Table for storing extracted product codes from images
 CREATE TABLE IF NOT EXISTS extracted_codes (
@@ -294,7 +309,8 @@ CREATE INDEX IF NOT EXISTS idx_extracted_codes_value ON extracted_codes (value);
 CREATE TABLE IF NOT EXISTS ocr_token_data (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     lot_image_id INTEGER NOT NULL UNIQUE,
-    tokens_json TEXT NOT NULL,  -- JSON blob with pytesseract.image_to_data() output
+    tokens_zstd BLOB NOT NULL,  -- compressed JSON of pytesseract.image_to_data() output
+    tokens_hash TEXT,  -- content hash of the uncompressed JSON; skips unchanged upserts
     token_count INTEGER NOT NULL DEFAULT 0,
     has_labels INTEGER NOT NULL DEFAULT 0,  -- 1 if manually labeled for training
     created_at TEXT NOT NULL DEFAULT (datetime('now')),
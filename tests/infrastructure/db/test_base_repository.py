@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from troostwatch.infrastructure.db import ensure_schema
+from troostwatch.infrastructure.db.repositories import (
+    BuyerRepository,
+    LotRepository,
+    PositionRepository,
+)
+
+
+@pytest.fixture()
+def db_path(tmp_path: Path) -> Path:
+    path = tmp_path / "batch.db"
+    conn = sqlite3.connect(path)
+    ensure_schema(conn)
+    conn.close()
+    return path
+
+
+def _labels(db_path: Path) -> list[str]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return [r[0] for r in conn.execute("SELECT label FROM buyers ORDER BY id")]
+    finally:
+        conn.close()
+
+
+def test_batch_defers_commits_until_exit(db_path: Path) -> None:
+    conn = sqlite3.connect(db_path)
+    repo = BuyerRepository(conn)
+    other = BuyerRepository(conn)
+    try:
+        with repo.batch():
+            repo.add("alice")
+            other.add("bob")
+            assert conn.in_transaction
+            assert _labels(db_path) == []
+        assert not conn.in_transaction
+        assert _labels(db_path) == ["alice", "bob"]
+    finally:
+        conn.close()
+
+
+def test_batch_rolls_back_on_error(db_path: Path) -> None:
+    conn = sqlite3.connect(db_path)
+    repo = BuyerRepository(conn)
+    try:
+        with pytest.raises(RuntimeError):
+            with repo.batch():
+                repo.add("alice")
+                raise RuntimeError("boom")
+        repo.add("carol")
+        assert _labels(db_path) == ["carol"]
+    finally:
+        conn.close()
+
+
+def test_fetch_helpers_reuse_column_names_per_query(db_path: Path) -> None:
+    conn = sqlite3.connect(db_path)
+    repo = BuyerRepository(conn)
+    try:
+        repo.add("alice", "Alice")
+        query = "SELECT label, name AS display FROM buyers WHERE label = ?"
+        first = repo._fetch_one_as_dict(query, ("alice",))
+        again = repo._fetch_all_as_dicts(query, ("alice",))
+        assert first == {"label": "alice", "display": "Alice"}
+        assert again == [first]
+        assert repo._fetch_one_as_dict("SELECT * FROM buyers")["label"] == "alice"
+    finally:
+        conn.close()
+
+
+def test_position_repository_builds_sub_repositories_lazily(db_path: Path) -> None:
+    conn = sqlite3.connect(db_path)
+    try:
+        buyers = BuyerRepository(conn)
+        repo = PositionRepository(conn, buyers=buyers)
+        assert repo.list() == []
+        assert "lots" not in vars(repo)
+        assert repo.buyers is buyers
+        assert isinstance(repo.lots, LotRepository)
+        assert repo.lots is repo.lots
+    finally:
+        conn.close()
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from troostwatch.infrastructure.db import ensure_schema
+from troostwatch.infrastructure.db.repositories import (
+    ExtractedCodeRepository,
+    LotImageRepository,
+    LotRepository,
+    OcrTokenRepository,
+)
+from troostwatch.infrastructure.db.repositories import images as images_module
+from troostwatch.infrastructure.db.repositories import lots as lots_module
+
+
+@pytest.fixture()
+def conn(tmp_path: Path):
+    conn = sqlite3.connect(tmp_path / "images.db")
+    ensure_schema(conn)
+    conn.execute(
+        "INSERT INTO auctions (auction_code, title, url) VALUES (?, ?, ?)",
+        ("A1", "Auction", "http://example.com/a1"),
+    )
+    auction_id = conn.execute("SELECT id FROM auctions").fetchone()[0]
+    for lot_code in ("A1-1", "A1-2", "A1-3"):
+        conn.execute(
+            "INSERT INTO lots (auction_id, lot_code) VALUES (?, ?)",
+            (auction_id, lot_code),
+        )
+    conn.commit()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _lot_ids(conn: sqlite3.Connection) -> list[int]:
+    return [r[0] for r in conn.execute("SELECT id FROM lots ORDER BY lot_code")]
+
+
+def test_images_get_by_lot_ids_groups_per_lot(conn: sqlite3.Connection) -> None:
+    repo = LotImageRepository(conn)
+    lot1, lot2, lot3 = _lot_ids(conn)
+    repo.insert_images(lot1, ["http://img/1a", "http://img/1b"])
+    repo.insert_images(lot2, ["http://img/2a"])
+
+    grouped = repo.get_by_lot_ids([lot1, lot2, lot3])
+
+    assert set(grouped) == {lot1, lot2}
+    assert [img.url for img in grouped[lot1]] == ["http://img/1a", "http://img/1b"]
+    assert grouped[lot1] == repo.get_by_lot_id(lot1)
+    assert grouped[lot2] == repo.get_by_lot_id(lot2)
+    assert repo.get_by_lot_ids([]) == {}
+
+
+def test_codes_get_by_lot_ids_matches_per_lot_lookup(conn: sqlite3.Connection) -> None:
+    image_repo = LotImageRepository(conn)
+    code_repo = ExtractedCodeRepository(conn)
+    lot1, lot2, lot3 = _lot_ids(conn)
+    (img1a, img1b) = image_repo.insert_images(lot1, ["http://img/1a", "http://img/1b"])
+    (img2,) = image_repo.insert_images(lot2, ["http://img/2a"])
+    image_repo.insert_images(lot3, ["http://img/3a"])
+    code_repo.insert_code(img1a, "ean", "8712345678901", "high")
+    code_repo.insert_code(img1b, "serial_number", "SN-1")
+    code_repo.insert_code(img2, "model_number", "M-2")
+
+    grouped = code_repo.get_by_lot_ids([lot1, lot2, lot3])
+
+    assert set(grouped) == {lot1, lot2}
+    assert grouped[lot1] == code_repo.get_by_lot_id(lot1)
+    assert grouped[lot2] == code_repo.get_by_lot_id(lot2)
+    assert grouped.get(lot3, []) == []
+
+
+def test_ocr_tokens_round_trip_compressed(conn: sqlite3.Connection) -> None:
+    image_repo = LotImageRepository(conn)
+    token_repo = OcrTokenRepository(conn)
+    (image_id,) = image_repo.insert_images(_lot_ids(conn)[0], ["http://img/1a"])
+    tokens = {"text": ["HP", "EliteBook", "840"] * 50, "conf": [96, 91, 88] * 50}
+
+    token_repo.upsert_tokens(image_id, tokens)
+
+    stored = conn.execute("SELECT tokens_zstd FROM ocr_token_data").fetchone()[0]
+    assert isinstance(stored, bytes)
+    assert len(stored) < len(json.dumps(tokens))
+    record = token_repo.get_by_image_id(image_id)
+    assert record is not None
+    assert record.tokens == tokens
+    assert record.token_count == 150
+
+
+def test_legacy_tokens_json_is_migrated(tmp_path: Path) -> None:
+    conn = sqlite3.connect(tmp_path / "legacy.db")
+    try:
+        conn.execute(
+            """
+            CREATE TABLE ocr_token_data (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                lot_image_id INTEGER NOT NULL UNIQUE,
+                tokens_json TEXT NOT NULL,
+                token_count INTEGER NOT NULL DEFAULT 0,
+                has_labels INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL DEFAULT (datetime('now'))
+            )
+            """
+        )
+        conn.execute(
+            "INSERT INTO ocr_token_data (lot_image_id, tokens_json, token_count) "
+            "VALUES (1, ?, 2)",
+            (json.dumps({"text": ["a", "b"]}),),
+        )
+        conn.commit()
+
+        ensure_schema(conn)
+
+        columns = {r[1] for r in conn.execute("PRAGMA table_info(ocr_token_data)")}
+        assert "tokens_json" not in columns
+        record = OcrTokenRepository(conn).get_by_image_id(1)
+        assert record is not None
+        assert record.tokens == {"text": ["a", "b"]}
+    finally:
+        conn.close()
+
+
+def test_upsert_tokens_skips_unchanged_payload(conn: sqlite3.Connection) -> None:
+    image_repo = LotImageRepository(conn)
+    token_repo = OcrTokenRepository(conn)
+    (image_id,) = image_repo.insert_images(_lot_ids(conn)[0], ["http://img/1a"])
+    tokens = {"text": ["a", "b"]}
+    record_id = token_repo.upsert_tokens(image_id, tokens)
+    conn.execute("UPDATE ocr_token_data SET token_count = -1")
+
+    assert token_repo.upsert_tokens(image_id, dict(tokens)) == record_id
+    assert conn.execute("SELECT token_count FROM ocr_token_data").fetchone()[0] == -1
+
+    assert token_repo.upsert_tokens(image_id, tokens, has_labels=True) == record_id
+    row = conn.execute("SELECT token_count, has_labels FROM ocr_token_data").fetchone()
+    assert row == (2, 1)
+
+
+def test_image_stats_counts_each_status(conn: sqlite3.Connection) -> None:
+    repo = LotImageRepository(conn)
+    img_a, img_b, img_c = repo.insert_images(
+        _lot_ids(conn)[0], ["http://img/a", "http://img/b", "http://img/c"]
+    )
+    repo.mark_downloaded(img_a, "/tmp/a.jpg")
+    repo.mark_downloaded(img_b, "/tmp/b.jpg")
+    repo.mark_download_failed(img_c, "404")
+    repo.mark_analyzed(img_a, "local")
+    repo.mark_analyzed(img_b, "local", status="needs_review")
+
+    assert repo.get_stats() == {
+        "total": 3,
+        "pending_download": 0,
+        "downloaded": 2,
+        "download_failed": 1,
+        "pending_analysis": 1,
+        "analyzed": 1,
+        "needs_review": 1,
+        "analysis_failed": 0,
+    }
+
+
+def test_token_exports_stream_records(conn: sqlite3.Connection) -> None:
+    image_repo = LotImageRepository(conn)
+    token_repo = OcrTokenRepository(conn)
+    image_ids = image_repo.insert_images(
+        _lot_ids(conn)[0], [f"http://img/{i}" for i in range(300)]
+    )
+    for image_id in image_ids:
+        token_repo.upsert_tokens(image_id, {"text": [str(image_id)]})
+    token_repo.mark_as_labeled(image_ids[0])
+
+    exported = token_repo.get_all_for_export()
+    assert not isinstance(exported, list)
+    records = list(exported)
+    assert [r.lot_image_id for r in records] == image_ids
+    assert records[-1].tokens == {"text": [str(image_ids[-1])]}
+    assert len(list(token_repo.get_all_for_export(limit=10))) == 10
+    assert [r.lot_image_id for r in token_repo.get_for_training()] == image_ids[:1]
+
+
+def test_token_exports_decode_on_executor(conn: sqlite3.Connection) -> None:
+    image_repo = LotImageRepository(conn)
+    token_repo = OcrTokenRepository(conn)
+    image_ids = image_repo.insert_images(
+        _lot_ids(conn)[0], [f"http://img/{i}" for i in range(300)]
+    )
+    for image_id in image_ids:
+        token_repo.upsert_tokens(image_id, {"text": [str(image_id)]})
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        records = list(token_repo.get_all_for_export(executor=executor))
+
+    assert records == list(token_repo.get_all_for_export())
+
+
+def test_mark_as_labeled_bulk_updates_all_ids(conn: sqlite3.Connection) -> None:
+    image_repo = LotImageRepository(conn)
+    token_repo = OcrTokenRepository(conn)
+    image_ids = image_repo.insert_images(
+        _lot_ids(conn)[0], [f"http://img/{i}" for i in range(1200)]
+    )
+    for image_id in image_ids:
+        token_repo.upsert_tokens(image_id, {"text": ["x"]})
+
+    assert token_repo.mark_as_labeled_bulk(image_ids[:1100]) == 1100
+    assert token_repo.get_stats()["labeled"] == 1100
+    assert token_repo.mark_as_labeled_bulk([]) == 0
+
+
+def test_insert_codes_returns_ids_of_inserted_rows(conn: sqlite3.Connection) -> None:
+    image_repo = LotImageRepository(conn)
+    code_repo = ExtractedCodeRepository(conn)
+    (image_id,) = image_repo.insert_images(_lot_ids(conn)[0], ["http://img/1a"])
+    code_repo.insert_code(image_id, "ean", "first")
+    codes = [{"code_type": "serial_number", "value": f"SN-{i}"} for i in range(250)]
+
+    ids = code_repo.insert_codes(image_id, codes)
+
+    stored = dict(conn.execute("SELECT id, value FROM extracted_codes").fetchall())
+    assert [stored[code_id] for code_id in ids] == [c["value"] for c in codes]
+    assert code_repo.insert_codes(image_id, []) == []
+
+
+def test_polling_queries_use_the_status_created_indexes(
+    conn: sqlite3.Connection,
+) -> None:
+    repo = LotImageRepository(conn)
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    repo.get_pending_download()
+    repo.get_pending_analysis()
+    repo.get_needs_review()
+    repo.get_failed()
+    conn.set_trace_callback(None)
+
+    plans = [
+        [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+        for sql in statements
+    ]
+    dl_index = "idx_lot_images_dl_status_created (download_status=?)"
+    an_index = "idx_lot_images_an_status_created (analysis_status=?)"
+    assert plans[:3] == [
+        [f"SEARCH lot_images USING INDEX {dl_index}"],
+        [f"SEARCH lot_images USING INDEX {an_index}"],
+        [f"SEARCH lot_images USING INDEX {an_index}"],
+    ]
+    assert f"SEARCH lot_images USING INDEX {dl_index}" in plans[3]
+    assert f"SEARCH lot_images USING INDEX {an_index}" in plans[3]
+    assert not any(step.startswith("SCAN lot_images") for step in plans[3])
+
+
+def test_batched_lookups_span_several_chunks(
+    conn: sqlite3.Connection, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    image_repo = LotImageRepository(conn)
+    code_repo = ExtractedCodeRepository(conn)
+    lot_ids = _lot_ids(conn)
+    image_ids = []
+    for lot_id in lot_ids:
+        (image_id,) = image_repo.insert_images(lot_id, [f"http://img/{lot_id}"])
+        code_repo.insert_code(image_id, "ean", f"EAN-{lot_id}")
+        image_ids.append(image_id)
+    expected_images = image_repo.get_by_lot_ids(lot_ids)
+    expected_codes = code_repo.get_by_lot_ids(lot_ids)
+    monkeypatch.setattr(images_module, "_IN_CHUNK_SIZE", 2)
+    monkeypatch.setattr(lots_module, "_IN_CHUNK_SIZE", 2)
+
+    assert image_repo.get_by_lot_ids(lot_ids) == expected_images
+    assert code_repo.get_by_lot_ids(lot_ids) == expected_codes
+    by_id = image_repo.get_by_ids([*image_ids, image_ids[0], 999])
+    assert by_id == {i: image_repo.get_by_id(i) for i in image_ids}
+    lots = LotRepository(conn).get_lots_by_ids([*lot_ids, 999])
+    assert {i: lot.lot_code for i, lot in lots.items()} == dict(
+        zip(lot_ids, ["A1-1", "A1-2", "A1-3"])
+    )
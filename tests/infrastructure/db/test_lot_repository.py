@@ -0,0 +1,398 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from troostwatch.infrastructure.db import ensure_schema
+from troostwatch.infrastructure.db.repositories import (
+    AuctionRepository,
+    LotRepository,
+    ParsedLot,
+)
+from troostwatch.infrastructure.web.parsers.lot_card import LotCardData
+from troostwatch.infrastructure.web.parsers.lot_detail import (
+    BidHistoryEntry,
+    LotDetailData,
+)
+
+
+@pytest.fixture()
+def conn(tmp_path: Path):
+    conn = sqlite3.connect(tmp_path / "lots.db")
+    ensure_schema(conn)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _parsed_lot(lot_code: str, *, price: float, bids: int = 0) -> ParsedLot:
+    card = LotCardData(
+        auction_code="A1",
+        lot_code=lot_code,
+        title=f"Lot {lot_code}",
+        url=f"https://example.com/l/{lot_code}",
+        state="running",
+        price_eur=price,
+    )
+    detail = LotDetailData(
+        lot_code=lot_code,
+        title=f"Lot {lot_code}",
+        url=card.url,
+        bid_history=[
+            BidHistoryEntry(bidder_label=f"B{i}", amount_eur=price - i)
+            for i in range(bids)
+        ],
+    )
+    return ParsedLot(
+        card,
+        detail,
+        listing_hash="lh",
+        detail_hash="dh",
+        last_seen_at="2025-01-01T00:00:00Z",
+        detail_last_seen_at="2025-01-01T00:00:00Z",
+    )
+
+
+def test_upsert_many_from_parsed_inserts_and_updates(conn: sqlite3.Connection) -> None:
+    auction_id = AuctionRepository(conn).upsert("A1", "https://example.com/a/A1", "A1")
+    repo = LotRepository(conn)
+
+    ids = repo.upsert_many_from_parsed(
+        auction_id,
+        [_parsed_lot("A1-1", price=10.0, bids=2), _parsed_lot("A1-2", price=20.0)],
+    )
+    assert set(ids) == {"A1-1", "A1-2"}
+
+    again = repo.upsert_many_from_parsed(auction_id, [_parsed_lot("A1-1", price=15.0)])
+    assert again == {"A1-1": ids["A1-1"]}
+
+    lots = {row["lot_code"]: row for row in repo.list_lots(auction_code="A1")}
+    assert lots["A1-1"]["current_bid_eur"] == 15.0
+    assert lots["A1-2"]["current_bid_eur"] == 20.0
+    bid_rows = conn.execute(
+        "SELECT COUNT(*) FROM bid_history WHERE lot_id = ?", (ids["A1-1"],)
+    ).fetchone()
+    assert bid_rows[0] == 2
+    assert repo.upsert_many_from_parsed(auction_id, []) == {}
+
+
+def test_upsert_many_from_parsed_handles_whole_auction_batches(
+    conn: sqlite3.Connection,
+) -> None:
+    auction_id = AuctionRepository(conn).upsert("A1", "https://example.com/a/A1", "A1")
+    repo = LotRepository(conn)
+    lots = [_parsed_lot(f"A1-{i}", price=float(i), bids=i % 2) for i in range(1200)]
+
+    ids = repo.upsert_many_from_parsed(auction_id, lots)
+
+    assert len(ids) == 1200
+    assert ids == dict(conn.execute("SELECT lot_code, id FROM lots").fetchall())
+    assert conn.execute("SELECT COUNT(*) FROM bid_history").fetchone()[0] == 600
+
+
+def test_upsert_many_from_parsed_replaces_bid_history(conn: sqlite3.Connection) -> None:
+    auction_id = AuctionRepository(conn).upsert("A1", "https://example.com/a/A1", "A1")
+    repo = LotRepository(conn)
+    ids = repo.upsert_many_from_parsed(
+        auction_id,
+        [
+            _parsed_lot("A1-1", price=10.0, bids=3),
+            _parsed_lot("A1-2", price=5.0, bids=1),
+        ],
+    )
+
+    repo.upsert_many_from_parsed(auction_id, [_parsed_lot("A1-1", price=12.0, bids=2)])
+
+    counts = dict(
+        conn.execute("SELECT lot_id, COUNT(*) FROM bid_history GROUP BY lot_id")
+    )
+    assert counts == {ids["A1-1"]: 2, ids["A1-2"]: 1}
+
+
+def test_get_id_resolves_bare_and_prefixed_codes(conn: sqlite3.Connection) -> None:
+    auction_id = AuctionRepository(conn).upsert("A1", "https://example.com/a/A1", "A1")
+    repo = LotRepository(conn)
+    ids = repo.upsert_many_from_parsed(auction_id, [_parsed_lot("A1-7", price=1.0)])
+
+    assert repo.get_id("A1-7", "A1") == ids["A1-7"]
+    assert repo.get_id("7", "A1") == ids["A1-7"]
+    assert repo.get_id("A1-7") == ids["A1-7"]
+    assert repo.get_id("7") is None
+    assert repo.get_id("7", "B2") is None
+
+
+def test_list_lots_rows_matches_list_lots(conn: sqlite3.Connection) -> None:
+    auction_id = AuctionRepository(conn).upsert("A1", "https://example.com/a/A1", "A1")
+    repo = LotRepository(conn)
+    repo.upsert_many_from_parsed(
+        auction_id, [_parsed_lot("A1-1", price=1.0), _parsed_lot("A1-2", price=2.0)]
+    )
+
+    rows = repo.list_lots_rows(auction_code="A1", limit=5)
+
+    assert [row._asdict() for row in rows] == repo.list_lots(auction_code="A1")
+    assert rows[1].current_bid_eur == 2.0
+    assert len(repo.list_lots(state="running", brand=None)) == 2
+    assert repo.list_lots(auction_code="B2", state="running") == []
+
+
+def test_get_id_cache_is_invalidated_by_delete(conn: sqlite3.Connection) -> None:
+    auction_id = AuctionRepository(conn).upsert("A1", "https://example.com/a/A1", "A1")
+    repo = LotRepository(conn)
+    assert repo.get_id("A1-1", "A1") is None
+    ids = repo.upsert_many_from_parsed(auction_id, [_parsed_lot("A1-1", price=1.0)])
+
+    assert repo.get_id("A1-1", "A1") == ids["A1-1"]
+    assert repo.get_id("1", "A1") == ids["A1-1"]
+    assert repo.delete_lot("A1-1", "A1")
+    assert repo.get_id("A1-1", "A1") is None
+    assert repo.get_id("1", "A1") is None
+
+
+def test_get_lot_bundle_matches_individual_queries(conn: sqlite3.Connection) -> None:
+    auction_id = AuctionRepository(conn).upsert("A1", "https://example.com/a/A1", "A1")
+    repo = LotRepository(conn)
+    repo.upsert_many_from_parsed(auction_id, [_parsed_lot("A1-1", price=10.0, bids=2)])
+    parent = repo.upsert_lot_spec("A1-1", "CPU", "i7", auction_code="A1")
+    repo.upsert_lot_spec("A1-1", "Cores", "8", auction_code="A1", parent_id=parent)
+    repo.add_reference_price("A1-1", 99.5, source="shop", auction_code="A1")
+
+    bundle = repo.get_lot_bundle("A1-1", "A1")
+
+    assert bundle is not None
+    assert bundle["detail"] == repo.get_lot_detail("A1-1", "A1")
+    assert bundle["specs"] == repo.get_lot_specs("A1-1", "A1")
+    assert bundle["reference_prices"] == repo.get_reference_prices("A1-1", "A1")
+    assert "bid_history" not in bundle
+    assert repo.get_lot_bundle("missing", "A1") is None
+    assert repo.get_lot_bundle("A1-1", "") == bundle
+
+    fresh = LotRepository(conn)  # empty id cache, as in a request
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    assert fresh.get_lot_bundle("A1-1", "A1") == bundle
+    conn.set_trace_callback(None)
+    assert len(statements) == 1
+
+
+@pytest.mark.parametrize("foreign_keys", [True, False])
+def test_delete_lot_removes_child_rows(
+    conn: sqlite3.Connection, foreign_keys: bool
+) -> None:
+    conn.execute(f"PRAGMA foreign_keys = {'ON' if foreign_keys else 'OFF'}")
+    auction_id = AuctionRepository(conn).upsert("A1", "https://example.com/a/A1", "A1")
+    repo = LotRepository(conn)
+    ids = repo.upsert_many_from_parsed(
+        auction_id,
+        [
+            _parsed_lot("A1-1", price=5.0, bids=2),
+            _parsed_lot("A1-2", price=6.0, bids=1),
+        ],
+    )
+    repo.upsert_lot_spec("A1-1", "CPU", "i7", auction_code="A1")
+    repo.add_reference_price("A1-1", 10.0, auction_code="A1")
+
+    assert repo.delete_lot("A1-1", "A1")
+    assert not repo.delete_lot("A1-1", "A1")
+
+    for table in ("bid_history", "product_layers", "reference_prices"):
+        lot_ids = {r[0] for r in conn.execute(f"SELECT lot_id FROM {table}")}
+        assert ids["A1-1"] not in lot_ids
+    assert repo.get_id("A1-2", "A1") == ids["A1-2"]
+
+
+def test_upsert_lot_spec_updates_in_place(conn: sqlite3.Connection) -> None:
+    auction_id = AuctionRepository(conn).upsert("A1", "https://example.com/a/A1", "A1")
+    repo = LotRepository(conn)
+    repo.upsert_many_from_parsed(auction_id, [_parsed_lot("A1-1", price=1.0)])
+
+    cpu = repo.upsert_lot_spec("A1-1", "CPU", "i5", auction_code="A1")
+    ram = repo.upsert_lot_spec("A1-1", "RAM", "8GB", auction_code="A1")
+    cores = repo.upsert_lot_spec("A1-1", "Cores", "4", auction_code="A1", parent_id=cpu)
+    assert repo.upsert_lot_spec("A1-1", "CPU", "i7", auction_code="A1", ean="1") == cpu
+    assert (
+        repo.upsert_lot_spec("A1-1", "Cores", "8", auction_code="A1", parent_id=cpu)
+        == cores
+    )
+
+    rows = conn.execute(
+        "SELECT id, parent_id, layer, title, value, ean FROM product_layers ORDER BY id"
+    ).fetchall()
+    assert rows == [
+        (cpu, None, 0, "CPU", "i7", "1"),
+        (ram, None, 1, "RAM", "8GB", None),
+        (cores, cpu, 0, "Cores", "8", None),
+    ]
+
+
+def test_duplicate_specs_are_merged_on_upgrade(tmp_path: Path) -> None:
+    conn = sqlite3.connect(tmp_path / "dupes.db")
+    try:
+        auction_id = AuctionRepository(conn).upsert(
+            "A1", "https://example.com/a/A1", "A1"
+        )
+        lot_id = LotRepository(conn).upsert_many_from_parsed(
+            auction_id, [_parsed_lot("A1-1", price=1.0)]
+        )["A1-1"]
+        conn.execute("DROP INDEX idx_product_layers_unique_title")
+        conn.execute(
+            "DELETE FROM schema_migrations "
+            "WHERE name = 'product_layers_unique_title_v1'"
+        )
+        conn.execute("PRAGMA user_version = 0")  # as left by older releases
+        for parent_id, title in ((None, "CPU"), (None, "CPU"), (2, "Cores")):
+            conn.execute(
+                "INSERT INTO product_layers (lot_id, parent_id, title, value) "
+                "VALUES (?, ?, ?, 'x')",
+                (lot_id, parent_id, title),
+            )
+        conn.commit()
+
+        ensure_schema(conn)
+
+        rows = conn.execute(
+            "SELECT id, parent_id, title FROM product_layers ORDER BY id"
+        ).fetchall()
+        assert rows == [(1, None, "CPU"), (3, 1, "Cores")]
+    finally:
+        conn.close()
+
+
+def test_apply_template_to_lot_copies_template_fields(
+    conn: sqlite3.Connection,
+) -> None:
+    auction_id = AuctionRepository(conn).upsert("A1", "https://example.com/a/A1", "A1")
+    repo = LotRepository(conn)
+    repo.upsert_many_from_parsed(auction_id, [_parsed_lot("A1-1", price=1.0)])
+    template_id = repo.create_spec_template(
+        "CPU", value="i7", ean="123", price_eur=250.0, category="parts"
+    )
+    existing = repo.upsert_lot_spec("A1-1", "CPU", "i5", auction_code="A1")
+
+    spec_id = repo.apply_template_to_lot("A1-1", template_id, auction_code="A1")
+
+    assert spec_id == existing
+    row = conn.execute(
+        "SELECT title, value, ean, price_eur, template_id, category "
+        "FROM product_layers WHERE id = ?",
+        (spec_id,),
+    ).fetchone()
+    assert row == ("CPU", "i7", "123", 250.0, template_id, "parts")
+    with pytest.raises(ValueError):
+        repo.apply_template_to_lot("A1-1", template_id + 1, auction_code="A1")
+    with pytest.raises(ValueError):
+        repo.apply_template_to_lot("missing", template_id, auction_code="A1")
+
+
+def test_get_lot_specs_reads_in_index_order(conn: sqlite3.Connection) -> None:
+    auction_id = AuctionRepository(conn).upsert("A1", "https://example.com/a/A1", "A1")
+    repo = LotRepository(conn)
+    repo.upsert_many_from_parsed(auction_id, [_parsed_lot("A1-1", price=1.0)])
+    cpu = repo.upsert_lot_spec("A1-1", "CPU", "i7", auction_code="A1")
+    repo.upsert_lot_spec("A1-1", "Cores", "8", auction_code="A1", parent_id=cpu)
+    repo.upsert_lot_spec("A1-1", "RAM", "16GB", auction_code="A1")
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+
+    specs = repo.get_lot_specs("A1-1", "A1")
+
+    conn.set_trace_callback(None)
+    assert [(s["key"], s["parent_id"]) for s in specs] == [
+        ("CPU", None),
+        ("RAM", None),
+        ("Cores", cpu),
+    ]
+    plan = " ".join(
+        row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + statements[-1])
+    )
+    assert "idx_product_layers_lot_parent_layer" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_partial_updates_only_touch_given_columns(conn: sqlite3.Connection) -> None:
+    auction_id = AuctionRepository(conn).upsert("A1", "https://example.com/a/A1", "A1")
+    repo = LotRepository(conn)
+    repo.upsert_many_from_parsed(auction_id, [_parsed_lot("A1-1", price=1.0)])
+    ref_id = repo.add_reference_price("A1-1", 10.0, source="shop", auction_code="A1")
+    template_id = repo.create_spec_template("CPU", value="i5", ean="1")
+
+    assert repo.update_reference_price(ref_id, price_eur=12.5, notes="checked")
+    assert repo.update_spec_template(template_id, value="i7")
+    assert repo.update_spec_template(template_id)
+    assert repo.update_lot("A1-1", "A1", ean="871")
+    assert not repo.update_reference_price(ref_id + 1, price_eur=1.0)
+
+    (ref,) = repo.get_reference_prices("A1-1", "A1")
+    assert (ref["price_eur"], ref["source"], ref["notes"]) == (12.5, "shop", "checked")
+    template = repo.get_spec_template(template_id)
+    assert template is not None
+    assert (template["title"], template["value"], template["ean"]) == ("CPU", "i7", "1")
+    detail = repo.get_lot_detail("A1-1", "A1")
+    assert detail is not None
+    assert (detail["ean"], detail["notes"]) == ("871", None)
+
+
+def test_iter_lots_streams_list_lots_rows(conn: sqlite3.Connection) -> None:
+    auction_id = AuctionRepository(conn).upsert("A1", "https://example.com/a/A1", "A1")
+    repo = LotRepository(conn)
+    repo.upsert_many_from_parsed(
+        auction_id, [_parsed_lot(f"A1-{i:04d}", price=float(i)) for i in range(2500)]
+    )
+
+    lots = repo.iter_lots(auction_code="A1")
+
+    assert not isinstance(lots, list)
+    assert list(lots) == repo.list_lots(auction_code="A1")
+    assert len(list(repo.iter_lots(state="running", limit=3))) == 3
+
+
+def test_lot_listings_are_served_in_index_order(conn: sqlite3.Connection) -> None:
+    auction_id = AuctionRepository(conn).upsert("A1", "https://example.com/a/A1", "A1")
+    repo = LotRepository(conn)
+    repo.upsert_many_from_parsed(
+        auction_id, [_parsed_lot("A1-2", price=2.0), _parsed_lot("A1-1", price=1.0)]
+    )
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+
+    codes = repo.list_lot_codes_by_auction("A1")
+    lots = repo.list_lots()
+
+    conn.set_trace_callback(None)
+    assert codes == ["A1-1", "A1-2"]
+    assert [lot["lot_code"] for lot in lots] == codes
+    for statement in statements:
+        plan = " ".join(
+            row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + statement)
+        )
+        assert "sqlite_autoindex_lots_1" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_per_lot_reads_resolve_lot_code_in_the_same_query(
+    conn: sqlite3.Connection,
+) -> None:
+    auction_id = AuctionRepository(conn).upsert("A1", "https://example.com/a/A1", "A1")
+    warm = LotRepository(conn)
+    warm.upsert_many_from_parsed(auction_id, [_parsed_lot("A1-1", price=3.0, bids=2)])
+    warm.upsert_lot_spec("A1-1", "CPU", "i7", auction_code="A1")
+    warm.add_reference_price("A1-1", 50.0, auction_code="A1")
+    cold = LotRepository(conn)
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+
+    specs = cold.get_lot_specs("1", "A1")
+    prices = cold.get_reference_prices("A1-1")
+    bids = cold.get_bid_history("A1-1", "A1")
+
+    conn.set_trace_callback(None)
+    assert len(statements) == 3
+    assert specs == warm.get_lot_specs("A1-1", "A1")
+    assert prices == warm.get_reference_prices("A1-1", "A1")
+    assert bids == warm.get_bid_history("A1-1", "A1")
+    assert [len(specs), len(prices), len(bids)] == [1, 1, 2]
+    assert cold.get_lot_specs("missing", "A1") == []
+    assert cold.get_reference_prices("missing") == []
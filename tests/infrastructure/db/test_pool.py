@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from troostwatch.infrastructure.db import PoolTimeoutError, SqliteConnectionPool
+from troostwatch.infrastructure.db import pool as pool_module
+
+
+def test_pool_reuses_connections_and_serves_readonly_reads(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "pool.db", size=1, readonly_size=2)
+    try:
+        with pool.acquire() as conn:
+            conn.execute("INSERT INTO buyers (label) VALUES ('alice')")
+            conn.commit()
+            first = conn
+        with pool.acquire() as conn:
+            assert conn is first
+
+        with pool.acquire(readonly=True) as ro_conn:
+            assert ro_conn is not first
+            labels = [r[0] for r in ro_conn.execute("SELECT label FROM buyers")]
+            assert labels == ["alice"]
+    finally:
+        pool.close()
+
+
+def test_pool_rolls_back_uncommitted_work_on_release(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "pool.db")
+    try:
+        with pool.acquire() as conn:
+            conn.execute("INSERT INTO buyers (label) VALUES ('bob')")
+        with pool.acquire() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM buyers").fetchone()[0] == 0
+    finally:
+        pool.close()
+
+
+def test_pool_connections_use_tuned_pragmas(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "pool.db", readonly_size=1)
+    try:
+        with pool.acquire() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] < 0
+        with pool.acquire(readonly=True) as ro_conn:
+            assert ro_conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+    finally:
+        pool.close()
+
+
+def test_acquire_gives_up_after_the_pool_timeout(tmp_path: Path) -> None:
+    pool = SqliteConnectionPool(tmp_path / "pool.db", timeout=0.05)
+    try:
+        with pool.acquire():
+            with pytest.raises(PoolTimeoutError):
+                with pool.acquire():
+                    pass
+        with pool.acquire() as conn:
+            assert conn.execute("SELECT 1").fetchone() == (1,)
+    finally:
+        pool.close()
+
+
+def test_failed_schema_setup_closes_the_first_connection(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    opened: list[sqlite3.Connection] = []
+    real_open = pool_module.open_connection
+
+    def tracking_open(*args, **kwargs) -> sqlite3.Connection:
+        conn = real_open(*args, **kwargs)
+        opened.append(conn)
+        return conn
+
+    def failing_ensure_schema(conn: sqlite3.Connection) -> None:
+        raise sqlite3.OperationalError("boom")
+
+    monkeypatch.setattr(pool_module, "open_connection", tracking_open)
+    monkeypatch.setattr(pool_module, "ensure_schema", failing_ensure_schema)
+
+    with pytest.raises(sqlite3.OperationalError, match="boom"):
+        SqliteConnectionPool(tmp_path / "pool.db")
+
+    assert len(opened) == 1
+    with pytest.raises(sqlite3.ProgrammingError):
+        opened[0].execute("SELECT 1")
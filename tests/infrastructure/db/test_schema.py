@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from troostwatch.infrastructure.db import ensure_schema
+from troostwatch.infrastructure.db.schema import (
+    CURRENT_SCHEMA_VERSION,
+    SchemaMigrator,
+)
+
+
+def test_ensure_schema_is_a_no_op_once_stamped(tmp_path: Path) -> None:
+    conn = sqlite3.connect(tmp_path / "schema.db")
+    try:
+        ensure_schema(conn)
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == (
+            CURRENT_SCHEMA_VERSION
+        )
+        statements: list[str] = []
+        conn.set_trace_callback(statements.append)
+
+        ensure_schema(conn)
+
+        assert statements == ["PRAGMA user_version"]
+    finally:
+        conn.close()
+
+
+def test_ensure_schema_reapplies_for_older_stamp(tmp_path: Path) -> None:
+    conn = sqlite3.connect(tmp_path / "schema.db")
+    try:
+        ensure_schema(conn)
+        conn.execute("DROP INDEX idx_lots_lot_code")
+        conn.execute(f"PRAGMA user_version = {CURRENT_SCHEMA_VERSION - 1}")
+
+        ensure_schema(conn)
+
+        indexes = {r[1] for r in conn.execute("PRAGMA index_list(lots)")}
+        assert "idx_lots_lot_code" in indexes
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == (
+            CURRENT_SCHEMA_VERSION
+        )
+    finally:
+        conn.close()
+
+
+def test_newest_migration_matches_the_schema_version() -> None:
+    migrations_dir = Path(__file__).resolve().parents[3] / "migrations"
+    newest = max(migrations_dir.glob("[0-9]*.sql"))
+
+    header = re.search(r"^-- Schema version: (\d+)$", newest.read_text(), re.M)
+
+    # ensure_schema skips databases already stamped with the current version,
+    # so a new migration file is only applied if the version is bumped too.
+    assert header is not None, f"{newest.name} lacks a '-- Schema version:' line"
+    assert int(header.group(1)) == CURRENT_SCHEMA_VERSION
+
+
+def test_ensure_schema_accepts_a_newer_stamp_read_only(tmp_path: Path) -> None:
+    path = tmp_path / "schema.db"
+    conn = sqlite3.connect(path)
+    ensure_schema(conn)
+    conn.execute(f"PRAGMA user_version = {CURRENT_SCHEMA_VERSION + 1}")
+    conn.close()
+
+    readonly = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True)
+    try:
+        statements: list[str] = []
+        readonly.set_trace_callback(statements.append)
+
+        ensure_schema(readonly)
+
+        assert statements == ["PRAGMA user_version"]
+    finally:
+        readonly.close()
+
+
+def test_apply_path_reads_recorded_migrations_once(tmp_path: Path) -> None:
+    conn = sqlite3.connect(tmp_path / "schema.db")
+    try:
+        ensure_schema(conn)
+        migrator = SchemaMigrator(conn)
+        assert migrator.applied_migrations()
+        statements: list[str] = []
+        conn.set_trace_callback(statements.append)
+
+        migrator.apply_path()
+
+        lookups = [s for s in statements if "FROM schema_migrations" in s]
+        assert lookups == ["SELECT name FROM schema_migrations"]
+    finally:
+        conn.close()
+
+
+
+def test_apply_path_records_empty_files(tmp_path: Path) -> None:
+    migrations_dir = tmp_path / "migrations"
+    migrations_dir.mkdir()
+    (migrations_dir / "0001_placeholder.sql").write_text("\n  \n")
+    conn = sqlite3.connect(tmp_path / "schema.db")
+    try:
+        SchemaMigrator(conn).apply_path(migrations_dir)
+
+        rows = conn.execute("SELECT name, notes FROM schema_migrations").fetchall()
+        assert rows == [("0001_placeholder.sql", "empty")]
+    finally:
+        conn.close()
+
+def test_run_migrations_rolls_back_the_whole_batch(tmp_path: Path) -> None:
+    conn = sqlite3.connect(tmp_path / "schema.db")
+    try:
+        ensure_schema(conn)
+        migrator = SchemaMigrator(conn)
+        recorded = migrator.applied_migrations()
+        good = """
+            BEGIN TRANSACTION;
+            CREATE TABLE extra (id INTEGER, note TEXT DEFAULT 'a;b');
+            CREATE TRIGGER extra_ai AFTER INSERT ON extra BEGIN
+                UPDATE extra SET note = 'x;y' WHERE id = NEW.id;
+            END;
+            COMMIT;
+        """
+
+        with pytest.raises(sqlite3.OperationalError):
+            migrator.run_migrations([good, "CREATE TABLE broken (;"])
+
+        tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master")}
+        assert "extra" not in tables
+        assert migrator.applied_migrations() == recorded
+
+        migrator.run_migrations([good])
+        migrator.run_migrations([good])
+        inline = migrator.applied_migrations() - recorded
+        digest = hashlib.blake2b(good.encode("utf-8"), digest_size=16).hexdigest()
+        assert inline == {f"inline-{digest}"}
+        conn.execute("INSERT INTO extra (id) VALUES (1)")
+        assert conn.execute("SELECT note FROM extra").fetchone()[0] == "x;y"
+    finally:
+        conn.close()
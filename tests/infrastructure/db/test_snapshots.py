@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from troostwatch.infrastructure.db import create_snapshot
+
+
+def test_create_snapshot_copies_database(tmp_path: Path) -> None:
+    source = tmp_path / "source.db"
+    conn = sqlite3.connect(source)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE lots (lot_code TEXT)")
+    conn.executemany("INSERT INTO lots VALUES (?)", [("A1-1",), ("A1-2",)])
+    conn.commit()
+    try:
+        snapshot = create_snapshot(source, snapshot_root=tmp_path / "snaps")
+    finally:
+        conn.close()
+
+    copy = sqlite3.connect(snapshot)
+    try:
+        assert copy.execute("SELECT COUNT(*) FROM lots").fetchone()[0] == 2
+        assert copy.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    finally:
+        copy.close()
+
+
+def test_fast_snapshot_folds_in_the_wal(tmp_path: Path) -> None:
+    source = tmp_path / "source.db"
+    conn = sqlite3.connect(source)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE lots (lot_code TEXT)")
+    conn.execute("INSERT INTO lots VALUES ('A1-1')")
+    conn.commit()
+    try:
+        snapshot = create_snapshot(source, snapshot_root=tmp_path, fast=True)
+    finally:
+        conn.close()
+
+    copy = sqlite3.connect(snapshot)
+    try:
+        assert copy.execute("SELECT lot_code FROM lots").fetchall() == [("A1-1",)]
+    finally:
+        copy.close()
+
+
+def test_fast_snapshot_falls_back_while_a_writer_is_active(tmp_path: Path) -> None:
+    source = tmp_path / "source.db"
+    conn = sqlite3.connect(source, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE lots (lot_code TEXT)")
+    conn.execute("INSERT INTO lots VALUES ('A1-1')")
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("INSERT INTO lots VALUES ('A1-2')")
+    try:
+        snapshot = create_snapshot(source, snapshot_root=tmp_path, fast=True)
+    finally:
+        conn.execute("ROLLBACK")
+        conn.close()
+
+    copy = sqlite3.connect(snapshot)
+    try:
+        assert copy.execute("SELECT lot_code FROM lots").fetchall() == [("A1-1",)]
+    finally:
+        copy.close()
+
+
+def test_snapshot_from_live_connection_leaves_it_open(tmp_path: Path) -> None:
+    conn = sqlite3.connect(tmp_path / "source.db")
+    conn.execute("CREATE TABLE lots (lot_code TEXT)")
+    conn.execute("INSERT INTO lots VALUES ('A1-1')")
+    conn.commit()
+    try:
+        snapshot = create_snapshot(conn, snapshot_root=tmp_path / "snaps")
+        assert conn.execute("SELECT COUNT(*) FROM lots").fetchone()[0] == 1
+    finally:
+        conn.close()
+
+    copy = sqlite3.connect(snapshot)
+    try:
+        assert copy.execute("SELECT lot_code FROM lots").fetchall() == [("A1-1",)]
+    finally:
+        copy.close()
+
+
+def test_failed_snapshot_leaves_no_file(tmp_path: Path) -> None:
+    source = sqlite3.connect(tmp_path / "source.db")
+    source.execute("CREATE TABLE lots (lot_code TEXT)")
+    source.close()  # backing up a closed connection fails mid-snapshot
+    snaps = tmp_path / "snaps"
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        create_snapshot(source, snapshot_root=snaps)
+
+    assert list(snaps.iterdir()) == []
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from troostwatch.infrastructure.diagnostics.debug_tools import db_stats, db_view
+
+
+def test_db_stats_counts_every_table_in_one_query() -> None:
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE TABLE lots (id INTEGER)")
+        conn.execute('CREATE TABLE "odd ""name" (id INTEGER)')
+        conn.executemany("INSERT INTO lots VALUES (?)", [(1,), (2,)])
+        statements: list[str] = []
+        conn.set_trace_callback(statements.append)
+
+        stats = db_stats(conn)
+
+        assert stats == [
+            {"table": "lots", "rows": 2},
+            {"table": 'odd "name', "rows": 0},
+        ]
+        assert len([s for s in statements if "COUNT(*)" in s]) == 1
+        assert db_stats(sqlite3.connect(":memory:")) == []
+    finally:
+        conn.close()
+
+
+def test_db_stats_approximate_reads_analyze_statistics() -> None:
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE TABLE lots (id INTEGER)")
+        conn.execute("CREATE INDEX idx_lots_id ON lots (id)")
+        conn.executemany("INSERT INTO lots VALUES (?)", [(i,) for i in range(5)])
+        assert db_stats(conn, approximate=True) == [{"table": "lots", "rows": 5}]
+        conn.execute("ANALYZE")
+        conn.execute("CREATE TABLE buyers (id INTEGER)")
+        conn.execute("INSERT INTO buyers VALUES (1)")
+        conn.execute("DELETE FROM lots WHERE id > 2")
+
+        stats = db_stats(conn, approximate=True)
+
+        assert {"table": "lots", "rows": 5} in stats
+        assert {"table": "buyers", "rows": 1} in stats
+        assert {"table": "lots", "rows": 3} in db_stats(conn)
+    finally:
+        conn.close()
+
+
+def test_db_view_returns_dict_rows_for_quoted_tables() -> None:
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute('CREATE TABLE "lot data" (lot_code TEXT, bid REAL)')
+        conn.executemany(
+            'INSERT INTO "lot data" VALUES (?, ?)', [("A1-1", 10.0), ("A1-2", 5.0)]
+        )
+
+        assert db_view(conn, "lot data", limit=1) == [{"lot_code": "A1-1", "bid": 10.0}]
+        with pytest.raises(ValueError):
+            db_view(conn, "lots; DROP TABLE x")
+    finally:
+        conn.close()
@@ -0,0 +1,50 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from troostwatch.app import dependencies
+from troostwatch.app.api import app
+from troostwatch.infrastructure.db import SqliteConnectionPool, connection
+
+
+@pytest.fixture()
+def db_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    path = tmp_path / "api.db"
+    monkeypatch.setattr(connection, "get_path_config", lambda: {"db_path": path})
+    dependencies.close_connection_pool()
+    yield path
+    dependencies.close_connection_pool()
+
+
+def test_reads_use_readonly_connections_beside_the_writer(db_path: Path) -> None:
+    pool = dependencies.get_connection_pool()
+    assert pool.db_path == db_path
+
+    for conn in dependencies.get_db_connection():
+        conn.execute("INSERT INTO buyers (label) VALUES ('alice')")
+        conn.commit()
+    for conn in dependencies.get_readonly_db_connection():
+        labels = [r[0] for r in conn.execute("SELECT label FROM buyers")]
+        assert labels == ["alice"]
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            conn.execute("INSERT INTO buyers (label) VALUES ('bob')")
+
+
+def test_pool_is_closed_on_shutdown(db_path: Path) -> None:
+    with TestClient(app) as client:
+        assert client.get("/buyers").json() == []
+        pool = dependencies.get_connection_pool()
+
+    assert dependencies._pool is None
+    assert dependencies.get_connection_pool() is not pool
+
+
+def test_exhausted_pool_answers_503(db_path: Path) -> None:
+    dependencies._pool = SqliteConnectionPool(db_path, timeout=0.05)
+    with dependencies._pool.acquire():
+        with pytest.raises(HTTPException) as excinfo:
+            next(dependencies.get_db_connection())
+    assert excinfo.value.status_code == 503
@@ -1,3 +1,6 @@
+import io
+import subprocess
+import sys
 import time
 
 from requests import Response
@@ -8,6 +11,7 @@ from troostwatch.infrastructure.http import TroostwatchHttpClient
 def _make_response(text: str, headers: dict | None = None) -> Response:
     resp = Response()
     resp._content = text.encode("utf-8")
+    resp._content_consumed = True
     resp.status_code = 200
     if headers:
         resp.headers.update(headers)
@@ -20,6 +24,18 @@ def test_extract_csrf_from_meta() -> None:
     assert client._extract_csrf(response) == "abc123"
 
 
+def test_extract_csrf_stops_reading_streamed_body() -> None:
+    client = TroostwatchHttpClient(session_timeout_seconds=60)
+    head = "<head>" + " " * 4090 + '<meta name="csrf-token" content="xyz789" />'
+    body = (head + "</head><body>" + "x" * 100_000 + "</body>").encode("utf-8")
+    response = Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(body)
+
+    assert client._extract_csrf(response) == "xyz789"
+    assert response.raw.tell() < len(body)
+
+
 def test_store_and_restore_session(tmp_path) -> None:
     client = TroostwatchHttpClient(session_timeout_seconds=60)
     client.csrf_token = "token"
@@ -29,6 +45,7 @@ def test_store_and_restore_session(tmp_path) -> None:
     path = tmp_path / "session.json"
     client._store_session(path)
 
+    assert [p.name for p in tmp_path.iterdir()] == ["session.json"]
     loaded = client._load_session(path)
     assert loaded is not None
     assert not loaded.is_expired(60)
@@ -37,3 +54,23 @@ def test_store_and_restore_session(tmp_path) -> None:
     restored._restore_from_tokens(loaded)
     assert restored.csrf_token == "token"
     assert restored.session.cookies.get("sessid") == "cookie123"
+
+
+def test_default_session_uses_pooled_retrying_adapter() -> None:
+    client = TroostwatchHttpClient(session_timeout_seconds=60)
+    adapter = client.session.get_adapter("https://www.troostwijkauctions.com/")
+
+    assert adapter._pool_maxsize == 32
+    assert adapter.max_retries.total == 3
+    assert "POST" not in adapter.max_retries.allowed_methods
+
+
+def test_cli_import_does_not_load_http_libraries() -> None:
+    code = (
+        "import sys, troostwatch.interfaces.cli; "
+        "print(sorted({'requests', 'aiohttp'} & set(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,87 @@
+"""Tests for the logging helpers."""
+
+import logging
+
+import pytest
+
+from troostwatch.infrastructure.observability.logging import (
+    ContextualFormatter,
+    _context_record_factory,
+    _log_context,
+    log_context,
+    log_exception,
+)
+
+
+def test_log_exception_defers_message_formatting(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    logger = logging.getLogger("troostwatch.tests.logging")
+    try:
+        raise ValueError("boom")
+    except ValueError as exc:
+        with caplog.at_level(logging.ERROR, logger=logger.name):
+            log_exception(logger, "Sync failed", exc, auction_code="A1")
+
+    (record,) = caplog.records
+    assert record.msg == "%s: %s"
+    assert record.getMessage() == "Sync failed: boom"
+    assert record.exc_info is not None
+
+
+def test_log_exception_skips_disabled_loggers(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    logger = logging.getLogger("troostwatch.tests.logging.disabled")
+    with caplog.at_level(logging.CRITICAL, logger=logger.name):
+        log_exception(logger, "ignored", RuntimeError("x"))
+
+    assert caplog.records == []
+
+
+def test_contextual_formatter_leaves_the_record_untouched() -> None:
+    factory = _context_record_factory(logging.LogRecord)
+    with log_context(auction_code="A1", progress="50%"):
+        record = factory(
+            "troostwatch", logging.INFO, __file__, 1, "Synced %s lots", (3,), None
+        )
+    formatter = ContextualFormatter("%(levelname)s %(message)s")
+
+    first = formatter.format(record)
+
+    assert first == "INFO Synced 3 lots [auction_code=A1 progress=50%]"
+    assert record.msg == "Synced %s lots"
+    assert formatter.format(record) == first
+
+
+def test_log_context_without_fields_keeps_the_current_context() -> None:
+    with log_context(auction_code="A1"):
+        current = _log_context.get()
+        with log_context():
+            assert _log_context.get() is current
+        assert _log_context.get() is current
+    assert _log_context.get() == {}
+
+
+def test_record_factory_leaves_extra_log_context_to_callers() -> None:
+    logger = logging.getLogger("troostwatch.tests.logging.extra")
+    previous = logging.getLogRecordFactory()
+    logging.setLogRecordFactory(_context_record_factory(previous))
+    try:
+        with log_context(auction_code="A1"):
+            record = logger.makeRecord(
+                logger.name,
+                logging.INFO,
+                __file__,
+                1,
+                "Synced",
+                (),
+                None,
+                extra={"log_context": "caller"},
+            )
+    finally:
+        logging.setLogRecordFactory(previous)
+
+    assert record.log_context == "caller"
+    formatter = ContextualFormatter("%(message)s")
+    assert formatter.format(record) == "Synced [auction_code=A1]"
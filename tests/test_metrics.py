@@ -0,0 +1,152 @@
+"""Tests for the in-process metrics module."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from troostwatch.infrastructure.observability.metrics import (
+    API_REQUEST_DURATION,
+    API_REQUESTS,
+    Counter,
+    Histogram,
+    _labels_to_key,
+    _registry,
+    format_prometheus,
+    get_metrics_summary,
+    observe_histogram,
+    record_api_request,
+)
+
+
+def test_histogram_keeps_bucket_counters_not_observations() -> None:
+    histogram = Histogram(name="latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, {"route": "/lots"})
+
+    assert histogram.get_stats({"route": "/lots"}) == {
+        "count": 4,
+        "sum": 3.65,
+        "avg": 3.65 / 4,
+    }
+    assert histogram.get_buckets({"route": "/lots"}) == [
+        ("0.1", 2),
+        ("1.0", 3),
+        ("+Inf", 4),
+    ]
+    assert histogram.get_stats() == {"count": 0, "sum": 0.0, "avg": 0.0}
+
+
+def test_histogram_exports_cumulative_buckets() -> None:
+    observe_histogram("test_export_seconds", 0.2, {"job": "sync"})
+    observe_histogram("test_export_seconds", 7.0, {"job": "sync"})
+
+    text = format_prometheus()
+
+    assert 'test_export_seconds_bucket{job="sync",le="0.25"} 1' in text
+    assert 'test_export_seconds_bucket{job="sync",le="+Inf"} 2' in text
+    assert 'test_export_seconds_count{job="sync"} 2' in text
+    assert 'test_export_seconds_sum{job="sync"} 7.2' in text
+    summary = get_metrics_summary()["histograms"]["test_export_seconds"]
+    assert summary["job=sync"]["count"] == 2
+
+
+def test_counter_sums_increments_from_all_threads() -> None:
+    counter = Counter(name="hits")
+
+    def work() -> None:
+        for _ in range(1000):
+            counter.inc(labels={"route": "/lots"})
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc(2.5)
+
+    assert counter.get({"route": "/lots"}) == 8000
+    assert counter.values() == {(("route", "/lots"),): 8000, (): 2.5}
+    assert counter.get({"route": "/other"}) == 0
+
+
+def test_histogram_merges_observations_from_all_threads() -> None:
+    histogram = Histogram(name="durations", buckets=(1.0,))
+
+    def work() -> None:
+        for _ in range(500):
+            histogram.observe(0.5)
+        histogram.observe(2.0)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert histogram.get_stats()["count"] == 2004
+    assert histogram.get_stats()["sum"] == 1008.0
+    assert histogram.get_buckets() == [("1.0", 2000), ("+Inf", 2004)]
+    assert histogram.label_keys() == [()]
+
+
+def test_shards_of_exited_threads_are_folded() -> None:
+    counter = Counter(name="jobs")
+    histogram = Histogram(name="job_seconds", buckets=(1.0,))
+
+    def work() -> None:
+        counter.inc(labels={"job": "sync"})
+        histogram.observe(0.5)
+
+    for _ in range(3):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            for _ in range(8):
+                executor.submit(work)
+
+    assert counter.values() == {(("job", "sync"),): 24}
+    assert histogram.get_buckets() == [("1.0", 24), ("+Inf", 24)]
+    assert counter._shards == {}
+    assert histogram._shards == {}
+
+    counter.inc()
+    assert list(counter._shards) == [threading.current_thread()]
+    assert counter.get({"job": "sync"}) == 24
+
+
+def test_record_helpers_use_the_same_series_as_label_dicts() -> None:
+    counter = _registry.counter(API_REQUESTS)
+    labels = {"status": "200", "method": "GET", "endpoint": "/test-record"}
+    before = counter.get(labels)
+
+    record_api_request("/test-record", "GET", 200, 0.01)
+
+    assert counter.get(labels) == before + 1
+    histogram = _registry.histogram(API_REQUEST_DURATION)
+    stats = histogram.get_stats({"method": "GET", "endpoint": "/test-record"})
+    assert stats["count"] == 1
+
+
+def test_label_keys_are_sorted_and_shared_across_calls() -> None:
+    first = _labels_to_key({"status": "200", "method": "GET"})
+    second = _labels_to_key({"method": "GET", "status": "200"})
+
+    assert first == (("method", "GET"), ("status", "200"))
+    assert _labels_to_key({"method": "GET", "status": "200"}) is second
+    assert _labels_to_key(None) == _labels_to_key({}) == ()
+    counter = Counter(name="keyed")
+    counter.inc_key(first)
+    counter.inc(labels={"status": "200", "method": "GET"})
+    assert counter.get({"method": "GET", "status": "200"}) == 2
+
+
+def test_metrics_summary_matches_per_series_stats() -> None:
+    labels = {"status": "ok", "job": "sync"}
+    observe_histogram("test_summary_seconds", 0.2, labels)
+    observe_histogram("test_summary_seconds", 0.6, labels)
+    observe_histogram("test_summary_seconds", 1.0)
+
+    summary = get_metrics_summary()["histograms"]["test_summary_seconds"]
+
+    histogram = _registry.histogram("test_summary_seconds")
+    assert summary == {
+        "job=sync,status=ok": histogram.get_stats(labels),
+        "default": histogram.get_stats(),
+    }
@@ -6,6 +6,8 @@ Run with ``uvicorn troostwatch.app.api:app``.
 from __future__ import annotations
 
 import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Annotated, Any, cast
 import os
 
@@ -35,6 +37,14 @@ from troostwatch.app.dependencies import (
     BidRepositoryDep,
     ExtractedCodeRepositoryDep,
     LotImageRepositoryDep,
+    LotReadRepositoryDep,
+    BuyerReadRepositoryDep,
+    PositionReadRepositoryDep,
+    AuctionReadRepositoryDep,
+    BidReadRepositoryDep,
+    ExtractedCodeReadRepositoryDep,
+    LotImageReadRepositoryDep,
+    close_connection_pool,
 )
 from troostwatch.app.ws_messages import (
     ConnectionReadyMessage,
@@ -126,7 +136,15 @@ class LotEventBus:
 
 event_bus = LotEventBus()
 sync_service = SyncService(event_publisher=event_bus.publish)
-app = FastAPI(title="Troostwatch API", version=__version__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    close_connection_pool()
+
+
+app = FastAPI(title="Troostwatch API", version=__version__, lifespan=lifespan)
 
 # Enable CORS for local development and Chrome extension
 app.add_middleware(
@@ -168,8 +186,14 @@ def get_buyer_service(
     return BuyerService(repository=repository, event_publisher=event_bus.publish)
 
 
+def get_buyer_read_service(
+    repository: BuyerReadRepositoryDep,
+) -> BuyerService:
+    return BuyerService(repository=repository, event_publisher=event_bus.publish)
+
+
 def get_lot_view_service(
-    lot_repository: LotRepositoryDep,
+    lot_repository: LotReadRepositoryDep,
 ) -> LotViewService:
     return LotViewService(lot_repository)
 
@@ -180,6 +204,7 @@ def get_sync_service() -> SyncService:
 
 # Annotated service dependency types
 BuyerServiceDep = Annotated[BuyerService, Depends(get_buyer_service)]
+BuyerReadServiceDep = Annotated[BuyerService, Depends(get_buyer_read_service)]
 LotViewServiceDep = Annotated[LotViewService, Depends(get_lot_view_service)]
 SyncServiceDep = Annotated[SyncService, Depends(get_sync_service)]
 
@@ -605,7 +630,7 @@ class SearchResultResponse(BaseModel):
 
 @app.get("/search", response_model=list[SearchResultResponse])
 async def search_lots(
-    lot_repository: LotRepositoryDep,
+    lot_repository: LotReadRepositoryDep,
     q: str = Query(..., min_length=2, description="Search query (min 2 chars)"),
     state: str | None = Query(None, description="Filter by state"),
     limit: int = Query(50, ge=1, le=200, description="Max results"),
@@ -669,16 +694,17 @@ async def search_lots(
 @app.get("/lots/{lot_code}", response_model=LotDetailResponse)
 async def get_lot_detail(
     lot_code: str,
-    lot_repository: LotRepositoryDep,
+    lot_repository: LotReadRepositoryDep,
     auction_code: str | None = Query(None),
 ) -> LotDetailResponse:
     """Get detailed lot information including specs and reference prices."""
-    lot = lot_repository.get_lot_detail(lot_code, auction_code)
-    if not lot:
+    bundle = lot_repository.get_lot_bundle(lot_code, auction_code)
+    if not bundle:
         raise HTTPException(status_code=404, detail=f"Lot '{lot_code}' not found")
 
-    specs = lot_repository.get_lot_specs(lot_code, auction_code)
-    ref_prices = lot_repository.get_reference_prices(lot_code, auction_code)
+    lot = bundle["detail"]
+    specs = bundle["specs"]
+    ref_prices = bundle["reference_prices"]
 
     return LotDetailResponse(
         auction_code=str(lot.get("auction_code", "")),
@@ -771,7 +797,7 @@ async def delete_lot(
 )
 async def list_reference_prices(
     lot_code: str,
-    lot_repository: LotRepositoryDep,
+    lot_repository: LotReadRepositoryDep,
     auction_code: str | None = Query(None),
 ) -> list[ReferencePriceResponse]:
     """Get all reference prices for a lot."""
@@ -896,7 +922,7 @@ class BidHistoryEntryResponse(BaseModel):
 @app.get("/lots/{lot_code}/bid-history", response_model=list[BidHistoryEntryResponse])
 async def get_lot_bid_history(
     lot_code: str,
-    lot_repository: LotRepositoryDep,
+    lot_repository: LotReadRepositoryDep,
     auction_code: str | None = Query(None),
 ) -> list[BidHistoryEntryResponse]:
     """Get bid history for a lot, ordered by most recent first."""
@@ -1028,7 +1054,7 @@ class ApplyTemplateRequest(BaseModel):
 
 @app.get("/spec-templates", response_model=list[SpecTemplateResponse])
 async def list_spec_templates(
-    lot_repository: LotRepositoryDep,
+    lot_repository: LotReadRepositoryDep,
     parent_id: int | None = Query(None),
 ) -> list[SpecTemplateResponse]:
     """List all spec templates, optionally filtered by parent."""
@@ -1199,7 +1225,7 @@ async def upsert_positions(
 
 @app.get("/positions", response_model=list[PositionResponse])
 async def list_positions(
-    repository: PositionRepositoryDep,
+    repository: PositionReadRepositoryDep,
     buyer: str | None = Query(None, description="Filter by buyer label"),
 ) -> list[PositionResponse]:
     """List all tracked positions, optionally filtered by buyer."""
@@ -1242,7 +1268,7 @@ async def delete_position(
 
 @app.get("/buyers", response_model=list[BuyerResponse])
 async def list_buyers(
-    service: BuyerServiceDep,
+    service: BuyerReadServiceDep,
 ) -> list[BuyerResponse]:
     buyers = service.list_buyers()
     result: list[BuyerResponse] = []
@@ -1302,7 +1328,7 @@ def _bid_row_to_response(bid: dict[str, Any]) -> BidResponse:
 
 @app.get("/bids", response_model=list[BidResponse])
 async def list_bids(
-    repo: BidRepositoryDep,
+    repo: BidReadRepositoryDep,
     buyer: str | None = Query(None, description="Filter by buyer label"),
     lot_code: str | None = Query(None, description="Filter by lot code"),
     limit: int = Query(100, ge=1, le=500),
@@ -1523,9 +1549,9 @@ class DashboardStatsResponse(BaseModel):
 
 @app.get("/stats", response_model=DashboardStatsResponse)
 async def get_dashboard_stats(
-    lot_repository: LotRepositoryDep,
-    buyer_repository: BuyerRepositoryDep,
-    position_repository: PositionRepositoryDep,
+    lot_repository: LotReadRepositoryDep,
+    buyer_repository: BuyerReadRepositoryDep,
+    position_repository: PositionReadRepositoryDep,
 ) -> DashboardStatsResponse:
     """Get dashboard statistics overview."""
     conn = lot_repository.conn
@@ -1570,7 +1596,7 @@ async def get_dashboard_stats(
 
 @app.get("/auctions", response_model=list[AuctionResponse])
 async def list_auctions(
-    repo: AuctionRepositoryDep,
+    repo: AuctionReadRepositoryDep,
     include_inactive: bool = Query(
         False, description="Include auctions without active lots"
     ),
@@ -1622,7 +1648,7 @@ class AuctionDeleteResponse(BaseModel):
 @app.get("/auctions/{auction_code}", response_model=AuctionDetailResponse)
 async def get_auction(
     auction_code: str,
-    repo: AuctionRepositoryDep,
+    repo: AuctionReadRepositoryDep,
 ) -> AuctionDetailResponse:
     """Get a single auction by code."""
     auction = repo.get_by_code(auction_code)
@@ -1930,9 +1956,9 @@ async def analyze_images(
 
 @app.get("/review/codes/pending", response_model=PendingCodesListResponse)
 async def get_pending_codes(
-    code_repo: ExtractedCodeRepositoryDep,
-    image_repo: LotImageRepositoryDep,
-    lot_repo: LotRepositoryDep,
+    code_repo: ExtractedCodeReadRepositoryDep,
+    image_repo: LotImageReadRepositoryDep,
+    lot_repo: LotReadRepositoryDep,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     code_type: str | None = None,
@@ -1947,15 +1973,17 @@ async def get_pending_codes(
     pending = code_repo.get_pending_approval(limit=page_size, offset=offset)
     total = code_repo.count_pending_approval()
 
+    # Resolve images and lots for the whole page at once rather than per code.
+    images = image_repo.get_by_ids(code.lot_image_id for code in pending)
+    lots = lot_repo.get_lots_by_ids(image.lot_id for image in images.values())
+
     codes = []
     for code in pending:
-        # Get image info
-        image = image_repo.get_by_id(code.lot_image_id)
+        image = images.get(code.lot_image_id)
         if not image:
             continue
 
-        # Get lot info
-        lot = lot_repo.get_lot_by_id(image.lot_id)
+        lot = lots.get(image.lot_id)
         lot_code = lot.lot_code if lot else f"unknown-{image.lot_id}"
 
         codes.append(
@@ -2054,7 +2082,7 @@ async def bulk_approve_codes(
 
 @app.get("/review/stats", response_model=ReviewStatsResponse)
 async def get_review_stats(
-    code_repo: ExtractedCodeRepositoryDep,
+    code_repo: ExtractedCodeReadRepositoryDep,
 ) -> ReviewStatsResponse:
     """Get statistics for the review queue."""
     stats = code_repo.get_approval_stats()
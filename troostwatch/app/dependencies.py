@@ -3,11 +3,12 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
 from typing import Annotated, Iterator
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, status
 
-from troostwatch.infrastructure.db import ensure_schema, get_connection
+from troostwatch.infrastructure.db import PoolTimeoutError, SqliteConnectionPool
 from troostwatch.infrastructure.db.repositories import (
     AuctionRepository,
     BidRepository,
@@ -24,7 +25,10 @@ from troostwatch.infrastructure.db.repositories.images import (
 # This keeps infrastructure imports centralized in the dependencies layer
 __all__ = [
     # Connection and repository factory functions
+    "close_connection_pool",
+    "get_connection_pool",
     "get_db_connection",
+    "get_readonly_db_connection",
     "get_auction_repository",
     "get_bid_repository",
     "get_lot_repository",
@@ -32,6 +36,13 @@ __all__ = [
     "get_position_repository",
     "get_extracted_code_repository",
     "get_lot_image_repository",
+    "get_lot_read_repository",
+    "get_buyer_read_repository",
+    "get_position_read_repository",
+    "get_auction_read_repository",
+    "get_bid_read_repository",
+    "get_extracted_code_read_repository",
+    "get_lot_image_read_repository",
     # Repository types (for re-export)
     "AuctionRepository",
     "BidRepository",
@@ -48,19 +59,84 @@ __all__ = [
     "BidRepositoryDep",
     "ExtractedCodeRepositoryDep",
     "LotImageRepositoryDep",
+    "LotReadRepositoryDep",
+    "BuyerReadRepositoryDep",
+    "PositionReadRepositoryDep",
+    "AuctionReadRepositoryDep",
+    "BidReadRepositoryDep",
+    "ExtractedCodeReadRepositoryDep",
+    "LotImageReadRepositoryDep",
 ]
 
 
+# Several read-write connections, so a handler that holds one (for example
+# while publishing events) does not stall other writes; SQLite's busy_timeout
+# serialises the actual write transactions.  Read-only connections serve GET
+# handlers beside them under WAL.
+_POOL_SIZE = 4
+_READONLY_POOL_SIZE = 4
+_pool: SqliteConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> SqliteConnectionPool:
+    """Return the process-wide connection pool, creating it on first use.
+
+    The pool ensures the schema once at creation instead of on every request.
+    It stays bound to the database path configured at that point until
+    :func:`close_connection_pool` is called.
+    """
+
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SqliteConnectionPool(
+                    size=_POOL_SIZE, readonly_size=_READONLY_POOL_SIZE
+                )
+    return _pool
+
+
+def close_connection_pool() -> None:
+    """Close the process-wide pool; the next request opens a fresh one.
+
+    Called on application shutdown, and by tests or config changes that need
+    the pool to pick up a different database path.
+    """
+
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
 def get_db_connection() -> Iterator[sqlite3.Connection]:
-    """Provide a SQLite connection with the required schema ensured.
+    """Provide the pooled read-write SQLite connection.
 
-    Uses check_same_thread=False to allow FastAPI to use the connection
+    Pooled connections use check_same_thread=False so FastAPI can use them
     across different threads (required for async request handling).
     """
 
-    with get_connection(check_same_thread=False) as conn:
-        ensure_schema(conn)
-        yield conn
+    yield from _acquire(readonly=False)
+
+
+def get_readonly_db_connection() -> Iterator[sqlite3.Connection]:
+    """Provide a pooled read-only connection for handlers that only query."""
+
+    yield from _acquire(readonly=True)
+
+
+def _acquire(*, readonly: bool) -> Iterator[sqlite3.Connection]:
+    # A pool that stays exhausted for the whole database timeout means the
+    # server is overloaded; answer 503 instead of parking the worker thread.
+    try:
+        with get_connection_pool().acquire(readonly=readonly) as conn:
+            yield conn
+    except PoolTimeoutError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
+        ) from exc
 
 
 def get_lot_repository(
@@ -105,6 +181,48 @@ def get_lot_image_repository(
     return LotImageRepository(conn)
 
 
+def get_lot_read_repository(
+    conn: sqlite3.Connection = Depends(get_readonly_db_connection),
+) -> LotRepository:
+    return LotRepository(conn)
+
+
+def get_buyer_read_repository(
+    conn: sqlite3.Connection = Depends(get_readonly_db_connection),
+) -> BuyerRepository:
+    return BuyerRepository(conn)
+
+
+def get_position_read_repository(
+    conn: sqlite3.Connection = Depends(get_readonly_db_connection),
+) -> PositionRepository:
+    return PositionRepository(conn)
+
+
+def get_auction_read_repository(
+    conn: sqlite3.Connection = Depends(get_readonly_db_connection),
+) -> AuctionRepository:
+    return AuctionRepository(conn)
+
+
+def get_bid_read_repository(
+    conn: sqlite3.Connection = Depends(get_readonly_db_connection),
+) -> BidRepository:
+    return BidRepository(conn)
+
+
+def get_extracted_code_read_repository(
+    conn: sqlite3.Connection = Depends(get_readonly_db_connection),
+) -> ExtractedCodeRepository:
+    return ExtractedCodeRepository(conn)
+
+
+def get_lot_image_read_repository(
+    conn: sqlite3.Connection = Depends(get_readonly_db_connection),
+) -> LotImageRepository:
+    return LotImageRepository(conn)
+
+
 # Annotated dependency types for modern FastAPI (0.122+) patterns
 # Use these instead of `param: Type = Depends(get_x)` repetition
 LotRepositoryDep = Annotated[LotRepository, Depends(get_lot_repository)]
@@ -116,3 +234,20 @@ ExtractedCodeRepositoryDep = Annotated[
     ExtractedCodeRepository, Depends(get_extracted_code_repository)
 ]
 LotImageRepositoryDep = Annotated[LotImageRepository, Depends(get_lot_image_repository)]
+
+# Read-only variants for GET handlers that never write
+LotReadRepositoryDep = Annotated[LotRepository, Depends(get_lot_read_repository)]
+BuyerReadRepositoryDep = Annotated[BuyerRepository, Depends(get_buyer_read_repository)]
+PositionReadRepositoryDep = Annotated[
+    PositionRepository, Depends(get_position_read_repository)
+]
+AuctionReadRepositoryDep = Annotated[
+    AuctionRepository, Depends(get_auction_read_repository)
+]
+BidReadRepositoryDep = Annotated[BidRepository, Depends(get_bid_read_repository)]
+ExtractedCodeReadRepositoryDep = Annotated[
+    ExtractedCodeRepository, Depends(get_extracted_code_read_repository)
+]
+LotImageReadRepositoryDep = Annotated[
+    LotImageRepository, Depends(get_lot_image_read_repository)
+]
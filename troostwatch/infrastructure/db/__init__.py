@@ -5,7 +5,14 @@ from .config import (
     get_path_config,
     load_config,
 )
-from .connection import apply_pragmas, get_connection, iso_utcnow
+from .connection import (
+    apply_pragmas,
+    get_connection,
+    iso_utcnow,
+    open_connection,
+    sqlite_utcnow,
+)
+from .pool import PoolTimeoutError, SqliteConnectionPool
 from .schema import SchemaMigrator, ensure_core_schema, ensure_schema
 from .snapshots import create_snapshot
 
@@ -19,7 +26,11 @@ __all__ = [
     "create_snapshot",
     "iso_utcnow",
     "load_config",
+    "open_connection",
+    "PoolTimeoutError",
     "SchemaMigrator",
+    "SqliteConnectionPool",
+    "sqlite_utcnow",
     "ensure_core_schema",
     "ensure_schema",
 ]
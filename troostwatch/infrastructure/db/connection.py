@@ -8,6 +8,17 @@ from pathlib import Path
 
 from .config import get_default_timeout, get_path_config, load_config
 
+# Prepared statements kept per connection by the sqlite3 module (default 128).
+# Repositories issue well over a hundred distinct SQL strings, so the default
+# cache would evict hot statements on long-lived pooled connections.
+STATEMENT_CACHE_SIZE = 256
+
+# Defaults for the ``db.mmap_size`` (bytes) and ``db.cache_size_kib`` config
+# keys: memory-map up to 256 MiB of the database file and keep a 64 MiB page
+# cache per connection.
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+DEFAULT_CACHE_SIZE_KIB = 64 * 1024
+
 
 def iso_utcnow() -> str:
     """Return an ISO‑8601 timestamp in UTC with ``Z`` suffix."""
@@ -15,21 +26,41 @@ def iso_utcnow() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
+def sqlite_utcnow() -> str:
+    """Return the current UTC time in SQLite's ``datetime('now')`` format."""
+
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
 def apply_pragmas(
     conn: sqlite3.Connection,
     *,
     enable_wal: bool = True,
     foreign_keys: bool = True,
     busy_timeout_ms: int | None = None,
+    mmap_size: int | None = None,
+    cache_size_kib: int | None = None,
 ) -> None:
-    """Apply SQLite PRAGMAs required by Troostwatch."""
+    """Apply SQLite PRAGMAs required by Troostwatch.
+
+    With WAL enabled, ``synchronous=NORMAL`` is used: the database stays
+    consistent, and at worst the last commits before a power loss are lost.
+    Temporary tables and sort B-trees are always kept in memory.
+    """
 
     if enable_wal:
         conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
     if foreign_keys:
         conn.execute("PRAGMA foreign_keys=ON;")
     if busy_timeout_ms is not None:
         conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)};")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    if mmap_size is not None:
+        conn.execute(f"PRAGMA mmap_size={int(mmap_size)};")
+    if cache_size_kib is not None:
+        # Negative values are interpreted by SQLite as KiB, not pages.
+        conn.execute(f"PRAGMA cache_size=-{int(cache_size_kib)};")
 
 
 @contextmanager
@@ -43,13 +74,61 @@ def get_connection(
 ) -> Iterator[sqlite3.Connection]:
     """Yield a configured SQLite connection."""
 
+    conn = open_connection(
+        db_path,
+        timeout=timeout,
+        enable_wal=enable_wal,
+        foreign_keys=foreign_keys,
+        check_same_thread=check_same_thread,
+    )
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def resolve_db_path(db_path: str | Path | None = None) -> Path:
+    """Return ``db_path`` or the configured default, creating its directory."""
+
     paths = get_path_config()
     resolved_db_path = Path(db_path) if db_path is not None else paths["db_path"]
     resolved_db_path.parent.mkdir(parents=True, exist_ok=True)
+    return resolved_db_path
+
+
+def open_connection(
+    db_path: str | Path | None = None,
+    *,
+    timeout: float | None = None,
+    enable_wal: bool | None = None,
+    foreign_keys: bool | None = None,
+    check_same_thread: bool = True,
+    readonly: bool = False,
+) -> sqlite3.Connection:
+    """Open a SQLite connection with the configured PRAGMAs applied.
+
+    The caller owns the returned connection and must close it.  Read-only
+    connections are opened through a ``mode=ro`` URI and never switch the
+    journal mode.
+    """
+
+    resolved_db_path = resolve_db_path(db_path)
     timeout_value = timeout if timeout is not None else get_default_timeout()
-    conn = sqlite3.connect(
-        resolved_db_path, timeout=timeout_value, check_same_thread=check_same_thread
-    )
+    if readonly:
+        conn = sqlite3.connect(
+            f"{resolved_db_path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            timeout=timeout_value,
+            check_same_thread=check_same_thread,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+    else:
+        conn = sqlite3.connect(
+            resolved_db_path,
+            timeout=timeout_value,
+            check_same_thread=check_same_thread,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
     try:
         cfg = load_config()
         db_cfg = cfg.get("db", {}) if isinstance(cfg, dict) else {}
@@ -65,10 +144,13 @@ def get_connection(
         )
         apply_pragmas(
             conn,
-            enable_wal=resolved_enable_wal,
+            enable_wal=resolved_enable_wal and not readonly,
             foreign_keys=resolved_foreign_keys,
             busy_timeout_ms=int(timeout_value * 1000),
+            mmap_size=int(db_cfg.get("mmap_size", DEFAULT_MMAP_SIZE)),
+            cache_size_kib=int(db_cfg.get("cache_size_kib", DEFAULT_CACHE_SIZE_KIB)),
         )
-        yield conn
-    finally:
+    except Exception:
         conn.close()
+        raise
+    return conn
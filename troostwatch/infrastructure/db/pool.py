@@ -0,0 +1,120 @@
+"""Reusable SQLite connections for long-running processes.
+
+Opening a connection and applying PRAGMAs (plus ``ensure_schema``) on every
+request dominates the cost of small queries.  :class:`SqliteConnectionPool`
+opens its connections once, ensures the schema once, and hands them out via
+:meth:`SqliteConnectionPool.acquire`.
+"""
+
+from __future__ import annotations
+
+import queue
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from .config import get_default_timeout
+from .connection import open_connection, resolve_db_path
+from .schema import ensure_schema
+
+
+class PoolTimeoutError(TimeoutError):
+    """Raised when no pooled connection frees up within the pool timeout."""
+
+
+class SqliteConnectionPool:
+    """Fixed-size pool of read-write and optional read-only connections.
+
+    All connections are opened with ``check_same_thread=False`` so they can be
+    handed to worker threads; a connection is only ever used by one holder at
+    a time.  Read-only connections (``mode=ro``) let polling reads run beside
+    the writer under WAL; when none are configured, read-only requests are
+    served from the read-write connections.
+
+    Waiting for a free connection is bounded by ``timeout`` (the configured
+    database timeout by default) and raises :class:`PoolTimeoutError`.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path | None = None,
+        *,
+        size: int = 1,
+        readonly_size: int = 0,
+        timeout: float | None = None,
+    ) -> None:
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.db_path = resolve_db_path(db_path)
+        self._timeout = timeout if timeout is not None else get_default_timeout()
+        self._writers: queue.Queue[sqlite3.Connection] = queue.Queue()
+        self._readers: queue.Queue[sqlite3.Connection] = queue.Queue()
+        self._has_readers = readonly_size > 0
+        self._all: list[sqlite3.Connection] = []
+        try:
+            for _ in range(size):
+                conn = self._open()
+                self._all.append(conn)
+                if len(self._all) == 1:
+                    ensure_schema(conn)
+                self._writers.put(conn)
+            for _ in range(readonly_size):
+                conn = self._open(readonly=True)
+                self._all.append(conn)
+                self._readers.put(conn)
+        except Exception:
+            self._close_connections()
+            raise
+
+    def _open(self, *, readonly: bool = False) -> sqlite3.Connection:
+        return open_connection(
+            self.db_path,
+            timeout=self._timeout,
+            check_same_thread=False,
+            readonly=readonly,
+        )
+
+    @contextmanager
+    def acquire(self, *, readonly: bool = False) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, returning it to the pool afterwards.
+
+        Work left uncommitted by the borrower is rolled back on release, which
+        matches the behaviour of closing a short-lived connection.
+        """
+
+        pool = self._readers if readonly and self._has_readers else self._writers
+        try:
+            conn = pool.get(timeout=self._timeout)
+        except queue.Empty:
+            raise PoolTimeoutError(
+                f"no {'read-only' if readonly else 'read-write'} connection "
+                f"became free within {self._timeout}s"
+            ) from None
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            pool.put(conn)
+
+    def close(self) -> None:
+        """Close every connection owned by the pool.
+
+        ``PRAGMA optimize`` runs on a read-write connection first, so planner
+        statistics are refreshed for tables the pool's queries relied on.
+        """
+
+        try:
+            if self._all:
+                self._all[0].execute("PRAGMA optimize")
+        finally:
+            self._close_connections()
+
+    def _close_connections(self) -> None:
+        for conn in self._all:
+            conn.close()
+        self._all.clear()
+
+
+__all__ = ["PoolTimeoutError", "SqliteConnectionPool"]
@@ -9,7 +9,7 @@ from .images import (
     OcrTokenData,
     OcrTokenRepository,
 )
-from .lots import LotRepository
+from .lots import LotRepository, LotRow, ParsedLot
 from .positions import PositionRepository
 from .preferences import PreferenceRepository
 
@@ -22,8 +22,10 @@ __all__ = [
     "LotImage",
     "LotImageRepository",
     "LotRepository",
+    "LotRow",
     "OcrTokenData",
     "OcrTokenRepository",
+    "ParsedLot",
     "PositionRepository",
     "PreferenceRepository",
 ]
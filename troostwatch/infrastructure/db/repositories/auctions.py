@@ -137,7 +137,7 @@ class AuctionRepository(BaseRepository):
             f"UPDATE auctions SET {', '.join(updates)} WHERE auction_code = ?",
             tuple(params),
         )
-        self.conn.commit()
+        self._commit()
         return cur.rowcount > 0
 
     def delete(self, auction_code: str, delete_lots: bool = False) -> dict[str, int]:
@@ -185,5 +185,5 @@ class AuctionRepository(BaseRepository):
             cur = self._execute("DELETE FROM auctions WHERE id = ?", (auction_id,))
             auction_deleted = cur.rowcount
 
-        self.conn.commit()
+        self._commit()
         return {"auction": auction_deleted, "lots": lots_deleted}
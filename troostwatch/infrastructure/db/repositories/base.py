@@ -7,8 +7,43 @@ eliminating duplicate cursor→dict conversion logic.
 from __future__ import annotations
 
 import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
+from itertools import repeat
 from typing import Any
 
+# ids of connections inside an active ``BaseRepository.batch()``.  Keyed on
+# the connection rather than the repository so every repository sharing the
+# connection defers its commits.  sqlite3 connections cannot be weakly
+# referenced; entries are removed when the batch exits.
+_BATCHING_CONNECTIONS: set[int] = set()
+
+# Result column names keyed by SQL text, so repeated queries skip
+# ``cursor.description``.  ``SELECT *`` queries are not cached because their
+# columns follow the schema; the cap bounds growth from dynamic ``IN`` lists.
+_COLUMN_CACHE_SIZE = 512
+_COLUMNS_BY_SQL: dict[str, tuple[str, ...]] = {}
+
+# Rows per ``fetchmany`` call in ``BaseRepository._iter_dicts``.
+_STREAM_BATCH_SIZE = 1000
+
+
+def _column_names(query: str, cur: sqlite3.Cursor) -> tuple[str, ...]:
+    """Return the result column names of ``cur``, cached per ``query``."""
+    columns = _COLUMNS_BY_SQL.get(query)
+    if columns is None:
+        columns = tuple(c[0] for c in cur.description)
+        if "*" not in query and len(_COLUMNS_BY_SQL) < _COLUMN_CACHE_SIZE:
+            _COLUMNS_BY_SQL[query] = columns
+    return columns
+
+
+def _iter_dict_rows(
+    cur: sqlite3.Cursor, columns: tuple[str, ...]
+) -> Iterator[dict[str, Any]]:
+    while rows := cur.fetchmany():
+        yield from map(dict, map(zip, repeat(columns), rows))
+
 
 class BaseRepository:
     """Base class for all repository implementations.
@@ -26,11 +61,60 @@ class BaseRepository:
         """
         self.conn = conn
 
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group writes into a single transaction.
+
+        Mutating methods called inside the block, on any repository sharing
+        this connection, skip their own commit.  The batch commits once on
+        exit, or rolls back if the block raises.  When a transaction is
+        already open (or a batch is already active), the batch joins it and
+        leaves commit/rollback to its owner.
+
+        Create repositories before entering the block: repositories that run
+        ``ensure_schema`` in ``__init__`` commit as a side effect.
+
+        Example:
+            >>> with repo.batch():
+            ...     for spec in specs:
+            ...         repo.upsert_lot_spec(lot_code, spec.key, spec.value)
+        """
+        key = id(self.conn)
+        if key in _BATCHING_CONNECTIONS:
+            yield
+            return
+        owns_transaction = not self.conn.in_transaction
+        if owns_transaction:
+            self.conn.execute("BEGIN IMMEDIATE")
+        _BATCHING_CONNECTIONS.add(key)
+        try:
+            yield
+        except BaseException:
+            if owns_transaction:
+                self.conn.rollback()
+            raise
+        else:
+            if owns_transaction:
+                self.conn.commit()
+        finally:
+            _BATCHING_CONNECTIONS.discard(key)
+
+    def _commit(self) -> None:
+        """Commit the connection unless a :meth:`batch` is active on it."""
+        if id(self.conn) not in _BATCHING_CONNECTIONS:
+            self.conn.commit()
+
     def _fetch_all_as_dicts(
         self, query: str, params: tuple[Any, ...] | None = None
     ) -> list[dict[str, Any]]:
         """Execute query and return all rows as dictionaries.
 
+        Rows are copied into plain dicts rather than returned as
+        ``sqlite3.Row``: callers mutate them, compare them with ``==`` and
+        hand them to the JSON encoder, none of which ``Row`` supports.
+        Hot paths that only read fields use positional tuples instead
+        (see ``LotRepository.list_lots_rows``).
+
         Args:
             query: SQL query string
             params: Query parameters (optional)
@@ -47,8 +131,35 @@ class BaseRepository:
             'Alice'
         """
         cur = self.conn.execute(query, params or ())
-        columns = [c[0] for c in cur.description]
-        return [dict(zip(columns, row)) for row in cur.fetchall()]
+        columns = _column_names(query, cur)
+        # map() keeps the per-row dict/zip calls in C; ~10% faster than the
+        # equivalent comprehension on wide result sets.
+        return list(map(dict, map(zip, repeat(columns), cur.fetchall())))
+
+    def _iter_dicts(
+        self,
+        query: str,
+        params: tuple[Any, ...] | None = None,
+        *,
+        batch_size: int = _STREAM_BATCH_SIZE,
+    ) -> Iterator[dict[str, Any]]:
+        """Execute query and yield rows as dictionaries, ``batch_size`` at a time.
+
+        The query runs immediately; rows are then fetched with ``fetchmany``
+        as the caller iterates, so only one batch is buffered at a time.
+        Prefer :meth:`_fetch_all_as_dicts` when the caller needs a list.
+
+        Args:
+            query: SQL query string
+            params: Query parameters (optional)
+            batch_size: Rows fetched per ``fetchmany`` call
+
+        Returns:
+            Iterator of dictionaries with column names as keys
+        """
+        cur = self.conn.execute(query, params or ())
+        cur.arraysize = batch_size
+        return _iter_dict_rows(cur, _column_names(query, cur))
 
     def _fetch_one_as_dict(
         self, query: str, params: tuple[Any, ...] | None = None
@@ -74,8 +185,7 @@ class BaseRepository:
         row = cur.fetchone()
         if not row:
             return None
-        columns = [c[0] for c in cur.description]
-        return dict(zip(columns, row))
+        return dict(zip(_column_names(query, cur), row))
 
     def _fetch_scalar(self, query: str, params: tuple[Any, ...] | None = None) -> Any:
         """Execute query and return first column of first row.
@@ -99,6 +209,11 @@ class BaseRepository:
     def _execute_insert(self, query: str, params: tuple[Any, ...] | None = None) -> int:
         """Execute INSERT query and return last row ID.
 
+        ``cursor.lastrowid`` is read from the connection without running
+        another statement, so plain inserts do not need ``RETURNING id``.
+        Use ``RETURNING`` only when the id is not the last inserted rowid,
+        e.g. for ``INSERT ... ON CONFLICT DO UPDATE``.
+
         Args:
             query: SQL INSERT query string
             params: Query parameters (optional)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sqlite3
+from functools import cached_property
 
 from ..connection import iso_utcnow
 from .base import BaseRepository
@@ -16,8 +17,20 @@ class BidRepository(BaseRepository):
         lots: LotRepository | None = None,
     ) -> None:
         super().__init__(conn)
-        self.buyers = buyers or BuyerRepository(conn)
-        self.lots = lots or LotRepository(conn)
+        if buyers is not None:
+            self.buyers = buyers
+        if lots is not None:
+            self.lots = lots
+
+    # Built on first use so read-only callers skip constructing (and
+    # schema-checking) repositories they never touch.
+    @cached_property
+    def buyers(self) -> BuyerRepository:
+        return BuyerRepository(self.conn)
+
+    @cached_property
+    def lots(self) -> LotRepository:
+        return LotRepository(self.conn)
 
     def record_bid(
         self,
@@ -42,7 +55,7 @@ class BidRepository(BaseRepository):
             """,
             (lot_id, buyer_id, amount_eur, iso_utcnow(), note),
         )
-        self.conn.commit()
+        self._commit()
 
     def list(
         self,
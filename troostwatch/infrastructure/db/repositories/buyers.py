@@ -22,7 +22,7 @@ class BuyerRepository(BaseRepository):
             "INSERT OR IGNORE INTO buyers (label, name, notes) VALUES (?, ?, ?)",
             (label, name, notes),
         )
-        self.conn.commit()
+        self._commit()
 
         if cursor.rowcount == 0:
             raise DuplicateBuyerError(f"Buyer label '{label}' already exists")
@@ -34,7 +34,7 @@ class BuyerRepository(BaseRepository):
 
     def delete(self, label: str) -> None:
         self._execute("DELETE FROM buyers WHERE label = ?", (label,))
-        self.conn.commit()
+        self._commit()
 
     def get_id(self, label: str) -> int | None:
         return self._fetch_scalar("SELECT id FROM buyers WHERE label = ?", (label,))
@@ -8,10 +8,16 @@ This module provides database access for the image analysis pipeline:
 
 from __future__ import annotations
 
-import json
+import sqlite3
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor
 from dataclasses import dataclass
+from itertools import batched, groupby
+from operator import itemgetter
 from typing import Any
 
+from ..connection import sqlite_utcnow
+from ..token_codec import compress_tokens, decode_tokens, dump_tokens, tokens_digest
 from .base import BaseRepository
 
 
@@ -57,12 +63,97 @@ class OcrTokenData:
 
     id: int
     lot_image_id: int
-    tokens: dict[str, Any]  # Parsed from tokens_json
+    tokens: dict[str, Any]  # Decoded from tokens_zstd
     token_count: int
     has_labels: bool
     created_at: str
 
 
+# Column lists in dataclass field order, so rows map positionally.
+_IMAGE_COLUMNS = (
+    "id, lot_id, url, local_path, position, download_status, analysis_status, "
+    "analysis_backend, analyzed_at, error_message, phash, created_at, updated_at"
+)
+_CODE_COLUMN_NAMES = (
+    "id",
+    "lot_image_id",
+    "code_type",
+    "value",
+    "confidence",
+    "context",
+    "created_at",
+    "approved",
+    "approved_at",
+    "approved_by",
+    "promoted_to_lot",
+)
+_CODE_COLUMNS = ", ".join(_CODE_COLUMN_NAMES)
+_EC_CODE_COLUMNS = ", ".join(f"ec.{name}" for name in _CODE_COLUMN_NAMES)
+_INSERT_CODES_PREFIX = (
+    "INSERT INTO extracted_codes "
+    "(lot_image_id, code_type, value, confidence, context) VALUES"
+)
+_INSERT_CODE_SQL = f"{_INSERT_CODES_PREFIX} (?, ?, ?, ?, ?)"
+_TOKEN_COLUMNS = "id, lot_image_id, tokens_zstd, token_count, has_labels, created_at"
+_STREAM_BATCH_SIZE = 256
+_DECODE_CHUNK_SIZE = 32
+# Keep ``IN (...)`` lists and multi-row ``VALUES`` below SQLite's default
+# bound-parameter limit.
+_IN_CHUNK_SIZE = 500
+_INSERT_CHUNK_SIZE = 100
+
+
+def _code_from_row(row: tuple[Any, ...]) -> ExtractedCode:
+    """Build an ExtractedCode from a row selected with ``_CODE_COLUMNS``."""
+    return ExtractedCode(*row[:7], bool(row[7]), row[8], row[9], bool(row[10]))
+
+
+def _token_from_row(
+    row: tuple[Any, ...], tokens: dict[str, Any] | None = None
+) -> OcrTokenData:
+    """Build an OcrTokenData from a row selected with ``_TOKEN_COLUMNS``.
+
+    ``tokens`` may be passed when the payload in ``row[2]`` was decoded
+    elsewhere.
+    """
+    if tokens is None:
+        tokens = decode_tokens(row[2])
+    return OcrTokenData(row[0], row[1], tokens, row[3], bool(row[4]), row[5])
+
+
+def _stream_tokens(
+    cur: sqlite3.Cursor, executor: Executor | None = None
+) -> Iterator[OcrTokenData]:
+    """Decode token rows from ``cur`` one ``fetchmany`` batch at a time.
+
+    With an ``executor``, each batch's payloads are decoded there while the
+    next batch is fetched, so reading and decoding overlap.
+    """
+    cur.arraysize = _STREAM_BATCH_SIZE
+    if executor is None:
+        while rows := cur.fetchmany():
+            for row in rows:
+                yield _token_from_row(row)
+        return
+
+    pending: tuple[list[Any], Iterator[dict[str, Any]]] | None = None
+    while True:
+        rows = cur.fetchmany()
+        decoded = (
+            executor.map(
+                decode_tokens, [row[2] for row in rows], chunksize=_DECODE_CHUNK_SIZE
+            )
+            if rows
+            else None
+        )
+        if pending is not None:
+            for row, tokens in zip(*pending):
+                yield _token_from_row(row, tokens)
+        if not rows:
+            return
+        pending = (rows, decoded)
+
+
 class LotImageRepository(BaseRepository):
     """Repository for lot image records."""
 
@@ -79,6 +170,7 @@ class LotImageRepository(BaseRepository):
             List of inserted image IDs
         """
         inserted_ids: list[int] = []
+        now = sqlite_utcnow()
         for position, url in enumerate(image_urls):
             cur = self.conn.execute(
                 """
@@ -86,10 +178,10 @@ class LotImageRepository(BaseRepository):
                 VALUES (?, ?, ?)
                 ON CONFLICT (lot_id, url) DO UPDATE SET
                     position = excluded.position,
-                    updated_at = datetime('now')
+                    updated_at = ?
                 RETURNING id
                 """,
-                (lot_id, url, position),
+                (lot_id, url, position, now),
             )
             row = cur.fetchone()
             if row:
@@ -98,78 +190,115 @@ class LotImageRepository(BaseRepository):
 
     def get_by_lot_id(self, lot_id: int) -> list[LotImage]:
         """Get all images for a lot, ordered by position."""
-        rows = self._fetch_all_as_dicts(
-            """
-            SELECT * FROM lot_images
+        rows = self.conn.execute(
+            f"""
+            SELECT {_IMAGE_COLUMNS} FROM lot_images
             WHERE lot_id = ?
             ORDER BY position
             """,
             (lot_id,),
-        )
-        return [self._row_to_image(row) for row in rows]
+        ).fetchall()
+        return [LotImage(*row) for row in rows]
+
+    def get_by_lot_ids(self, lot_ids: list[int]) -> dict[int, list[LotImage]]:
+        """Get images for several lots, grouped by lot ID.
+
+        Issues one query per chunk of lot IDs.  Lots without images are absent
+        from the result; use ``.get(lot_id, [])``.
+        """
+        grouped: dict[int, list[LotImage]] = {}
+        # Chunks hold distinct lot IDs, so no group spans two chunks.
+        for chunk in batched(dict.fromkeys(lot_ids), _IN_CHUNK_SIZE):
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"""
+                SELECT {_IMAGE_COLUMNS} FROM lot_images
+                WHERE lot_id IN ({placeholders})
+                ORDER BY lot_id, position
+                """,
+                chunk,
+            ).fetchall()
+            grouped.update(
+                (lot_id, [LotImage(*row) for row in group])
+                for lot_id, group in groupby(rows, key=itemgetter(1))
+            )
+        return grouped
 
     def get_by_id(self, image_id: int) -> LotImage | None:
         """Get a single image by ID."""
-        row = self._fetch_one_as_dict(
-            "SELECT * FROM lot_images WHERE id = ?",
+        row = self.conn.execute(
+            f"SELECT {_IMAGE_COLUMNS} FROM lot_images WHERE id = ?",
             (image_id,),
-        )
-        if not row or row.get("id") is None:
+        ).fetchone()
+        if row is None:
             return None
-        return self._row_to_image(row)
+        return LotImage(*row)
+
+    def get_by_ids(self, image_ids: Iterable[int]) -> dict[int, LotImage]:
+        """Get several images by ID, keyed by ID; unknown IDs are absent."""
+        images: dict[int, LotImage] = {}
+        for chunk in batched(dict.fromkeys(image_ids), _IN_CHUNK_SIZE):
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT {_IMAGE_COLUMNS} FROM lot_images "
+                f"WHERE id IN ({placeholders})",
+                chunk,
+            ).fetchall()
+            images.update((row[0], LotImage(*row)) for row in rows)
+        return images
 
     def get_pending_download(self, limit: int = 100) -> list[LotImage]:
         """Get images that need to be downloaded."""
-        rows = self._fetch_all_as_dicts(
-            """
-            SELECT * FROM lot_images
+        rows = self.conn.execute(
+            f"""
+            SELECT {_IMAGE_COLUMNS} FROM lot_images
             WHERE download_status = 'pending'
             ORDER BY created_at
             LIMIT ?
             """,
             (limit,),
-        )
-        return [self._row_to_image(row) for row in rows]
+        ).fetchall()
+        return [LotImage(*row) for row in rows]
 
     def get_pending_analysis(self, limit: int = 100) -> list[LotImage]:
         """Get images that are downloaded but not yet analyzed."""
-        rows = self._fetch_all_as_dicts(
-            """
-            SELECT * FROM lot_images
+        rows = self.conn.execute(
+            f"""
+            SELECT {_IMAGE_COLUMNS} FROM lot_images
             WHERE download_status = 'downloaded'
               AND analysis_status = 'pending'
             ORDER BY created_at
             LIMIT ?
             """,
             (limit,),
-        )
-        return [self._row_to_image(row) for row in rows]
+        ).fetchall()
+        return [LotImage(*row) for row in rows]
 
     def get_needs_review(self, limit: int = 100) -> list[LotImage]:
         """Get images that need manual review or OpenAI analysis."""
-        rows = self._fetch_all_as_dicts(
-            """
-            SELECT * FROM lot_images
+        rows = self.conn.execute(
+            f"""
+            SELECT {_IMAGE_COLUMNS} FROM lot_images
             WHERE analysis_status = 'needs_review'
             ORDER BY created_at
             LIMIT ?
             """,
             (limit,),
-        )
-        return [self._row_to_image(row) for row in rows]
+        ).fetchall()
+        return [LotImage(*row) for row in rows]
 
     def get_failed(self, limit: int = 100) -> list[LotImage]:
         """Get images that failed download or analysis."""
-        rows = self._fetch_all_as_dicts(
-            """
-            SELECT * FROM lot_images
+        rows = self.conn.execute(
+            f"""
+            SELECT {_IMAGE_COLUMNS} FROM lot_images
             WHERE download_status = 'failed' OR analysis_status = 'failed'
             ORDER BY created_at
             LIMIT ?
             """,
             (limit,),
-        )
-        return [self._row_to_image(row) for row in rows]
+        ).fetchall()
+        return [LotImage(*row) for row in rows]
 
     def mark_downloaded(self, image_id: int, local_path: str) -> None:
         """Mark an image as successfully downloaded."""
@@ -178,10 +307,10 @@ class LotImageRepository(BaseRepository):
             UPDATE lot_images
             SET download_status = 'downloaded',
                 local_path = ?,
-                updated_at = datetime('now')
+                updated_at = ?
             WHERE id = ?
             """,
-            (local_path, image_id),
+            (local_path, sqlite_utcnow(), image_id),
         )
 
     def mark_download_failed(self, image_id: int, error: str) -> None:
@@ -191,10 +320,10 @@ class LotImageRepository(BaseRepository):
             UPDATE lot_images
             SET download_status = 'failed',
                 error_message = ?,
-                updated_at = datetime('now')
+                updated_at = ?
             WHERE id = ?
             """,
-            (error, image_id),
+            (error, sqlite_utcnow(), image_id),
         )
 
     def mark_analyzed(
@@ -210,16 +339,17 @@ class LotImageRepository(BaseRepository):
             backend: The analysis backend used ('local', 'openai', 'ml')
             status: The analysis status ('analyzed', 'needs_review')
         """
+        now = sqlite_utcnow()
         self.conn.execute(
             """
             UPDATE lot_images
             SET analysis_status = ?,
                 analysis_backend = ?,
-                analyzed_at = datetime('now'),
-                updated_at = datetime('now')
+                analyzed_at = ?,
+                updated_at = ?
             WHERE id = ?
             """,
-            (status, backend, image_id),
+            (status, backend, now, now, image_id),
         )
 
     def mark_analysis_failed(self, image_id: int, error: str) -> None:
@@ -229,10 +359,10 @@ class LotImageRepository(BaseRepository):
             UPDATE lot_images
             SET analysis_status = 'failed',
                 error_message = ?,
-                updated_at = datetime('now')
+                updated_at = ?
             WHERE id = ?
             """,
-            (error, image_id),
+            (error, sqlite_utcnow(), image_id),
         )
 
     def reset_for_reprocessing(self, image_id: int) -> None:
@@ -243,10 +373,10 @@ class LotImageRepository(BaseRepository):
             SET analysis_status = 'pending',
                 analyzed_at = NULL,
                 error_message = NULL,
-                updated_at = datetime('now')
+                updated_at = ?
             WHERE id = ?
             """,
-            (image_id,),
+            (sqlite_utcnow(), image_id),
         )
 
     def update_phash(self, image_id: int, phash: str) -> None:
@@ -255,28 +385,28 @@ class LotImageRepository(BaseRepository):
             """
             UPDATE lot_images
             SET phash = ?,
-                updated_at = datetime('now')
+                updated_at = ?
             WHERE id = ?
             """,
-            (phash, image_id),
+            (phash, sqlite_utcnow(), image_id),
         )
 
     def get_by_phash(self, phash: str) -> list[LotImage]:
         """Get all images with a specific phash (exact match)."""
-        rows = self._fetch_all_as_dicts(
-            """
-            SELECT * FROM lot_images
+        rows = self.conn.execute(
+            f"""
+            SELECT {_IMAGE_COLUMNS} FROM lot_images
             WHERE phash = ?
             ORDER BY created_at
             """,
             (phash,),
-        )
-        return [self._row_to_image(row) for row in rows]
+        ).fetchall()
+        return [LotImage(*row) for row in rows]
 
     def get_all_with_phash(self, limit: int | None = None) -> list[LotImage]:
         """Get all images that have a computed phash."""
-        query = """
-            SELECT * FROM lot_images
+        query = f"""
+            SELECT {_IMAGE_COLUMNS} FROM lot_images
             WHERE phash IS NOT NULL
             ORDER BY created_at
         """
@@ -284,22 +414,22 @@ class LotImageRepository(BaseRepository):
         if limit:
             query += " LIMIT ?"
             params = (limit,)
-        rows = self._fetch_all_as_dicts(query, params)
-        return [self._row_to_image(row) for row in rows]
+        rows = self.conn.execute(query, params).fetchall()
+        return [LotImage(*row) for row in rows]
 
     def get_images_without_phash(self, limit: int = 100) -> list[LotImage]:
         """Get downloaded images that don't have a phash yet."""
-        rows = self._fetch_all_as_dicts(
-            """
-            SELECT * FROM lot_images
+        rows = self.conn.execute(
+            f"""
+            SELECT {_IMAGE_COLUMNS} FROM lot_images
             WHERE download_status = 'downloaded'
               AND phash IS NULL
             ORDER BY created_at
             LIMIT ?
             """,
             (limit,),
-        )
-        return [self._row_to_image(row) for row in rows]
+        ).fetchall()
+        return [LotImage(*row) for row in rows]
 
     def find_duplicates_by_phash(self) -> list[tuple[str, list[LotImage]]]:
         """Find groups of images with the same phash (duplicates).
@@ -333,19 +463,29 @@ class LotImageRepository(BaseRepository):
         return results
 
     def get_stats(self) -> dict[str, int]:
-        """Get counts by status for dashboard display."""
+        """Get counts by status for dashboard display.
+
+        Each count is a separate scalar subquery so SQLite answers it from the
+        status indexes instead of evaluating every CASE over a full table scan.
+        """
         cur = self.conn.execute(
             """
             SELECT
-                COUNT(*) as total,
-                SUM(CASE WHEN download_status = 'pending' THEN 1 ELSE 0 END) as pending_download,
-                SUM(CASE WHEN download_status = 'downloaded' THEN 1 ELSE 0 END) as downloaded,
-                SUM(CASE WHEN download_status = 'failed' THEN 1 ELSE 0 END) as download_failed,
-                SUM(CASE WHEN analysis_status = 'pending' THEN 1 ELSE 0 END) as pending_analysis,
-                SUM(CASE WHEN analysis_status = 'analyzed' THEN 1 ELSE 0 END) as analyzed,
-                SUM(CASE WHEN analysis_status = 'needs_review' THEN 1 ELSE 0 END) as needs_review,
-                SUM(CASE WHEN analysis_status = 'failed' THEN 1 ELSE 0 END) as analysis_failed
-            FROM lot_images
+                (SELECT COUNT(*) FROM lot_images) AS total,
+                (SELECT COUNT(*) FROM lot_images
+                 WHERE download_status = 'pending') AS pending_download,
+                (SELECT COUNT(*) FROM lot_images
+                 WHERE download_status = 'downloaded') AS downloaded,
+                (SELECT COUNT(*) FROM lot_images
+                 WHERE download_status = 'failed') AS download_failed,
+                (SELECT COUNT(*) FROM lot_images
+                 WHERE analysis_status = 'pending') AS pending_analysis,
+                (SELECT COUNT(*) FROM lot_images
+                 WHERE analysis_status = 'analyzed') AS analyzed,
+                (SELECT COUNT(*) FROM lot_images
+                 WHERE analysis_status = 'needs_review') AS needs_review,
+                (SELECT COUNT(*) FROM lot_images
+                 WHERE analysis_status = 'failed') AS analysis_failed
             """
         )
         row = cur.fetchone()
@@ -360,24 +500,6 @@ class LotImageRepository(BaseRepository):
             "analysis_failed": row[7] or 0,
         }
 
-    def _row_to_image(self, row: dict[str, Any]) -> LotImage:
-        """Convert a database row to a LotImage dataclass."""
-        return LotImage(
-            id=row["id"],
-            lot_id=row["lot_id"],
-            url=row["url"],
-            local_path=row["local_path"],
-            position=row["position"],
-            download_status=row["download_status"],
-            analysis_status=row["analysis_status"],
-            analysis_backend=row["analysis_backend"],
-            analyzed_at=row["analyzed_at"],
-            error_message=row["error_message"],
-            phash=row.get("phash"),
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
-        )
-
 
 class ExtractedCodeRepository(BaseRepository):
     """Repository for extracted product codes."""
@@ -392,15 +514,10 @@ class ExtractedCodeRepository(BaseRepository):
     ) -> int:
         """Insert an extracted code and return its ID."""
         cur = self.conn.execute(
-            """
-            INSERT INTO extracted_codes (lot_image_id, code_type, value, confidence, context)
-            VALUES (?, ?, ?, ?, ?)
-            RETURNING id
-            """,
+            _INSERT_CODE_SQL,
             (lot_image_id, code_type, value, confidence, context),
         )
-        row = cur.fetchone()
-        return row[0] if row else 0
+        return cur.lastrowid or 0
 
     def insert_codes(
         self,
@@ -409,6 +526,10 @@ class ExtractedCodeRepository(BaseRepository):
     ) -> list[int]:
         """Insert multiple extracted codes.
 
+        Codes are written with one multi-row ``INSERT`` per chunk.  Because
+        ``extracted_codes.id`` is ``AUTOINCREMENT``, the rows of a single
+        statement receive consecutive IDs ending at ``lastrowid``.
+
         Args:
             lot_image_id: The image ID
             codes: List of dicts with code_type, value, confidence, context
@@ -417,15 +538,24 @@ class ExtractedCodeRepository(BaseRepository):
             List of inserted IDs
         """
         inserted_ids: list[int] = []
-        for code in codes:
-            code_id = self.insert_code(
-                lot_image_id=lot_image_id,
-                code_type=code.get("code_type", "other"),
-                value=code.get("value", ""),
-                confidence=code.get("confidence", "medium"),
-                context=code.get("context"),
+        rows = (
+            (
+                lot_image_id,
+                code.get("code_type", "other"),
+                code.get("value", ""),
+                code.get("confidence", "medium"),
+                code.get("context"),
             )
-            inserted_ids.append(code_id)
+            for code in codes
+        )
+        for chunk in batched(rows, _INSERT_CHUNK_SIZE):
+            values = ", ".join(["(?, ?, ?, ?, ?)"] * len(chunk))
+            cur = self.conn.execute(
+                f"{_INSERT_CODES_PREFIX} {values}",
+                [param for row in chunk for param in row],
+            )
+            last_id = cur.lastrowid or 0
+            inserted_ids.extend(range(last_id - len(chunk) + 1, last_id + 1))
         return inserted_ids
 
     def bulk_insert_codes(
@@ -446,38 +576,60 @@ class ExtractedCodeRepository(BaseRepository):
             return 0
 
         self.conn.executemany(
-            """
-            INSERT INTO extracted_codes (lot_image_id, code_type, value, confidence, context)
-            VALUES (?, ?, ?, ?, ?)
-            """,
+            _INSERT_CODE_SQL,
             codes,
         )
         return len(codes)
 
     def get_by_image_id(self, lot_image_id: int) -> list[ExtractedCode]:
         """Get all codes extracted from an image."""
-        rows = self._fetch_all_as_dicts(
-            """
-            SELECT * FROM extracted_codes
+        rows = self.conn.execute(
+            f"""
+            SELECT {_CODE_COLUMNS} FROM extracted_codes
             WHERE lot_image_id = ?
             ORDER BY code_type, value
             """,
             (lot_image_id,),
-        )
-        return [self._row_to_code(row) for row in rows]
+        ).fetchall()
+        return [_code_from_row(row) for row in rows]
 
     def get_by_lot_id(self, lot_id: int) -> list[ExtractedCode]:
         """Get all codes for a lot (across all images)."""
-        rows = self._fetch_all_as_dicts(
-            """
-            SELECT ec.* FROM extracted_codes ec
+        rows = self.conn.execute(
+            f"""
+            SELECT {_EC_CODE_COLUMNS} FROM extracted_codes ec
             JOIN lot_images li ON ec.lot_image_id = li.id
             WHERE li.lot_id = ?
             ORDER BY ec.code_type, ec.value
             """,
             (lot_id,),
-        )
-        return [self._row_to_code(row) for row in rows]
+        ).fetchall()
+        return [_code_from_row(row) for row in rows]
+
+    def get_by_lot_ids(self, lot_ids: list[int]) -> dict[int, list[ExtractedCode]]:
+        """Get codes for several lots, grouped by lot ID.
+
+        Replaces one ``get_by_image_id`` call per image with one JOIN per chunk
+        of lot IDs.
+        Lots without codes are absent from the result; use ``.get(lot_id, [])``.
+        """
+        grouped: dict[int, list[ExtractedCode]] = {}
+        for chunk in batched(dict.fromkeys(lot_ids), _IN_CHUNK_SIZE):
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"""
+                SELECT li.lot_id, {_EC_CODE_COLUMNS} FROM extracted_codes ec
+                JOIN lot_images li ON ec.lot_image_id = li.id
+                WHERE li.lot_id IN ({placeholders})
+                ORDER BY li.lot_id, ec.code_type, ec.value
+                """,
+                chunk,
+            ).fetchall()
+            grouped.update(
+                (lot_id, [_code_from_row(row[1:]) for row in group])
+                for lot_id, group in groupby(rows, key=itemgetter(0))
+            )
+        return grouped
 
     def delete_by_image_id(self, lot_image_id: int) -> int:
         """Delete all codes for an image (before reprocessing)."""
@@ -487,22 +639,6 @@ class ExtractedCodeRepository(BaseRepository):
         )
         return cur.rowcount
 
-    def _row_to_code(self, row: dict[str, Any]) -> ExtractedCode:
-        """Convert a database row to an ExtractedCode dataclass."""
-        return ExtractedCode(
-            id=row["id"],
-            lot_image_id=row["lot_image_id"],
-            code_type=row["code_type"],
-            value=row["value"],
-            confidence=row["confidence"],
-            context=row["context"],
-            created_at=row["created_at"],
-            approved=bool(row.get("approved", 0)),
-            approved_at=row.get("approved_at"),
-            approved_by=row.get("approved_by"),
-            promoted_to_lot=bool(row.get("promoted_to_lot", 0)),
-        )
-
     def approve_code(
         self,
         code_id: int,
@@ -513,11 +649,11 @@ class ExtractedCodeRepository(BaseRepository):
             """
             UPDATE extracted_codes
             SET approved = 1,
-                approved_at = datetime('now'),
+                approved_at = ?,
                 approved_by = ?
             WHERE id = ?
             """,
-            (approved_by, code_id),
+            (sqlite_utcnow(), approved_by, code_id),
         )
 
     def approve_codes_by_image(
@@ -530,39 +666,39 @@ class ExtractedCodeRepository(BaseRepository):
             """
             UPDATE extracted_codes
             SET approved = 1,
-                approved_at = datetime('now'),
+                approved_at = ?,
                 approved_by = ?
             WHERE lot_image_id = ? AND approved = 0
             """,
-            (approved_by, lot_image_id),
+            (sqlite_utcnow(), approved_by, lot_image_id),
         )
         return cur.rowcount
 
     def get_unapproved(self, limit: int = 100) -> list[ExtractedCode]:
         """Get codes that need manual approval."""
-        rows = self._fetch_all_as_dicts(
-            """
-            SELECT * FROM extracted_codes
+        rows = self.conn.execute(
+            f"""
+            SELECT {_CODE_COLUMNS} FROM extracted_codes
             WHERE approved = 0
             ORDER BY created_at
             LIMIT ?
             """,
             (limit,),
-        )
-        return [self._row_to_code(row) for row in rows]
+        ).fetchall()
+        return [_code_from_row(row) for row in rows]
 
     def get_approved_for_promotion(self, limit: int = 100) -> list[ExtractedCode]:
         """Get approved codes that haven't been promoted to lots yet."""
-        rows = self._fetch_all_as_dicts(
-            """
-            SELECT * FROM extracted_codes
+        rows = self.conn.execute(
+            f"""
+            SELECT {_CODE_COLUMNS} FROM extracted_codes
             WHERE approved = 1 AND promoted_to_lot = 0
             ORDER BY created_at
             LIMIT ?
             """,
             (limit,),
-        )
-        return [self._row_to_code(row) for row in rows]
+        ).fetchall()
+        return [_code_from_row(row) for row in rows]
 
     def mark_promoted(self, code_id: int) -> None:
         """Mark a code as promoted to the lot record."""
@@ -604,13 +740,13 @@ class ExtractedCodeRepository(BaseRepository):
 
     def get_by_id(self, code_id: int) -> ExtractedCode | None:
         """Get a single code by ID."""
-        row = self._fetch_one_as_dict(
-            "SELECT * FROM extracted_codes WHERE id = ?",
+        row = self.conn.execute(
+            f"SELECT {_CODE_COLUMNS} FROM extracted_codes WHERE id = ?",
             (code_id,),
-        )
-        if not row or row.get("id") is None:
+        ).fetchone()
+        if row is None:
             return None
-        return self._row_to_code(row)
+        return _code_from_row(row)
 
     def get_pending_approval(
         self,
@@ -618,16 +754,16 @@ class ExtractedCodeRepository(BaseRepository):
         offset: int = 0,
     ) -> list[ExtractedCode]:
         """Get codes pending approval with pagination."""
-        rows = self._fetch_all_as_dicts(
-            """
-            SELECT * FROM extracted_codes
+        rows = self.conn.execute(
+            f"""
+            SELECT {_CODE_COLUMNS} FROM extracted_codes
             WHERE approved = 0
             ORDER BY created_at DESC
             LIMIT ? OFFSET ?
             """,
             (limit, offset),
-        )
-        return [self._row_to_code(row) for row in rows]
+        ).fetchall()
+        return [_code_from_row(row) for row in rows]
 
     def count_pending_approval(self) -> int:
         """Count total codes pending approval."""
@@ -675,16 +811,29 @@ class OcrTokenRepository(BaseRepository):
 
         Returns:
             The record ID
+
+        The write is skipped when the stored ``tokens_hash`` already matches
+        and no label flag needs to be raised.
         """
-        tokens_json = json.dumps(tokens)
-        token_count = len(tokens.get("text", []))
+        payload = dump_tokens(tokens)
+        tokens_hash = tokens_digest(payload)
+        existing = self.conn.execute(
+            "SELECT id, tokens_hash, has_labels FROM ocr_token_data "
+            "WHERE lot_image_id = ?",
+            (lot_image_id,),
+        ).fetchone()
+        if existing and existing[1] == tokens_hash and (existing[2] or not has_labels):
+            return existing[0]
 
+        token_count = len(tokens.get("text", []))
         cur = self.conn.execute(
             """
-            INSERT INTO ocr_token_data (lot_image_id, tokens_json, token_count, has_labels)
-            VALUES (?, ?, ?, ?)
+            INSERT INTO ocr_token_data
+                (lot_image_id, tokens_zstd, tokens_hash, token_count, has_labels)
+            VALUES (?, ?, ?, ?, ?)
             ON CONFLICT (lot_image_id) DO UPDATE SET
-                tokens_json = excluded.tokens_json,
+                tokens_zstd = excluded.tokens_zstd,
+                tokens_hash = excluded.tokens_hash,
                 token_count = excluded.token_count,
                 has_labels = CASE
                     WHEN excluded.has_labels = 1 THEN 1
@@ -692,43 +841,58 @@ class OcrTokenRepository(BaseRepository):
                 END
             RETURNING id
             """,
-            (lot_image_id, tokens_json, token_count, 1 if has_labels else 0),
+            (
+                lot_image_id,
+                compress_tokens(payload),
+                tokens_hash,
+                token_count,
+                1 if has_labels else 0,
+            ),
         )
         row = cur.fetchone()
         return row[0] if row else 0
 
     def get_by_image_id(self, lot_image_id: int) -> OcrTokenData | None:
         """Get token data for an image."""
-        row = self._fetch_one_as_dict(
-            "SELECT * FROM ocr_token_data WHERE lot_image_id = ?",
+        row = self.conn.execute(
+            f"SELECT {_TOKEN_COLUMNS} FROM ocr_token_data WHERE lot_image_id = ?",
             (lot_image_id,),
-        )
-        if not row or row.get("id") is None:
-            return None
-        return self._row_to_token_data(row)
+        ).fetchone()
+        return _token_from_row(row) if row else None
 
-    def get_for_training(self, limit: int = 1000) -> list[OcrTokenData]:
-        """Get token data that has been labeled for training."""
-        rows = self._fetch_all_as_dicts(
-            """
-            SELECT * FROM ocr_token_data
+    def get_for_training(
+        self, limit: int = 1000, *, executor: Executor | None = None
+    ) -> Iterator[OcrTokenData]:
+        """Yield token data that has been labeled for training.
+
+        Rows are streamed in batches, so only one batch of token payloads is
+        decoded and held in memory at a time.  Pass an ``executor`` (e.g. a
+        ``ProcessPoolExecutor``) to decode payloads off the calling thread.
+        """
+        cur = self.conn.execute(
+            f"""
+            SELECT {_TOKEN_COLUMNS} FROM ocr_token_data
             WHERE has_labels = 1
-            ORDER BY created_at
+            ORDER BY created_at, id
             LIMIT ?
             """,
             (limit,),
         )
-        return [self._row_to_token_data(row) for row in rows]
+        return _stream_tokens(cur, executor)
+
+    def get_all_for_export(
+        self, limit: int | None = None, *, executor: Executor | None = None
+    ) -> Iterator[OcrTokenData]:
+        """Yield all token data for export (with or without labels).
 
-    def get_all_for_export(self, limit: int | None = None) -> list[OcrTokenData]:
-        """Get all token data for export (with or without labels)."""
-        query = "SELECT * FROM ocr_token_data ORDER BY created_at"
+        See :meth:`get_for_training` for ``executor``.
+        """
+        query = f"SELECT {_TOKEN_COLUMNS} FROM ocr_token_data ORDER BY created_at, id"
         params: tuple = ()
         if limit:
             query += " LIMIT ?"
             params = (limit,)
-        rows = self._fetch_all_as_dicts(query, params)
-        return [self._row_to_token_data(row) for row in rows]
+        return _stream_tokens(self.conn.execute(query, params), executor)
 
     def mark_as_labeled(self, lot_image_id: int) -> None:
         """Mark token data as manually labeled."""
@@ -737,6 +901,23 @@ class OcrTokenRepository(BaseRepository):
             (lot_image_id,),
         )
 
+    def mark_as_labeled_bulk(self, lot_image_ids: Iterable[int]) -> int:
+        """Mark token data for several images as labeled.
+
+        Issues one ``UPDATE ... IN (...)`` per chunk of IDs instead of one
+        statement per image.  Returns the number of rows updated.
+        """
+        updated = 0
+        for chunk in batched(lot_image_ids, _IN_CHUNK_SIZE):
+            placeholders = ",".join("?" * len(chunk))
+            cur = self.conn.execute(
+                "UPDATE ocr_token_data SET has_labels = 1 "
+                f"WHERE lot_image_id IN ({placeholders})",
+                chunk,
+            )
+            updated += cur.rowcount
+        return updated
+
     def get_stats(self) -> dict[str, int]:
         """Get statistics for token data."""
         cur = self.conn.execute(
@@ -755,23 +936,6 @@ class OcrTokenRepository(BaseRepository):
             "total_tokens": row[2] or 0,
         }
 
-    def _row_to_token_data(self, row: dict[str, Any]) -> OcrTokenData:
-        """Convert a database row to an OcrTokenData dataclass."""
-        tokens_json = row.get("tokens_json", "{}")
-        try:
-            tokens = json.loads(tokens_json)
-        except json.JSONDecodeError:
-            tokens = {}
-
-        return OcrTokenData(
-            id=row["id"],
-            lot_image_id=row["lot_image_id"],
-            tokens=tokens,
-            token_count=row["token_count"],
-            has_labels=bool(row["has_labels"]),
-            created_at=row["created_at"],
-        )
-
 
 __all__ = [
     "ExtractedCode",
@@ -1,41 +1,73 @@
 from __future__ import annotations
 
+import functools
+import json
 import sqlite3
-from typing import Any
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from itertools import batched
+from typing import Any, NamedTuple
 
 from ..schema import ensure_schema
 from .base import BaseRepository
 from troostwatch.infrastructure.web.parsers.lot_card import LotCardData
-from troostwatch.infrastructure.web.parsers.lot_detail import LotDetailData
+from troostwatch.infrastructure.web.parsers.lot_detail import (
+    BidHistoryEntry,
+    LotDetailData,
+)
+
+_ID_CACHE_SIZE = 256
+# Lot codes per IN (...) id lookup after a bulk upsert.
+_IN_CHUNK_SIZE = 500
+# Tables cleaned up explicitly by delete_lot when foreign keys are disabled.
+_LOT_CHILD_TABLES = (
+    "bid_history",
+    "reference_prices",
+    "product_layers",
+    "my_lot_positions",
+)
 
 
 class LotRepository(BaseRepository):
     def __init__(self, conn: sqlite3.Connection) -> None:
         super().__init__(conn)
         ensure_schema(self.conn)
+        # Resolved (lot_code, auction_code) -> lot ID.  Lot IDs never change
+        # once assigned, so only deletions invalidate entries; misses are not
+        # cached because the lot may be inserted later.
+        self._id_cache: OrderedDict[tuple[str, str | None], int] = OrderedDict()
 
     def get_id(self, lot_code: str, auction_code: str | None = None) -> int | None:
-        query = "SELECT l.id FROM lots l JOIN auctions a ON l.auction_id = a.id WHERE l.lot_code = ?"
-
-        def _lookup(code: str) -> int | None:
-            params: list = [code]
-            local_query = query
-            if auction_code is not None:
-                local_query += " AND a.auction_code = ?"
-                params.append(auction_code)
-            cur = self.conn.execute(local_query, tuple(params))
-            row = cur.fetchone()
-            return row[0] if row else None
-
-        lot_id = _lookup(lot_code)
-        if (
-            lot_id is None
-            and auction_code
-            and not lot_code.startswith(f"{auction_code}-")
-        ):
-            lot_id = _lookup(f"{auction_code}-{lot_code}")
+        key = (lot_code, auction_code)
+        lot_id = self._id_cache.get(key)
+        if lot_id is not None:
+            self._id_cache.move_to_end(key)
+            return lot_id
+        lot_id = self._lookup_id(lot_code, auction_code)
+        if lot_id is not None:
+            self._id_cache[key] = lot_id
+            if len(self._id_cache) > _ID_CACHE_SIZE:
+                self._id_cache.popitem(last=False)
         return lot_id
 
+    def _lookup_id(self, lot_code: str, auction_code: str | None) -> int | None:
+        return self._fetch_scalar(*_lot_id_query(lot_code, auction_code))
+
+    def _lot_id_ref(
+        self, lot_code: str, auction_code: str | None
+    ) -> tuple[str, tuple[Any, ...]]:
+        """Return SQL for a lot's id, for use as ``lot_id = <ref>``.
+
+        A cached id is bound directly; otherwise the :meth:`get_id` lookup is
+        inlined as a scalar subquery, so per-lot reads need one statement.  A
+        missing lot yields NULL and therefore no rows.
+        """
+        lot_id = self._id_cache.get((lot_code, auction_code))
+        if lot_id is not None:
+            return "?", (lot_id,)
+        query, params = _lot_id_query(lot_code, auction_code)
+        return f"({query})", params
+
     def get_lot_by_id(self, lot_id: int) -> Any | None:
         """Get a lot by its database ID. Returns a simple object with lot_code."""
         row = self._fetch_one_as_dict(
@@ -58,12 +90,34 @@ class LotRepository(BaseRepository):
             auction_code=row["auction_code"],
         )
 
+    def get_lots_by_ids(self, lot_ids: Iterable[int]) -> dict[int, Any]:
+        """Batched :meth:`get_lot_by_id`, keyed by ID; unknown IDs are absent."""
+        from types import SimpleNamespace
+
+        lots: dict[int, Any] = {}
+        for chunk in batched(dict.fromkeys(lot_ids), _IN_CHUNK_SIZE):
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"""
+                SELECT l.id, l.lot_code, a.auction_code
+                FROM lots l
+                JOIN auctions a ON l.auction_id = a.id
+                WHERE l.id IN ({placeholders})
+                """,
+                chunk,
+            )
+            for lot_id, lot_code, auction_code in rows:
+                lots[lot_id] = SimpleNamespace(
+                    id=lot_id, lot_code=lot_code, auction_code=auction_code
+                )
+        return lots
+
     def list_lot_codes_by_auction(self, auction_code: str) -> list[str]:
         rows = self.conn.execute(
             """
             SELECT l.lot_code
-            FROM lots l
-            JOIN auctions a ON l.auction_id = a.id
+            FROM auctions a
+            CROSS JOIN lots l ON l.auction_id = a.id
             WHERE a.auction_code = ?
             ORDER BY l.lot_code
             """,
@@ -79,41 +133,77 @@ class LotRepository(BaseRepository):
         brand: str | None = None,
         limit: int | None = None,
     ) -> list[dict[str, str | None]]:
-        query = """
-            SELECT a.auction_code AS auction_code,
-                   l.lot_code AS lot_code,
-                   l.title AS title,
-                   l.state AS state,
-                   l.current_bid_eur AS current_bid_eur,
-                   l.bid_count AS bid_count,
-                   l.current_bidder_label AS current_bidder_label,
-                   l.closing_time_current AS closing_time_current,
-                   l.closing_time_original AS closing_time_original,
-                   l.brand AS brand
-            FROM lots l
-            JOIN auctions a ON l.auction_id = a.id
+        query, params = self._list_lots_query(
+            _LIST_LOT_COLUMNS,
+            auction_code=auction_code,
+            state=state,
+            brand=brand,
+            limit=limit,
+        )
+        return self._fetch_all_as_dicts(query, params)
+
+    def iter_lots(
+        self,
+        *,
+        auction_code: str | None = None,
+        state: str | None = None,
+        brand: str | None = None,
+        limit: int | None = None,
+    ) -> Iterator[dict[str, str | None]]:
+        """Like :meth:`list_lots`, yielding lots as they are fetched.
+
+        Suited to exports and other consumers that handle one lot at a time
+        over large auctions; memory stays bounded by the fetch batch.
         """
+        query, params = self._list_lots_query(
+            _LIST_LOT_COLUMNS,
+            auction_code=auction_code,
+            state=state,
+            brand=brand,
+            limit=limit,
+        )
+        return self._iter_dicts(query, params)
 
-        conditions: list[str] = []
-        params: list = []
-        if auction_code:
-            conditions.append("a.auction_code = ?")
-            params.append(auction_code)
-        if state:
-            conditions.append("l.state = ?")
-            params.append(state)
-        if brand:
-            conditions.append("l.brand = ?")
-            params.append(brand)
-        if conditions:
-            query += " WHERE " + " AND ".join(conditions)
-
-        query += " ORDER BY a.auction_code, l.lot_code"
+    def list_lots_rows(
+        self,
+        *,
+        auction_code: str | None = None,
+        state: str | None = None,
+        brand: str | None = None,
+        limit: int | None = None,
+    ) -> list[LotRow]:
+        """Like :meth:`list_lots`, returning compact :class:`LotRow` tuples.
+
+        Use ``row._asdict()`` where a mapping is needed.
+        """
+        query, params = self._list_lots_query(
+            _LIST_LOT_COLUMNS,
+            auction_code=auction_code,
+            state=state,
+            brand=brand,
+            limit=limit,
+        )
+        return [LotRow(*row) for row in self.conn.execute(query, params).fetchall()]
+
+    def _list_lots_query(
+        self,
+        columns: str,
+        *,
+        auction_code: str | None,
+        state: str | None,
+        brand: str | None,
+        limit: int | None,
+    ) -> tuple[str, tuple[Any, ...]]:
+        filters = (auction_code or None, state or None, brand or None)
+        params: list[Any] = [value for value in filters if value is not None]
         if limit is not None:
-            query += " LIMIT ?"
             params.append(limit)
-
-        return self._fetch_all_as_dicts(query, tuple(params))
+        query = _list_lots_sql(
+            columns,
+            *(value is not None for value in filters),
+            limit is not None,
+        )
+        return query, tuple(params)
 
     def get_lot_detail(
         self, lot_code: str, auction_code: str | None = None
@@ -124,8 +214,8 @@ class LotRepository(BaseRepository):
                    l.current_bid_eur, l.bid_count, l.opening_bid_eur,
                    l.closing_time_current, l.closing_time_original, l.brand, l.ean,
                    l.location_city, l.location_country, l.notes
-            FROM lots l
-            JOIN auctions a ON l.auction_id = a.id
+            FROM auctions a
+            CROSS JOIN lots l ON l.auction_id = a.id
             WHERE l.lot_code = ?
         """
         params: list[object] = [lot_code]
@@ -139,45 +229,67 @@ class LotRepository(BaseRepository):
         self, lot_code: str, auction_code: str | None = None
     ) -> list[dict[str, Any]]:
         """Get specifications (product_layers) for a lot, including parent_id, ean, price for hierarchy."""
-        lot_id = self.get_id(lot_code, auction_code)
-        if not lot_id:
-            return []
+        lot_ref, params = self._lot_id_ref(lot_code, auction_code)
+        # SQLite sorts NULL first in ascending order, so top-level specs lead
+        # and the order is served by idx_product_layers_lot_parent_layer.
         return self._fetch_all_as_dicts(
             "SELECT id, parent_id, template_id, title AS key, value, ean, "
             "price_eur, release_date, category "
-            "FROM product_layers WHERE lot_id = ? "
-            "ORDER BY parent_id NULLS FIRST, layer",
-            (lot_id,),
+            f"FROM product_layers WHERE lot_id = {lot_ref} "
+            "ORDER BY parent_id, layer",
+            params,
         )
 
     def get_reference_prices(
         self, lot_code: str, auction_code: str | None = None
     ) -> list[dict[str, Any]]:
         """Get all reference prices for a lot."""
-        lot_id = self.get_id(lot_code, auction_code)
-        if not lot_id:
-            return []
-
+        lot_ref, params = self._lot_id_ref(lot_code, auction_code)
         return self._fetch_all_as_dicts(
-            """SELECT id, condition, price_eur, source, url, notes, created_at
-               FROM reference_prices WHERE lot_id = ? ORDER BY created_at DESC""",
-            (lot_id,),
+            f"""SELECT id, condition, price_eur, source, url, notes, created_at
+               FROM reference_prices WHERE lot_id = {lot_ref}
+               ORDER BY created_at DESC""",
+            params,
         )
 
     def get_bid_history(
         self, lot_code: str, auction_code: str | None = None
     ) -> list[dict[str, Any]]:
         """Get bid history for a lot, ordered by timestamp descending (most recent first)."""
-        lot_id = self.get_id(lot_code, auction_code)
-        if not lot_id:
-            return []
-
+        lot_ref, params = self._lot_id_ref(lot_code, auction_code)
         return self._fetch_all_as_dicts(
-            """SELECT id, bidder_label, amount_eur, timestamp, created_at
-               FROM bid_history WHERE lot_id = ? ORDER BY timestamp DESC, id DESC""",
-            (lot_id,),
+            f"""SELECT id, bidder_label, amount_eur, bid_time AS timestamp,
+                      NULL AS created_at
+               FROM bid_history WHERE lot_id = {lot_ref}
+               ORDER BY bid_time DESC, id DESC""",
+            params,
         )
 
+    def get_lot_bundle(
+        self, lot_code: str, auction_code: str | None = None
+    ) -> dict[str, Any] | None:
+        """Get a lot's detail, specs and reference prices at once.
+
+        Returns ``None`` if the lot does not exist, otherwise a dict with the
+        keys ``detail``, ``specs`` and ``reference_prices``, shaped like the
+        results of the corresponding ``get_*`` methods.  The lot id lookup is
+        inlined and the sections are aggregated to JSON, so this is a single
+        query.
+        """
+        # An empty auction code means "no filter", as in get_lot_detail.
+        lot_ref, params = self._lot_id_ref(lot_code, auction_code or None)
+        row = self.conn.execute(
+            _LOT_BUNDLE_SQL.format(lot_ref=lot_ref), params
+        ).fetchone()
+        if not row or row[0] is None:
+            return None
+        detail, specs, reference_prices = map(json.loads, row)
+        return {
+            "detail": detail,
+            "specs": specs,
+            "reference_prices": reference_prices,
+        }
+
     def add_reference_price(
         self,
         lot_code: str,
@@ -198,7 +310,7 @@ class LotRepository(BaseRepository):
                VALUES (?, ?, ?, ?, ?, ?)""",
             (lot_id, condition, price_eur, source, url, notes),
         )
-        self.conn.commit()
+        self._commit()
         return ref_id
 
     def update_reference_price(
@@ -211,42 +323,18 @@ class LotRepository(BaseRepository):
         notes: str | None = None,
     ) -> bool:
         """Update a reference price. Returns True if updated."""
-        updates = []
-        params: list[object] = []
-
-        if price_eur is not None:
-            updates.append("price_eur = ?")
-            params.append(price_eur)
-        if condition is not None:
-            updates.append("condition = ?")
-            params.append(condition)
-        if source is not None:
-            updates.append("source = ?")
-            params.append(source)
-        if url is not None:
-            updates.append("url = ?")
-            params.append(url)
-        if notes is not None:
-            updates.append("notes = ?")
-            params.append(notes)
-
-        if not updates:
+        values = (price_eur, condition, source, url, notes)
+        if all(value is None for value in values):
             return True
 
-        updates.append("updated_at = datetime('now')")
-        params.append(ref_id)
-
-        cur = self.conn.execute(
-            f"UPDATE reference_prices SET {', '.join(updates)} WHERE id = ?",
-            tuple(params),
-        )
-        self.conn.commit()
+        cur = self.conn.execute(_UPDATE_REFERENCE_PRICE_SQL, (*values, ref_id))
+        self._commit()
         return cur.rowcount > 0
 
     def delete_reference_price(self, ref_id: int) -> bool:
         """Delete a reference price. Returns True if deleted."""
         cur = self.conn.execute("DELETE FROM reference_prices WHERE id = ?", (ref_id,))
-        self.conn.commit()
+        self._commit()
         return cur.rowcount > 0
 
     def update_lot(
@@ -262,22 +350,9 @@ class LotRepository(BaseRepository):
         if not lot_id:
             return False
 
-        updates = []
-        params: list[object] = []
-        if notes is not None:
-            updates.append("notes = ?")
-            params.append(notes)
-        if ean is not None:
-            updates.append("ean = ?")
-            params.append(ean)
-
-        if updates:
-            params.append(lot_id)
-            self.conn.execute(
-                f"UPDATE lots SET {', '.join(updates)} WHERE id = ?",
-                tuple(params),
-            )
-            self.conn.commit()
+        if notes is not None or ean is not None:
+            self.conn.execute(_UPDATE_LOT_SQL, (notes, ean, lot_id))
+            self._commit()
         return True
 
     def upsert_lot_spec(
@@ -298,72 +373,27 @@ class LotRepository(BaseRepository):
         if not lot_id:
             raise ValueError(f"Lot '{lot_code}' not found")
 
-        # Check if spec exists (matching parent_id)
-        existing_id: int | None
-        if parent_id is not None:
-            existing_id = self._fetch_scalar(
-                "SELECT id FROM product_layers WHERE lot_id = ? AND title = ? AND parent_id = ?",
-                (lot_id, key, parent_id),
-            )
-        else:
-            existing_id = self._fetch_scalar(
-                "SELECT id FROM product_layers WHERE lot_id = ? AND title = ? AND parent_id IS NULL",
-                (lot_id, key),
-            )
-        if existing_id:
-            self._execute(
-                "UPDATE product_layers SET value = ?, ean = ?, price_eur = ?, "
-                "template_id = ?, release_date = ?, category = ? WHERE id = ?",
-                (
-                    value,
-                    ean,
-                    price_eur,
-                    template_id,
-                    release_date,
-                    category,
-                    existing_id,
-                ),
-            )
-            self.conn.commit()
-            return existing_id
-        else:
-            # Get max layer number for this parent
-            next_layer: int
-            if parent_id is not None:
-                next_layer = self._fetch_scalar(
-                    "SELECT COALESCE(MAX(layer), -1) + 1 FROM product_layers WHERE lot_id = ? AND parent_id = ?",
-                    (lot_id, parent_id),
-                )
-            else:
-                next_layer = self._fetch_scalar(
-                    "SELECT COALESCE(MAX(layer), -1) + 1 FROM product_layers WHERE lot_id = ? AND parent_id IS NULL",
-                    (lot_id,),
-                )
-            spec_id = self._execute_insert(
-                "INSERT INTO product_layers "
-                "(lot_id, parent_id, layer, title, value, ean, price_eur, "
-                "template_id, release_date, category) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                (
-                    lot_id,
-                    parent_id,
-                    next_layer,
-                    key,
-                    value,
-                    ean,
-                    price_eur,
-                    template_id,
-                    release_date,
-                    category,
-                ),
-            )
-            self.conn.commit()
-            return spec_id
+        (spec_id,) = self.conn.execute(
+            _UPSERT_LOT_SPEC_SQL,
+            {
+                "lot_id": lot_id,
+                "parent_id": parent_id,
+                "title": key,
+                "value": value,
+                "ean": ean,
+                "price_eur": price_eur,
+                "template_id": template_id,
+                "release_date": release_date,
+                "category": category,
+            },
+        ).fetchone()
+        self._commit()
+        return spec_id
 
     def delete_lot_spec(self, spec_id: int) -> bool:
         """Delete a specification by id. Returns True if deleted."""
         cur = self._execute("DELETE FROM product_layers WHERE id = ?", (spec_id,))
-        self.conn.commit()
+        self._commit()
         return cur.rowcount > 0
 
     # -------------------------------------------------------------------------
@@ -412,7 +442,7 @@ class LotRepository(BaseRepository):
             "VALUES (?, ?, ?, ?, ?, ?, ?)",
             (title, value, ean, price_eur, parent_id, release_date, category),
         )
-        self.conn.commit()
+        self._commit()
         return template_id
 
     def update_spec_template(
@@ -426,44 +456,18 @@ class LotRepository(BaseRepository):
         category: str | None = None,
     ) -> bool:
         """Update a spec template. Returns True if updated."""
-        updates = []
-        params: list[object] = []
-        if title is not None:
-            updates.append("title = ?")
-            params.append(title)
-        if value is not None:
-            updates.append("value = ?")
-            params.append(value)
-        if ean is not None:
-            updates.append("ean = ?")
-            params.append(ean)
-        if price_eur is not None:
-            updates.append("price_eur = ?")
-            params.append(price_eur)
-        if release_date is not None:
-            updates.append("release_date = ?")
-            params.append(release_date)
-        if category is not None:
-            updates.append("category = ?")
-            params.append(category)
-
-        if not updates:
+        values = (title, value, ean, price_eur, release_date, category)
+        if all(field is None for field in values):
             return True
 
-        updates.append("updated_at = datetime('now')")
-        params.append(template_id)
-
-        cur = self._execute(
-            f"UPDATE spec_templates SET {', '.join(updates)} WHERE id = ?",
-            tuple(params),
-        )
-        self.conn.commit()
+        cur = self._execute(_UPDATE_SPEC_TEMPLATE_SQL, (*values, template_id))
+        self._commit()
         return cur.rowcount > 0
 
     def delete_spec_template(self, template_id: int) -> bool:
         """Delete a spec template. Returns True if deleted."""
         cur = self._execute("DELETE FROM spec_templates WHERE id = ?", (template_id,))
-        self.conn.commit()
+        self._commit()
         return cur.rowcount > 0
 
     def apply_template_to_lot(
@@ -473,23 +477,24 @@ class LotRepository(BaseRepository):
         auction_code: str | None = None,
         parent_id: int | None = None,
     ) -> int:
-        """Apply a spec template to a lot. Creates a new product_layer linked to the template."""
-        template = self.get_spec_template(template_id)
-        if not template:
-            raise ValueError(f"Template {template_id} not found")
+        """Apply a spec template to a lot.
 
-        return self.upsert_lot_spec(
-            lot_code=lot_code,
-            key=str(template.get("title") or ""),
-            value=template.get("value") or "",
-            auction_code=auction_code,
-            parent_id=parent_id,
-            ean=template.get("ean"),
-            price_eur=template.get("price_eur"),
-            template_id=template_id,
-            release_date=template.get("release_date"),
-            category=template.get("category"),
-        )
+        Creates a new product_layer linked to the template.  The template row
+        is copied by a single ``INSERT ... SELECT`` upsert, so its fields never
+        round-trip through Python.
+        """
+        lot_id = self.get_id(lot_code, auction_code)
+        if not lot_id:
+            raise ValueError(f"Lot '{lot_code}' not found")
+
+        row = self.conn.execute(
+            _APPLY_SPEC_TEMPLATE_SQL,
+            {"lot_id": lot_id, "parent_id": parent_id, "template_id": template_id},
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"Template {template_id} not found")
+        self._commit()
+        return row[0]
 
     def upsert_from_parsed(
         self,
@@ -507,165 +512,422 @@ class LotRepository(BaseRepository):
         Returns:
             The lot ID (either newly inserted or existing).
         """
-        lot_title = detail.title or card.title
-        lot_url = detail.url or card.url
-        lot_state = detail.state or card.state
-        lot_opens_at = detail.opens_at or card.opens_at
-        lot_closing_current = detail.closing_time_current or card.closing_time_current
-        lot_closing_original = detail.closing_time_original
-        lot_bid_count = (
-            detail.bid_count if detail.bid_count is not None else card.bid_count
-        )
-        lot_opening_bid = _choose_value(
-            detail.opening_bid_eur,
-            card.price_eur if card.is_price_opening_bid else None,
+        lot_ids = self.upsert_many_from_parsed(
+            auction_id,
+            [
+                ParsedLot(
+                    card,
+                    detail,
+                    listing_hash=listing_hash,
+                    detail_hash=detail_hash,
+                    last_seen_at=last_seen_at,
+                    detail_last_seen_at=detail_last_seen_at,
+                )
+            ],
         )
-        lot_current_bid = _choose_value(detail.current_bid_eur, card.price_eur)
-        location_city = detail.location_city or card.location_city
-        location_country = detail.location_country or card.location_country
+        return lot_ids[card.lot_code]
 
-        self.conn.execute(
-            """
-            INSERT INTO lots (
-                auction_id, lot_code, title, url, state, status, opens_at,
-                closing_time_current, closing_time_original, bid_count,
-                opening_bid_eur, current_bid_eur, current_bidder_label,
-                buyer_fee_percent, buyer_fee_vat_percent, vat_percent,
-                awarding_state, total_example_price_eur, location_city,
-                location_country, seller_allocation_note, brand,
-                listing_hash, detail_hash, last_seen_at, detail_last_seen_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(auction_id, lot_code) DO UPDATE SET
-                title = excluded.title,
-                url = excluded.url,
-                state = excluded.state,
-                status = excluded.status,
-                opens_at = excluded.opens_at,
-                closing_time_current = excluded.closing_time_current,
-                closing_time_original = excluded.closing_time_original,
-                bid_count = excluded.bid_count,
-                opening_bid_eur = excluded.opening_bid_eur,
-                current_bid_eur = excluded.current_bid_eur,
-                current_bidder_label = excluded.current_bidder_label,
-                buyer_fee_percent = excluded.buyer_fee_percent,
-                buyer_fee_vat_percent = excluded.buyer_fee_vat_percent,
-                vat_percent = excluded.vat_percent,
-                awarding_state = excluded.awarding_state,
-                total_example_price_eur = excluded.total_example_price_eur,
-                location_city = excluded.location_city,
-                location_country = excluded.location_country,
-                seller_allocation_note = excluded.seller_allocation_note,
-                brand = excluded.brand,
-                listing_hash = excluded.listing_hash,
-                detail_hash = excluded.detail_hash,
-                last_seen_at = excluded.last_seen_at,
-                detail_last_seen_at = excluded.detail_last_seen_at
-            """,
-            (
-                auction_id,
-                card.lot_code,
-                lot_title,
-                lot_url,
-                lot_state,
-                None,  # status - not currently parsed from detail page
-                lot_opens_at,
-                lot_closing_current,
-                lot_closing_original,
-                lot_bid_count,
-                lot_opening_bid,
-                lot_current_bid,
-                detail.current_bidder_label,
-                detail.auction_fee_pct,
-                detail.auction_fee_vat_pct,
-                detail.vat_on_bid_pct,
-                detail.state,
-                detail.total_example_price_eur,
-                location_city,
-                location_country,
-                detail.seller_allocation_note,
-                detail.brand,
-                listing_hash,
-                detail_hash,
-                last_seen_at,
-                detail_last_seen_at,
-            ),
-        )
+    def upsert_many_from_parsed(
+        self, auction_id: int, lots: Iterable[ParsedLot]
+    ) -> dict[str, int]:
+        """Upsert a batch of parsed lots with a single ``executemany``.
 
-        # Get the lot_id (either newly inserted or existing)
-        lot_id = self._fetch_scalar(
-            "SELECT id FROM lots WHERE lot_code = ? AND auction_id = ?",
-            (card.lot_code, auction_id),
+        The caller owns the transaction; nothing is committed here.
+
+        Returns:
+            Mapping of lot code to lot ID for every lot in the batch.
+        """
+        batch = list(lots)
+        if not batch:
+            return {}
+        self.conn.executemany(
+            _UPSERT_LOTS_SQL,
+            [_build_upsert_row(auction_id, lot) for lot in batch],
         )
 
-        # Upsert bid history if available
-        if detail.bid_history:
-            self._upsert_bid_history(card.lot_code, auction_id, detail.bid_history)
+        # Chunked so a whole-auction batch stays under SQLite's bound
+        # parameter limit.
+        lot_codes = dict.fromkeys(lot.card.lot_code for lot in batch)
+        lot_ids: dict[str, int] = {}
+        for chunk in batched(lot_codes, _IN_CHUNK_SIZE):
+            placeholders = ",".join("?" * len(chunk))
+            lot_ids.update(
+                self.conn.execute(
+                    f"SELECT lot_code, id FROM lots "
+                    f"WHERE auction_id = ? AND lot_code IN ({placeholders})",
+                    (auction_id, *chunk),
+                ).fetchall()
+            )
 
-        return lot_id
+        # Replace bid history where available; a later duplicate wins.
+        histories = {
+            lot_ids[lot.card.lot_code]: lot.detail.bid_history
+            for lot in batch
+            if lot.detail.bid_history
+        }
+        if histories:
+            self._replace_bid_history(histories)
 
-    def _upsert_bid_history(
-        self,
-        lot_code: str,
-        auction_id: int,
-        bid_history: list,
+        return lot_ids
+
+    def _replace_bid_history(
+        self, histories: dict[int, list[BidHistoryEntry]]
     ) -> None:
-        """Insert or update bid history entries for a lot."""
-        from troostwatch.infrastructure.web.parsers.lot_detail import BidHistoryEntry
+        """Replace the stored bid history of each lot ID with the given entries.
 
-        # Get lot_id
-        lot_id = self._fetch_scalar(
-            "SELECT id FROM lots WHERE lot_code = ? AND auction_id = ?",
-            (lot_code, auction_id),
+        Entries come straight from ``LotDetailData.bid_history``, which the
+        parser only fills with :class:`BidHistoryEntry` items.
+        """
+        self.conn.executemany(
+            _DELETE_BID_HISTORY_SQL, [(lot_id,) for lot_id in histories]
+        )
+        self.conn.executemany(
+            _INSERT_BID_HISTORY_SQL,
+            [
+                (lot_id, entry.bidder_label, entry.amount_eur, entry.timestamp)
+                for lot_id, entries in histories.items()
+                for entry in entries
+            ],
         )
-        if not lot_id:
-            return
-
-        # Clear existing bid history for this lot and insert fresh
-        self._execute("DELETE FROM bid_history WHERE lot_id = ?", (lot_id,))
-
-        for entry in bid_history:
-            if isinstance(entry, BidHistoryEntry):
-                self._execute_insert(
-                    """
-                    INSERT INTO bid_history (lot_id, bidder_label, amount_eur, bid_time)
-                    VALUES (?, ?, ?, ?)
-                    """,
-                    (lot_id, entry.bidder_label, entry.amount_eur, entry.timestamp),
-                )
 
     def delete_lot(self, lot_code: str, auction_code: str) -> bool:
         """Delete a lot and all related data (specs, bids, reference prices, positions).
 
         Returns True if the lot was deleted, False if not found.
         """
-        # Get auction_id and lot_id
-        auction_id = self._fetch_scalar(
-            "SELECT id FROM auctions WHERE auction_code = ?", (auction_code,)
-        )
-        if not auction_id:
-            return False
-
         lot_id = self._fetch_scalar(
-            "SELECT id FROM lots WHERE lot_code = ? AND auction_id = ?",
-            (lot_code, auction_id),
+            """
+            DELETE FROM lots
+            WHERE id = (
+                SELECT l.id FROM auctions a
+                CROSS JOIN lots l ON l.auction_id = a.id
+                WHERE l.lot_code = ? AND a.auction_code = ?
+            )
+            RETURNING id
+            """,
+            (lot_code, auction_code),
         )
         if not lot_id:
             return False
 
-        # Delete related data in order (foreign key dependencies)
-        self._execute("DELETE FROM bid_history WHERE lot_id = ?", (lot_id,))
-        self._execute("DELETE FROM reference_prices WHERE lot_id = ?", (lot_id,))
-        self._execute("DELETE FROM product_layers WHERE lot_id = ?", (lot_id,))
-        self._execute("DELETE FROM my_lot_positions WHERE lot_id = ?", (lot_id,))
+        # Child rows are removed by ON DELETE CASCADE; without foreign key
+        # enforcement those clauses are inert, so delete them explicitly.
+        if not self._fetch_scalar("PRAGMA foreign_keys"):
+            for table in _LOT_CHILD_TABLES:
+                self._execute(f"DELETE FROM {table} WHERE lot_id = ?", (lot_id,))
 
-        # Delete the lot itself
-        self._execute("DELETE FROM lots WHERE id = ?", (lot_id,))
-        self.conn.commit()
+        self._commit()
+        for key in [k for k, v in self._id_cache.items() if v == lot_id]:
+            del self._id_cache[key]
         return True
 
 
-def _choose_value(*values: str | float | int | bool | None):
-    for value in values:
-        if value is not None:
-            return value
-    return None
+class LotRow(NamedTuple):
+    """One row of :meth:`LotRepository.list_lots_rows`."""
+
+    auction_code: str
+    lot_code: str
+    title: str | None
+    state: str | None
+    current_bid_eur: float | None
+    bid_count: int | None
+    current_bidder_label: str | None
+    closing_time_current: str | None
+    closing_time_original: str | None
+    brand: str | None
+
+
+def _lot_id_query(
+    lot_code: str, auction_code: str | None
+) -> tuple[str, tuple[Any, ...]]:
+    """Return the query resolving a lot code to its id, with its parameters."""
+    if auction_code is None:
+        return "SELECT id FROM lots WHERE lot_code = ?", (lot_code,)
+
+    # Lots may be stored under either the bare code or the
+    # ``{auction_code}-{lot_code}`` form; look both up in one statement and
+    # prefer an exact match on the bare code.  Here and in the other
+    # auction-scoped lookups, CROSS JOIN keeps SQLite from reordering the
+    # join: the handful of auctions is probed first and lots are reached
+    # through the UNIQUE (auction_id, lot_code) index whatever ANALYZE says.
+    codes = [lot_code]
+    if auction_code and not lot_code.startswith(f"{auction_code}-"):
+        codes.append(f"{auction_code}-{lot_code}")
+    placeholders = ", ".join("?" for _ in codes)
+    query = f"""
+        SELECT l.id
+        FROM auctions a
+        CROSS JOIN lots l ON l.auction_id = a.id
+        WHERE l.lot_code IN ({placeholders}) AND a.auction_code = ?
+        ORDER BY CASE WHEN l.lot_code = ? THEN 0 ELSE 1 END
+        LIMIT 1
+    """
+    return query, (*codes, auction_code, lot_code)
+
+
+class ParsedLot(NamedTuple):
+    """One parsed lot plus its change-tracking metadata, for batch upserts."""
+
+    card: LotCardData
+    detail: LotDetailData
+    listing_hash: str
+    detail_hash: str
+    last_seen_at: str
+    detail_last_seen_at: str
+
+
+_LIST_LOT_COLUMNS = """
+    a.auction_code AS auction_code,
+    l.lot_code AS lot_code,
+    l.title AS title,
+    l.state AS state,
+    l.current_bid_eur AS current_bid_eur,
+    l.bid_count AS bid_count,
+    l.current_bidder_label AS current_bidder_label,
+    l.closing_time_current AS closing_time_current,
+    l.closing_time_original AS closing_time_original,
+    l.brand AS brand
+"""
+
+
+@functools.cache
+def _list_lots_sql(
+    columns: str,
+    has_auction_code: bool,
+    has_state: bool,
+    has_brand: bool,
+    has_limit: bool,
+) -> str:
+    """Build the ``list_lots`` query for one combination of filters.
+
+    There are only sixteen shapes per column list, so each is built once
+    instead of being re-concatenated per call; the SQL text per shape stays
+    stable and hot in the connection's statement cache.
+    """
+    query = f"""
+        SELECT {columns}
+        FROM auctions a
+        CROSS JOIN lots l ON l.auction_id = a.id
+    """
+    conditions = [
+        condition
+        for condition, enabled in (
+            ("a.auction_code = ?", has_auction_code),
+            ("l.state = ?", has_state),
+            ("l.brand = ?", has_brand),
+        )
+        if enabled
+    ]
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY a.auction_code, l.lot_code"
+    if has_limit:
+        query += " LIMIT ?"
+    return query
+
+
+# Partial updates: a NULL parameter leaves its column unchanged, so each
+# updater has one fixed statement regardless of which fields are passed.
+_UPDATE_REFERENCE_PRICE_SQL = """
+    UPDATE reference_prices SET
+        price_eur = COALESCE(?, price_eur),
+        condition = COALESCE(?, condition),
+        source = COALESCE(?, source),
+        url = COALESCE(?, url),
+        notes = COALESCE(?, notes),
+        updated_at = datetime('now')
+    WHERE id = ?
+"""
+
+_UPDATE_LOT_SQL = """
+    UPDATE lots SET
+        notes = COALESCE(?, notes),
+        ean = COALESCE(?, ean)
+    WHERE id = ?
+"""
+
+_UPDATE_SPEC_TEMPLATE_SQL = """
+    UPDATE spec_templates SET
+        title = COALESCE(?, title),
+        value = COALESCE(?, value),
+        ean = COALESCE(?, ean),
+        price_eur = COALESCE(?, price_eur),
+        release_date = COALESCE(?, release_date),
+        category = COALESCE(?, category),
+        updated_at = datetime('now')
+    WHERE id = ?
+"""
+
+
+# Detail, specs and reference prices of one lot as JSON, with the same
+# columns and ordering as the individual ``get_*`` methods.  ``{lot_ref}`` is
+# filled in from ``LotRepository._lot_id_ref``.
+_LOT_BUNDLE_SQL = """
+    WITH target (lot_id) AS (SELECT {lot_ref})
+    SELECT
+        (SELECT json_object(
+            'auction_code', a.auction_code, 'lot_code', l.lot_code,
+            'title', l.title, 'url', l.url, 'state', l.state,
+            'current_bid_eur', l.current_bid_eur, 'bid_count', l.bid_count,
+            'opening_bid_eur', l.opening_bid_eur,
+            'closing_time_current', l.closing_time_current,
+            'closing_time_original', l.closing_time_original,
+            'brand', l.brand, 'ean', l.ean, 'location_city', l.location_city,
+            'location_country', l.location_country, 'notes', l.notes)
+         FROM lots l JOIN auctions a ON l.auction_id = a.id
+         WHERE l.id = target.lot_id),
+        (SELECT json_group_array(json_object(
+            'id', id, 'parent_id', parent_id, 'template_id', template_id,
+            'key', title, 'value', value, 'ean', ean, 'price_eur', price_eur,
+            'release_date', release_date, 'category', category))
+         FROM (SELECT * FROM product_layers WHERE lot_id = target.lot_id
+               ORDER BY parent_id, layer)),
+        (SELECT json_group_array(json_object(
+            'id', id, 'condition', condition, 'price_eur', price_eur,
+            'source', source, 'url', url, 'notes', notes,
+            'created_at', created_at))
+         FROM (SELECT * FROM reference_prices WHERE lot_id = target.lot_id
+               ORDER BY created_at DESC))
+    FROM target
+"""
+
+# New specs are appended after their siblings; updates keep their layer.
+_UPSERT_LOT_SPEC_SQL = """
+    INSERT INTO product_layers
+        (lot_id, parent_id, layer, title, value, ean, price_eur,
+         template_id, release_date, category)
+    VALUES (
+        :lot_id,
+        :parent_id,
+        (SELECT COALESCE(MAX(layer), -1) + 1 FROM product_layers
+         WHERE lot_id = :lot_id AND parent_id IS :parent_id),
+        :title, :value, :ean, :price_eur, :template_id, :release_date, :category
+    )
+    ON CONFLICT (lot_id, COALESCE(parent_id, -1), title) DO UPDATE SET
+        value = excluded.value,
+        ean = excluded.ean,
+        price_eur = excluded.price_eur,
+        template_id = excluded.template_id,
+        release_date = excluded.release_date,
+        category = excluded.category
+    RETURNING id
+"""
+
+# Same conflict target and update list as _UPSERT_LOT_SPEC_SQL, with the
+# values taken from the template row.  The WHERE clause is required: SQLite
+# cannot parse ON CONFLICT directly after a bare INSERT ... SELECT ... FROM.
+_APPLY_SPEC_TEMPLATE_SQL = """
+    INSERT INTO product_layers
+        (lot_id, parent_id, layer, title, value, ean, price_eur,
+         template_id, release_date, category)
+    SELECT
+        :lot_id,
+        :parent_id,
+        (SELECT COALESCE(MAX(layer), -1) + 1 FROM product_layers
+         WHERE lot_id = :lot_id AND parent_id IS :parent_id),
+        COALESCE(t.title, ''), COALESCE(t.value, ''), t.ean, t.price_eur, t.id,
+        t.release_date, t.category
+    FROM spec_templates t
+    WHERE t.id = :template_id
+    ON CONFLICT (lot_id, COALESCE(parent_id, -1), title) DO UPDATE SET
+        value = excluded.value,
+        ean = excluded.ean,
+        price_eur = excluded.price_eur,
+        template_id = excluded.template_id,
+        release_date = excluded.release_date,
+        category = excluded.category
+    RETURNING id
+"""
+
+_DELETE_BID_HISTORY_SQL = "DELETE FROM bid_history WHERE lot_id = ?"
+
+_INSERT_BID_HISTORY_SQL = """
+    INSERT INTO bid_history (lot_id, bidder_label, amount_eur, bid_time)
+    VALUES (?, ?, ?, ?)
+"""
+
+_UPSERT_LOTS_SQL = """
+    INSERT INTO lots (
+        auction_id, lot_code, title, url, state, status, opens_at,
+        closing_time_current, closing_time_original, bid_count,
+        opening_bid_eur, current_bid_eur, current_bidder_label,
+        buyer_fee_percent, buyer_fee_vat_percent, vat_percent,
+        awarding_state, total_example_price_eur, location_city,
+        location_country, seller_allocation_note, brand,
+        listing_hash, detail_hash, last_seen_at, detail_last_seen_at
+    ) VALUES (
+        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+        ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+    )
+    ON CONFLICT(auction_id, lot_code) DO UPDATE SET
+        title = excluded.title,
+        url = excluded.url,
+        state = excluded.state,
+        status = excluded.status,
+        opens_at = excluded.opens_at,
+        closing_time_current = excluded.closing_time_current,
+        closing_time_original = excluded.closing_time_original,
+        bid_count = excluded.bid_count,
+        opening_bid_eur = excluded.opening_bid_eur,
+        current_bid_eur = excluded.current_bid_eur,
+        current_bidder_label = excluded.current_bidder_label,
+        buyer_fee_percent = excluded.buyer_fee_percent,
+        buyer_fee_vat_percent = excluded.buyer_fee_vat_percent,
+        vat_percent = excluded.vat_percent,
+        awarding_state = excluded.awarding_state,
+        total_example_price_eur = excluded.total_example_price_eur,
+        location_city = excluded.location_city,
+        location_country = excluded.location_country,
+        seller_allocation_note = excluded.seller_allocation_note,
+        brand = excluded.brand,
+        listing_hash = excluded.listing_hash,
+        detail_hash = excluded.detail_hash,
+        last_seen_at = excluded.last_seen_at,
+        detail_last_seen_at = excluded.detail_last_seen_at
+"""
+
+
+def _build_upsert_row(auction_id: int, lot: ParsedLot) -> tuple[Any, ...]:
+    """Return the ``_UPSERT_LOTS_SQL`` parameters for one parsed lot.
+
+    A plain tuple in column order is what ``executemany`` binds, so it is
+    built directly; fallbacks are inlined rather than going through a helper.
+    """
+    card, detail = lot.card, lot.detail
+    if detail.opening_bid_eur is not None:
+        opening_bid_eur = detail.opening_bid_eur
+    else:
+        opening_bid_eur = card.price_eur if card.is_price_opening_bid else None
+    current_bid_eur = (
+        detail.current_bid_eur
+        if detail.current_bid_eur is not None
+        else card.price_eur
+    )
+    return (
+        auction_id,
+        card.lot_code,
+        detail.title or card.title,
+        detail.url or card.url,
+        detail.state or card.state,
+        None,  # status - not currently parsed from detail page
+        detail.opens_at or card.opens_at,
+        detail.closing_time_current or card.closing_time_current,
+        detail.closing_time_original,
+        detail.bid_count if detail.bid_count is not None else card.bid_count,
+        opening_bid_eur,
+        current_bid_eur,
+        detail.current_bidder_label,
+        detail.auction_fee_pct,
+        detail.auction_fee_vat_pct,
+        detail.vat_on_bid_pct,
+        detail.state,
+        detail.total_example_price_eur,
+        detail.location_city or card.location_city,
+        detail.location_country or card.location_country,
+        detail.seller_allocation_note,
+        detail.brand,
+        lot.listing_hash,
+        lot.detail_hash,
+        lot.last_seen_at,
+        lot.detail_last_seen_at,
+    )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sqlite3
+from functools import cached_property
 
 from .base import BaseRepository
 from .buyers import BuyerRepository
@@ -15,8 +16,20 @@ class PositionRepository(BaseRepository):
         lots: LotRepository | None = None,
     ) -> None:
         super().__init__(conn)
-        self.buyers = buyers or BuyerRepository(conn)
-        self.lots = lots or LotRepository(conn)
+        if buyers is not None:
+            self.buyers = buyers
+        if lots is not None:
+            self.lots = lots
+
+    # Built on first use so read-only callers skip constructing (and
+    # schema-checking) repositories they never touch.
+    @cached_property
+    def buyers(self) -> BuyerRepository:
+        return BuyerRepository(self.conn)
+
+    @cached_property
+    def lots(self) -> LotRepository:
+        return LotRepository(self.conn)
 
     def upsert(
         self,
@@ -53,7 +66,7 @@ class PositionRepository(BaseRepository):
                 my_highest_bid_eur,
             ),
         )
-        self.conn.commit()
+        self._commit()
 
     def list(self, buyer_label: str | None = None) -> list[dict[str, str | None]]:
         params: list[str] = []
@@ -93,4 +106,4 @@ class PositionRepository(BaseRepository):
             "DELETE FROM my_lot_positions WHERE buyer_id = ? AND lot_id = ?",
             (buyer_id, lot_id),
         )
-        self.conn.commit()
+        self._commit()
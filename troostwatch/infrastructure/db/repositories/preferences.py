@@ -25,4 +25,4 @@ class PreferenceRepository(BaseRepository):
                 "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
                 (key, value),
             )
-        self.conn.commit()
+        self._commit()
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
+import functools
 from pathlib import Path
 
 
 _SCHEMA_FILE = Path(__file__).resolve().parents[4] / "schema" / "schema.sql"
 
 
+@functools.cache
+def _read_schema_sql() -> str | None:
+    """Return the contents of ``schema/schema.sql``, read once per process."""
+
+    if not _SCHEMA_FILE.exists():
+        return None
+    return _SCHEMA_FILE.read_text(encoding="utf-8")
+
+
 def ensure_core_schema(conn) -> None:
     """Apply the core schema from ``schema/schema.sql`` if available."""
 
-    if not _SCHEMA_FILE.exists():
-        return
-    with open(_SCHEMA_FILE, "r", encoding="utf-8") as f:
-        conn.executescript(f.read())
+    schema_sql = _read_schema_sql()
+    if schema_sql is not None:
+        conn.executescript(schema_sql)
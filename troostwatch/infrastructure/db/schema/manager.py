@@ -1,19 +1,26 @@
 from __future__ import annotations
 
+import json
+
+from ..token_codec import encode_tokens
 from .core import ensure_core_schema
-from .migrations import SchemaMigrator
-from .tables import (
-    SCHEMA_BUYERS_SQL,
-    SCHEMA_MY_BIDS_SQL,
-    SCHEMA_POSITIONS_SQL,
-    SCHEMA_PRODUCT_LAYERS_SQL,
-    SCHEMA_SYNC_RUNS_SQL,
-    SCHEMA_USER_PREFERENCES_SQL,
-)
+from .migrations import CURRENT_SCHEMA_VERSION, SchemaMigrator
+from .tables import SCHEMA_PROJECT_TABLES_SQL
 
 
 def ensure_schema(conn) -> None:
-    """Apply the full database schema (core + project specific tables)."""
+    """Apply the full database schema (core + project specific tables).
+
+    A completed run stamps ``PRAGMA user_version`` with
+    ``CURRENT_SCHEMA_VERSION``; later calls on a database carrying that stamp
+    (or a newer one, written by a later release) return after a single PRAGMA
+    read.  Repositories and services call this
+    for every connection they open, so the full walk only happens once per
+    database and schema version.
+    """
+
+    if _schema_stamp(conn) >= CURRENT_SCHEMA_VERSION:
+        return
 
     ensure_core_schema(conn)
     migrator = SchemaMigrator(conn)
@@ -21,26 +28,34 @@ def ensure_schema(conn) -> None:
     migrator.apply_path()
     migrator.ensure_current_version()
     _ensure_auction_columns(conn, migrator)
-    _ensure_lots_columns(conn, migrator)
-    _ensure_hash_columns(conn)
+    lots_columns = _table_columns(conn, "lots")
+    _ensure_lots_columns(conn, migrator, lots_columns)
+    _ensure_hash_columns(conn, lots_columns)
     _ensure_bid_history_table(conn)
     _ensure_lot_images_phash(conn, migrator)
-    conn.executescript(SCHEMA_BUYERS_SQL)
-    conn.executescript(SCHEMA_POSITIONS_SQL)
-    conn.executescript(SCHEMA_MY_BIDS_SQL)
-    conn.executescript(SCHEMA_PRODUCT_LAYERS_SQL)
-    conn.executescript(SCHEMA_SYNC_RUNS_SQL)
-    conn.executescript(SCHEMA_USER_PREFERENCES_SQL)
+    _ensure_ocr_tokens_compressed(conn, migrator)
+    _ensure_ocr_tokens_hash(conn, migrator)
+    conn.executescript(SCHEMA_PROJECT_TABLES_SQL)
+    _ensure_product_layers_unique(conn, migrator)
+    if _schema_stamp(conn) < CURRENT_SCHEMA_VERSION:
+        conn.execute(f"PRAGMA user_version = {CURRENT_SCHEMA_VERSION}")
+        conn.commit()
 
 
-def _ensure_lots_columns(conn, migrator: SchemaMigrator) -> None:
-    cur = conn.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='lots'"
-    )
-    if cur.fetchone() is None:
-        return
+def _schema_stamp(conn) -> int:
+    """Return the schema version stamped by the last complete ``ensure_schema``."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _table_columns(conn, table: str) -> set[str]:
+    """Return the column names of ``table``; empty if the table does not exist."""
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
 
-    existing = {row[1] for row in conn.execute("PRAGMA table_info(lots)").fetchall()}
+
+def _ensure_lots_columns(conn, migrator: SchemaMigrator, existing: set[str]) -> None:
+    """Add missing ``lots`` columns, updating ``existing`` as they are added."""
+    if not existing:
+        return
 
     to_add = {
         "status": "TEXT",
@@ -68,6 +83,7 @@ def _ensure_lots_columns(conn, migrator: SchemaMigrator) -> None:
         if col in existing:
             continue
         conn.execute(f"ALTER TABLE lots ADD COLUMN {col} {col_type}")
+        existing.add(col)
         added_cols.append(col)
     if added_cols:
         migration_name = "add_lots_columns_v1"
@@ -76,15 +92,10 @@ def _ensure_lots_columns(conn, migrator: SchemaMigrator) -> None:
 
 
 def _ensure_auction_columns(conn, migrator: SchemaMigrator) -> None:
-    cur = conn.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='auctions'"
-    )
-    if cur.fetchone() is None:
+    existing = _table_columns(conn, "auctions")
+    if not existing:
         return
 
-    existing = {
-        row[1] for row in conn.execute("PRAGMA table_info(auctions)").fetchall()
-    }
     added_cols: list[str] = []
     if "pagination_pages" not in existing:
         conn.execute("ALTER TABLE auctions ADD COLUMN pagination_pages TEXT")
@@ -96,23 +107,20 @@ def _ensure_auction_columns(conn, migrator: SchemaMigrator) -> None:
             migrator.record(migration_name, ",".join(added_cols))
 
 
-def _ensure_hash_columns(conn) -> None:
+def _ensure_hash_columns(conn, existing: set[str]) -> None:
+    """Add the change-detection columns to ``lots``, updating ``existing``."""
     required_columns = {
         "listing_hash": "TEXT",
         "detail_hash": "TEXT",
         "last_seen_at": "TEXT",
         "detail_last_seen_at": "TEXT",
     }
-    cur = conn.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='lots'"
-    )
-    if cur.fetchone() is None:
+    if not existing:
         return
-    cur = conn.execute("PRAGMA table_info(lots)")
-    existing = {row[1] for row in cur.fetchall()}
     for column, sql_type in required_columns.items():
         if column not in existing:
             conn.execute(f"ALTER TABLE lots ADD COLUMN {column} {sql_type}")
+            existing.add(column)
 
 
 def _ensure_bid_history_table(conn) -> None:
@@ -134,16 +142,10 @@ def _ensure_bid_history_table(conn) -> None:
 
 def _ensure_lot_images_phash(conn, migrator: SchemaMigrator) -> None:
     """Add phash column to lot_images if it doesn't exist."""
-    cur = conn.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='lot_images'"
-    )
-    if cur.fetchone() is None:
+    existing = _table_columns(conn, "lot_images")
+    if not existing:
         return
 
-    existing = {
-        row[1] for row in conn.execute("PRAGMA table_info(lot_images)").fetchall()
-    }
-
     if "phash" not in existing:
         conn.execute("ALTER TABLE lot_images ADD COLUMN phash TEXT")
         migration_name = "add_lot_images_phash_v1"
@@ -152,3 +154,85 @@ def _ensure_lot_images_phash(conn, migrator: SchemaMigrator) -> None:
 
     # Ensure index exists
     conn.execute("CREATE INDEX IF NOT EXISTS idx_lot_images_phash ON lot_images(phash)")
+
+
+def _ensure_ocr_tokens_compressed(conn, migrator: SchemaMigrator) -> None:
+    """Move OCR tokens from ``tokens_json`` TEXT to the ``tokens_zstd`` BLOB."""
+    existing = _table_columns(conn, "ocr_token_data")
+    if not existing or "tokens_json" not in existing:
+        return
+
+    if "tokens_zstd" not in existing:
+        conn.execute("ALTER TABLE ocr_token_data ADD COLUMN tokens_zstd BLOB")
+    rows = conn.execute("SELECT id, tokens_json FROM ocr_token_data").fetchall()
+    conn.executemany(
+        "UPDATE ocr_token_data SET tokens_zstd = ? WHERE id = ?",
+        [(encode_tokens(_load_json(raw)), row_id) for row_id, raw in rows],
+    )
+    conn.execute("ALTER TABLE ocr_token_data DROP COLUMN tokens_json")
+    conn.commit()
+    migration_name = "compress_ocr_tokens_v1"
+    if not migrator.has_migration(migration_name):
+        migrator.record(migration_name, f"backfilled {len(rows)} rows")
+
+
+def _ensure_ocr_tokens_hash(conn, migrator: SchemaMigrator) -> None:
+    """Add the ``tokens_hash`` column used to skip unchanged token upserts."""
+    existing = _table_columns(conn, "ocr_token_data")
+    if not existing or "tokens_hash" in existing:
+        return
+
+    conn.execute("ALTER TABLE ocr_token_data ADD COLUMN tokens_hash TEXT")
+    migration_name = "add_ocr_tokens_hash_v1"
+    if not migrator.has_migration(migration_name):
+        migrator.record(migration_name, "tokens_hash")
+
+
+def _ensure_product_layers_unique(conn, migrator: SchemaMigrator) -> None:
+    """Enforce one spec per (lot, parent, title) so specs can be upserted.
+
+    Duplicates left by the old check-then-insert path are merged into the
+    oldest row: children are re-pointed to it before the extra rows are
+    deleted.
+    """
+    migration_name = "product_layers_unique_title_v1"
+    if migrator.has_migration(migration_name):
+        return
+    conn.execute(
+        """
+        UPDATE product_layers AS child
+        SET parent_id = (
+            SELECT MIN(keep.id)
+            FROM product_layers AS parent
+            JOIN product_layers AS keep
+              ON keep.lot_id = parent.lot_id
+             AND COALESCE(keep.parent_id, -1) = COALESCE(parent.parent_id, -1)
+             AND keep.title = parent.title
+            WHERE parent.id = child.parent_id
+        )
+        WHERE child.parent_id IS NOT NULL
+          AND EXISTS (SELECT 1 FROM product_layers WHERE id = child.parent_id)
+        """
+    )
+    conn.execute(
+        """
+        DELETE FROM product_layers
+        WHERE id NOT IN (
+            SELECT MIN(id) FROM product_layers
+            GROUP BY lot_id, COALESCE(parent_id, -1), title
+        )
+        """
+    )
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_product_layers_unique_title "
+        "ON product_layers (lot_id, COALESCE(parent_id, -1), title)"
+    )
+    migrator.record(migration_name, "idx_product_layers_unique_title")
+    conn.commit()
+
+
+def _load_json(raw: str | None) -> dict:
+    try:
+        return json.loads(raw) if raw else {}
+    except json.JSONDecodeError:
+        return {}
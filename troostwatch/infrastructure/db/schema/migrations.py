@@ -1,15 +1,66 @@
 from __future__ import annotations
 
-from collections.abc import Iterable
+import hashlib
+import os
+import re
+import sqlite3
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 from ..connection import iso_utcnow
 from .tables import SCHEMA_MIGRATIONS_SQL, SCHEMA_VERSION_SQL
 
 
-# Current schema version - increment when making structural changes.
+# Current schema version - increment when making structural changes,
+# including new files under migrations/: ensure_schema skips databases whose
+# PRAGMA user_version is already at (or above) this value.  The newest
+# migration file must carry a matching "-- Schema version: N" header; a test
+# enforces this.
 # This must match the version comment in schema/schema.sql.
-CURRENT_SCHEMA_VERSION = 10
+CURRENT_SCHEMA_VERSION = 17
+
+_GET_VERSION_SQL = "SELECT version FROM schema_version LIMIT 1"
+_DELETE_VERSION_SQL = "DELETE FROM schema_version"
+_INSERT_VERSION_SQL = "INSERT INTO schema_version (version, applied_at) VALUES (?, ?)"
+_APPLIED_MIGRATIONS_SQL = "SELECT name FROM schema_migrations"
+_HAS_MIGRATION_SQL = "SELECT 1 FROM schema_migrations WHERE name = ?"
+_RECORD_MIGRATION_SQL = (
+    "INSERT INTO schema_migrations (name, applied_at, notes) VALUES (?, ?, ?)"
+)
+
+# BEGIN/COMMIT statements inside migration files; the runner owns the
+# transaction, so these are skipped.
+_TRANSACTION_CONTROL_RE = re.compile(
+    r"^(BEGIN(\s+(DEFERRED|IMMEDIATE|EXCLUSIVE))?|COMMIT|END)(\s+TRANSACTION)?\s*;$",
+    re.IGNORECASE,
+)
+_LINE_COMMENT_RE = re.compile(r"--[^\n]*")
+
+
+def _split_statements(sql: str) -> Iterator[str]:
+    """Yield the complete SQL statements in ``sql``, one at a time.
+
+    Semicolons inside string literals and trigger bodies do not end a
+    statement.  Empty and comment-only fragments are dropped.
+    """
+
+    buffer = ""
+    for fragment in sql.split(";"):
+        buffer += fragment + ";"
+        if sqlite3.complete_statement(buffer):
+            if _LINE_COMMENT_RE.sub("", buffer).strip() != ";":
+                yield buffer.strip()
+            buffer = ""
+    if _LINE_COMMENT_RE.sub("", buffer).strip(" \t\r\n;"):
+        yield buffer.strip()
+
+
+def _inline_migration_name(script: str) -> str:
+    """Name an inline migration by a digest that is stable across processes."""
+
+    digest = hashlib.blake2b(script.encode("utf-8"), digest_size=16).hexdigest()
+    return f"inline-{digest}"
 
 
 class SchemaMigrator:
@@ -26,6 +77,7 @@ class SchemaMigrator:
 
     def __init__(self, conn) -> None:
         self.conn = conn
+        self._in_transaction = False
 
     # -------------------------------------------------------------------------
     # Schema version tracking
@@ -38,18 +90,15 @@ class SchemaMigrator:
     def get_version(self) -> int | None:
         """Return the current schema version, or None if not set."""
         self.ensure_version_table()
-        cur = self.conn.execute("SELECT version FROM schema_version LIMIT 1")
+        cur = self.conn.execute(_GET_VERSION_SQL)
         row = cur.fetchone()
         return row[0] if row else None
 
     def set_version(self, version: int) -> None:
         """Set the schema version, replacing any existing value."""
         self.ensure_version_table()
-        self.conn.execute("DELETE FROM schema_version")
-        self.conn.execute(
-            "INSERT INTO schema_version (version, applied_at) VALUES (?, ?)",
-            (version, iso_utcnow()),
-        )
+        self.conn.execute(_DELETE_VERSION_SQL)
+        self.conn.execute(_INSERT_VERSION_SQL, (version, iso_utcnow()))
 
     def ensure_current_version(self) -> None:
         """Ensure the schema_version table reflects CURRENT_SCHEMA_VERSION."""
@@ -64,29 +113,59 @@ class SchemaMigrator:
     def ensure_table(self) -> None:
         self.conn.executescript(SCHEMA_MIGRATIONS_SQL)
 
+    def applied_migrations(self) -> set[str]:
+        """Return the names of all recorded migrations in one query."""
+        cur = self.conn.execute(_APPLIED_MIGRATIONS_SQL)
+        return {row[0] for row in cur}
+
     def has_migration(self, name: str) -> bool:
-        cur = self.conn.execute(
-            "SELECT 1 FROM schema_migrations WHERE name = ?", (name,)
-        )
+        cur = self.conn.execute(_HAS_MIGRATION_SQL, (name,))
         return cur.fetchone() is not None
 
     def record(self, name: str, notes: str | None = None) -> None:
-        self.conn.execute(
-            "INSERT INTO schema_migrations (name, applied_at, notes) VALUES (?, ?, ?)",
-            (name, iso_utcnow(), notes),
-        )
+        self.conn.execute(_RECORD_MIGRATION_SQL, (name, iso_utcnow(), notes))
 
-    def apply_sql(self, name: str, sql: str, notes: str | None = None) -> None:
-        self.ensure_table()
-        if self.has_migration(name):
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Run the enclosed migrations in one ``BEGIN IMMEDIATE`` transaction.
+
+        Nested use joins the outer transaction.  ``schema_migrations`` is
+        created beforehand, since ``executescript`` commits whatever is
+        pending on the connection.
+        """
+
+        if self._in_transaction:
+            yield
             return
+        self.ensure_table()
+        self.conn.execute("BEGIN IMMEDIATE")
+        self._in_transaction = True
+        try:
+            yield
+        except BaseException:
+            self.conn.rollback()
+            raise
+        else:
+            self.conn.commit()
+        finally:
+            self._in_transaction = False
+
+    def apply_sql(self, name: str, sql: str, notes: str | None = None) -> None:
         if not sql.strip():
             return
-        self.conn.executescript(sql)
+        with self.transaction():
+            if self.has_migration(name):
+                return
+            self._apply(name, sql, notes)
+
+    def _apply(self, name: str, sql: str, notes: str | None) -> None:
+        for statement in _split_statements(sql):
+            code = _LINE_COMMENT_RE.sub("", statement).strip()
+            if not _TRANSACTION_CONTROL_RE.match(code):
+                self.conn.execute(statement)
         self.record(name, notes)
 
     def apply_path(self, migrations_dir: str | Path | None = None) -> None:
-        self.ensure_table()
         root = Path(__file__).resolve().parents[4]
         migrations_path = (
             Path(migrations_dir) if migrations_dir else (root / "migrations")
@@ -94,21 +173,35 @@ class SchemaMigrator:
         if not migrations_path.exists() or not migrations_path.is_dir():
             return
 
-        for path in sorted(migrations_path.iterdir()):
-            if not path.is_file() or not path.name.lower().endswith(".sql"):
-                continue
-            name = path.name
-            if self.has_migration(name):
-                continue
-            with open(path, "r", encoding="utf-8") as f:
-                sql = f.read()
-            self.apply_sql(name, sql, notes=f"applied from {path.relative_to(root)}")
+        # DirEntry.is_file() uses the type scandir already read, so listing
+        # the directory costs no stat() per file.
+        with os.scandir(migrations_path) as it:
+            entries = [
+                entry
+                for entry in it
+                if entry.name.lower().endswith(".sql") and entry.is_file()
+            ]
+        entries.sort(key=lambda entry: entry.name)
+
+        # All pending files and their schema_migrations rows commit together.
+        with self.transaction():
+            applied = self.applied_migrations()
+            for entry in entries:
+                if entry.name in applied:
+                    continue
+                path = Path(entry.path)
+                sql = path.read_bytes().decode("utf-8")
+                if not sql.strip():
+                    # Recorded so later startups do not read the file again.
+                    self.record(entry.name, notes="empty")
+                    continue
+                notes = f"applied from {path.relative_to(root)}"
+                self._apply(entry.name, sql, notes)
 
     def run_migrations(self, migrations: Iterable[str] | None = None) -> None:
         """Execute bundled schema and any additional migration scripts."""
 
-        self.ensure_table()
-        self.apply_path()
-        if migrations:
-            for script in migrations:
-                self.apply_sql(f"inline-{hash(script)}", script)
+        with self.transaction():
+            self.apply_path()
+            for script in migrations or ():
+                self.apply_sql(_inline_migration_name(script), script)
@@ -89,3 +89,18 @@ CREATE TABLE IF NOT EXISTS user_preferences (
     value TEXT
 );
 """
+
+# Project tables created by ensure_schema, applied as one script and one
+# transaction instead of a commit per table.
+SCHEMA_PROJECT_TABLES_SQL = "".join(
+    (
+        "BEGIN;\n",
+        SCHEMA_BUYERS_SQL,
+        SCHEMA_POSITIONS_SQL,
+        SCHEMA_MY_BIDS_SQL,
+        SCHEMA_PRODUCT_LAYERS_SQL,
+        SCHEMA_SYNC_RUNS_SQL,
+        SCHEMA_USER_PREFERENCES_SQL,
+        "COMMIT;\n",
+    )
+)
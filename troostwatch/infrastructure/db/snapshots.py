@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import os
+import shutil
 import sqlite3
+from contextlib import closing
 from pathlib import Path
 
 from .config import get_path_config
@@ -8,12 +11,28 @@ from .connection import iso_utcnow
 
 
 def create_snapshot(
-    source_db: str | Path,
+    source_db: str | Path | sqlite3.Connection,
     *,
     snapshot_root: str | Path | None = None,
     label: str | None = None,
+    fast: bool = False,
 ) -> Path:
-    """Create a SQLite backup using :meth:`sqlite3.Connection.backup`."""
+    """Create a SQLite backup using :meth:`sqlite3.Connection.backup`.
+
+    The copy is made in a single backup step into a sibling ``.tmp`` file,
+    which is renamed into place once complete; a crash or error mid-copy
+    never leaves a partial snapshot under the final name.  Because the
+    temporary file is discarded on failure, it is written without a rollback
+    journal.
+
+    ``source_db`` may be an open connection, which is backed up in place
+    and left open; otherwise the file is opened for the copy.
+
+    With ``fast=True`` the database file is copied directly (letting the OS
+    use ``copy_file_range``/``sendfile``) after folding the WAL into it; if
+    another connection is writing, or a connection was given, this falls
+    back to the backup API.
+    """
 
     paths = get_path_config()
     root = Path(snapshot_root) if snapshot_root is not None else paths["snapshots_root"]
@@ -21,6 +40,60 @@ def create_snapshot(
     timestamp = iso_utcnow().replace(":", "-")
     suffix = label or "snapshot"
     destination = root / f"{suffix}-{timestamp}.db"
-    with sqlite3.connect(source_db) as src, sqlite3.connect(destination) as dst:
-        src.backup(dst)
+    if isinstance(source_db, sqlite3.Connection):
+        _backup(source_db, destination)
+        return destination
+    if fast and _copy_quiescent(Path(source_db), destination):
+        return destination
+    with closing(sqlite3.connect(source_db)) as src:
+        _backup(src, destination)
     return destination
+
+
+def _backup(src: sqlite3.Connection, destination: Path) -> None:
+    tmp_path = _tmp_path(destination)
+    try:
+        with closing(sqlite3.connect(tmp_path, isolation_level=None)) as dst:
+            dst.execute("PRAGMA journal_mode=OFF")
+            src.backup(dst, pages=-1)
+        os.replace(tmp_path, destination)
+    finally:
+        # A no-op once renamed; removes a partial copy after an error.
+        tmp_path.unlink(missing_ok=True)
+
+
+def _tmp_path(destination: Path) -> Path:
+    return destination.with_name(f"{destination.name}.tmp")
+
+
+def _copy_quiescent(source: Path, destination: Path) -> bool:
+    """Copy ``source`` byte-for-byte; return ``False`` if it is being written.
+
+    The WAL is checkpointed and truncated first, then the write lock is held
+    while copying so no new frames or pages can land mid-copy.  Like
+    :func:`_backup`, the copy goes to a ``.tmp`` file renamed into place.
+    """
+
+    tmp_path = _tmp_path(destination)
+
+    try:
+        # timeout=0: a database that is busy is not quiescent, so do not wait.
+        conn = sqlite3.connect(source, timeout=0, isolation_level=None)
+        with closing(conn):
+            busy, _, _ = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+            if busy:
+                return False
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                wal = source.with_name(f"{source.name}-wal")
+                if wal.exists() and wal.stat().st_size:
+                    return False
+                shutil.copyfile(source, tmp_path)
+            finally:
+                conn.execute("ROLLBACK")
+        os.replace(tmp_path, destination)
+    except (sqlite3.OperationalError, OSError):
+        return False
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return True
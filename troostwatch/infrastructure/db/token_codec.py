@@ -0,0 +1,110 @@
+"""Compact storage encoding for OCR token payloads.
+
+``pytesseract.image_to_data()`` output is a dict of long, highly repetitive
+parallel arrays.  It is stored as compact JSON compressed with zstd, which
+shrinks a typical payload 5-10×.  Zstd ships with the standard library from
+Python 3.14 (``compression.zstd``); older interpreters fall back to zlib.
+Decoding sniffs the frame magic so rows written by either codec stay readable.
+
+When the optional ``orjson`` package is installed (``pip install
+troostwatch[speedups]``) it replaces the stdlib ``json`` module for both
+directions.  Both produce compact UTF-8 JSON, but not always the same bytes
+(orjson writes ``1e16`` and ``null`` where ``json`` writes ``1e+16`` and
+``NaN``), so :func:`tokens_digest` values are only stable within one
+serializer.  Switching serializers at worst rewrites unchanged rows once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import zlib
+from typing import Any
+
+try:
+    from compression import zstd as _zstd
+except ImportError:  # Python < 3.14
+    _zstd = None  # type: ignore[assignment]
+
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None  # type: ignore[assignment]
+
+ZSTD_AVAILABLE = _zstd is not None
+ORJSON_AVAILABLE = _orjson is not None
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_ZSTD_LEVEL = 6
+# json.JSONDecodeError and orjson.JSONDecodeError both subclass ValueError.
+_DECODE_ERRORS: tuple[type[Exception], ...] = (ValueError, zlib.error)
+if _zstd is not None:
+    _DECODE_ERRORS += (_zstd.ZstdError,)
+
+if _orjson is not None:
+    _loads = _orjson.loads
+else:
+    _loads = json.loads
+
+
+def dump_tokens(tokens: dict[str, Any]) -> bytes:
+    """Serialize ``tokens`` to compact, uncompressed UTF-8 JSON bytes."""
+
+    if _orjson is not None:
+        return _orjson.dumps(tokens)
+    return json.dumps(tokens, separators=(",", ":"), ensure_ascii=False).encode(
+        "utf-8"
+    )
+
+
+def compress_tokens(payload: bytes) -> bytes:
+    """Compress a payload produced by :func:`dump_tokens`."""
+
+    if _zstd is not None:
+        return _zstd.compress(payload, level=_ZSTD_LEVEL)
+    return zlib.compress(payload, _ZSTD_LEVEL)
+
+
+def tokens_digest(payload: bytes) -> str:
+    """Return a short content hash of a :func:`dump_tokens` payload."""
+
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+
+def encode_tokens(tokens: dict[str, Any]) -> bytes:
+    """Serialize ``tokens`` to compressed compact JSON."""
+
+    return compress_tokens(dump_tokens(tokens))
+
+
+def decode_tokens(blob: bytes | str | None) -> dict[str, Any]:
+    """Inverse of :func:`encode_tokens`; returns ``{}`` for empty or corrupt data.
+
+    Plain JSON text (the legacy ``tokens_json`` format) is accepted as well.
+    """
+
+    if not blob:
+        return {}
+    try:
+        if isinstance(blob, str):
+            return _loads(blob)
+        if blob.startswith(_ZSTD_MAGIC):
+            if _zstd is None:
+                return {}
+            payload = _zstd.decompress(blob)
+        else:
+            payload = zlib.decompress(blob)
+        return _loads(payload)
+    except _DECODE_ERRORS:
+        return {}
+
+
+__all__ = [
+    "ORJSON_AVAILABLE",
+    "ZSTD_AVAILABLE",
+    "compress_tokens",
+    "decode_tokens",
+    "dump_tokens",
+    "encode_tokens",
+    "tokens_digest",
+]
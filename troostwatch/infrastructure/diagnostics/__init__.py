@@ -1,5 +1,5 @@
 """Diagnostics facades."""
 
-from .debug_tools import *  # noqa: F401,F403
+from .debug_tools import db_integrity, db_stats, db_view
 
-__all__ = [name for name in dir() if not name.startswith("_")]
+__all__ = ["db_integrity", "db_stats", "db_view"]
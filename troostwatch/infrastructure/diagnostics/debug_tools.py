@@ -8,11 +8,22 @@ table), integrity checks and the ability to view rows from a given table.
 from __future__ import annotations
 
 import sqlite3
+from itertools import batched, repeat
 from typing import Any
 
+# SQLITE_MAX_COMPOUND_SELECT defaults to 500 terms per compound query.
+_COMPOUND_SELECT_LIMIT = 500
 
-def db_stats(conn: sqlite3.Connection) -> list[dict[str, Any]]:
-    """Return a list of dictionaries describing row counts per table."""
+
+def db_stats(
+    conn: sqlite3.Connection, approximate: bool = False
+) -> list[dict[str, Any]]:
+    """Return a list of dictionaries describing row counts per table.
+
+    With ``approximate=True`` the counts come from ``sqlite_stat1`` (written
+    by ``ANALYZE``) instead of scanning each table; tables without statistics
+    are still counted exactly.
+    """
     cur = conn.execute(
         """
         SELECT name
@@ -22,12 +33,32 @@ def db_stats(conn: sqlite3.Connection) -> list[dict[str, Any]]:
         """
     )
     tables = [row[0] for row in cur.fetchall()]
-    stats: list[dict[str, Any]] = []
-    for table in tables:
-        cur2 = conn.execute(f"SELECT COUNT(*) FROM {table}")
-        count = cur2.fetchone()[0]
-        stats.append({"table": table, "rows": count})
-    return stats
+    counts = _estimated_counts(conn) if approximate else {}
+    missing = [table for table in tables if table not in counts]
+    # One UNION ALL query per chunk, kept below SQLite's compound SELECT limit.
+    for chunk in batched(missing, _COMPOUND_SELECT_LIMIT):
+        sql = " UNION ALL ".join(
+            f"SELECT ?, COUNT(*) FROM {_quote_identifier(table)}" for table in chunk
+        )
+        counts.update(conn.execute(sql, chunk).fetchall())
+    return [{"table": table, "rows": counts[table]} for table in tables]
+
+
+def _estimated_counts(conn: sqlite3.Connection) -> dict[str, int]:
+    """Return row estimates per table from ``sqlite_stat1``, if it exists."""
+    if not conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='sqlite_stat1'"
+    ).fetchone():
+        return {}
+    # The first number of each ``stat`` value is the table's row count.
+    cur = conn.execute(
+        "SELECT tbl, MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 GROUP BY tbl"
+    )
+    return dict(cur.fetchall())
+
+
+def _quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
 
 
 def db_integrity(conn: sqlite3.Connection) -> list[str]:
@@ -45,9 +76,9 @@ def db_view(
     )
     if cur.fetchone() is None:
         raise ValueError(f"Table '{table}' does not exist in the database")
-    cur = conn.execute(f"SELECT * FROM {table} LIMIT ?", (limit,))
+    cur = conn.execute(f"SELECT * FROM {_quote_identifier(table)} LIMIT ?", (limit,))
     columns = [desc[0] for desc in cur.description]
-    return [dict(zip(columns, row)) for row in cur.fetchall()]
+    return list(map(dict, map(zip, repeat(columns), cur.fetchall())))
 
 
 __all__ = ["db_stats", "db_integrity", "db_view"]
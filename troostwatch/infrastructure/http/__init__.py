@@ -2,15 +2,47 @@
 
 This package provides authenticated HTTP client functionality for interacting
 with the Troostwijk website.
+
+The client module (and with it ``requests``) is imported on first attribute
+access, so importing this package alone stays cheap.
 """
 
-from .client import (
-    AuthenticationError,
-    LoginCredentials,
-    SessionExpiredError,
-    StoredSession,
-    TroostwatchHttpClient,
-)
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .client import (
+        AuthenticationError,
+        LoginCredentials,
+        SessionExpiredError,
+        StoredSession,
+        TroostwatchHttpClient,
+    )
+
+_LAZY_EXPORTS = {
+    "AuthenticationError": ".client",
+    "LoginCredentials": ".client",
+    "SessionExpiredError": ".client",
+    "StoredSession": ".client",
+    "TroostwatchHttpClient": ".client",
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
+
 
 __all__ = [
     "AuthenticationError",
@@ -11,6 +11,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import json
+import os
 import re
 import time
 from pathlib import Path
@@ -19,6 +20,32 @@ from urllib.parse import urljoin
 
 import requests
 from requests import Response, Session
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from troostwatch import __version__
+
+_USER_AGENT = f"troostwatch-client/{__version__}"
+
+# Keep-alive pool for the default session.  Only idempotent requests are
+# retried (urllib3's default method list excludes POST); after the last try
+# the response is returned so _raise_for_status still reports it.
+_POOL_SIZE = 32
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.2,
+    status_forcelist=(502, 503, 504),
+    raise_on_status=False,
+)
+
+# Matched against the raw body so the login page is never decoded as a whole.
+_CSRF_META_RE = re.compile(
+    rb'name=["\']csrf-token["\']\s+content=["\']([^"\']+)', re.IGNORECASE
+)
+_CSRF_CHUNK_SIZE = 4096
+# Bytes of the previous buffer searched again, so a tag split across two
+# chunks is still found.
+_CSRF_CHUNK_OVERLAP = 1024
 
 
 class AuthenticationError(Exception):
@@ -68,7 +95,16 @@ class TroostwatchHttpClient:
         self.login_path = login_path
         self.credentials = credentials or LoginCredentials()
         self.session_timeout_seconds = session_timeout_seconds
-        self.session = session or requests.Session()
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=_POOL_SIZE,
+                pool_maxsize=_POOL_SIZE,
+                max_retries=_RETRY,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
         self.csrf_token: str | None = None
         self.last_authenticated: float | None = None
 
@@ -79,13 +115,14 @@ class TroostwatchHttpClient:
         )
         if header_token:
             return header_token
-        match = re.search(
-            r'name=["\']csrf-token["\']\s+content=["\']([^"\']+)',
-            response.text,
-            re.IGNORECASE,
-        )
-        if match:
-            return match.group(1)
+        # The meta tag sits in <head>; stop reading a streamed body once found.
+        body = bytearray()
+        for chunk in response.iter_content(_CSRF_CHUNK_SIZE):
+            start = max(0, len(body) - _CSRF_CHUNK_OVERLAP)
+            body += chunk
+            match = _CSRF_META_RE.search(body, start)
+            if match:
+                return match.group(1).decode("utf-8", "replace")
         return None
 
     def _store_session(self, path: Path) -> None:
@@ -95,14 +132,15 @@ class TroostwatchHttpClient:
             "obtained_at": self.last_authenticated or time.time(),
         }
         path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        # Write-then-rename so a crash never leaves a truncated token file.
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
 
     def _load_session(self, path: Path) -> StoredSession | None:
         if not path.exists():
             return None
-        with open(path, "r", encoding="utf-8") as f:
-            payload = json.load(f)
+        payload = json.loads(path.read_bytes())
         try:
             return StoredSession(
                 csrf_token=payload.get("csrf_token"),
@@ -119,11 +157,11 @@ class TroostwatchHttpClient:
 
     # -------------------- auth workflow --------------------
     def _session_active(self) -> bool:
-        if self.last_authenticated is None:
+        last = self.last_authenticated
+        if last is None:
             return False
-        return not StoredSession(None, {}, self.last_authenticated).is_expired(
-            self.session_timeout_seconds
-        )
+        timeout = self.session_timeout_seconds
+        return timeout <= 0 or (time.time() - last) <= timeout
 
     def authenticate(self, *, force: bool = False) -> None:
         """Ensure an authenticated session exists."""
@@ -149,9 +187,9 @@ class TroostwatchHttpClient:
 
     def _login(self, username: str, password: str) -> None:
         login_url = urljoin(self.base_url + "/", self.login_path.lstrip("/"))
-        page = self.session.get(login_url)
-        page.raise_for_status()
-        csrf = self._extract_csrf(page)
+        with self.session.get(login_url, stream=True) as page:
+            page.raise_for_status()
+            csrf = self._extract_csrf(page)
 
         payload = {"username": username, "email": username, "password": password}
         headers: dict[str, str] = {}
@@ -169,9 +207,7 @@ class TroostwatchHttpClient:
     def _prepare_headers(
         self, extra: Mapping[str, str | None] | None
     ) -> dict[str, str]:
-        from troostwatch import __version__
-
-        headers = {"User-Agent": f"troostwatch-client/{__version__}"}
+        headers = {"User-Agent": _USER_AGENT}
         if extra:
             # Filter out None values to satisfy mapping value type expectations
             headers.update({k: v for k, v in extra.items() if v is not None})
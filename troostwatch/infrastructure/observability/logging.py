@@ -8,9 +8,10 @@ from __future__ import annotations
 
 import logging
 import sys
+import threading
 from contextlib import contextmanager
 from contextvars import ContextVar
-from typing import Any, Iterator
+from typing import Any, Callable, Iterator
 
 
 # ---------------------------------------------------------------------------
@@ -18,17 +19,42 @@ from typing import Any, Iterator
 # ---------------------------------------------------------------------------
 
 _log_context: ContextVar[dict[str, Any]] = ContextVar("log_context", default={})
+# Record attribute holding the captured context.  Private, so callers remain
+# free to pass ``extra={"log_context": ...}`` (LogRecord keys in ``extra``
+# must not already exist on the record).
+_RECORD_ATTR = "_troostwatch_log_context"
 
 
 class ContextualFormatter(logging.Formatter):
-    """Formatter that appends context fields to log messages."""
+    """Formatter that appends context fields to log messages.
 
-    def format(self, record: logging.LogRecord) -> str:
-        ctx = _log_context.get()
+    The fields come from the private attribute that the record
+    factory installed by :func:`configure_logging` captures when the record
+    is created; the record itself is left untouched.
+    """
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        text = super().formatMessage(record)
+        ctx = getattr(record, _RECORD_ATTR, None)
+        if ctx is None:
+            ctx = _log_context.get()
         if ctx:
             ctx_str = " ".join(f"{k}={v}" for k, v in ctx.items())
-            record.msg = f"{record.msg} [{ctx_str}]"
-        return super().format(record)
+            return f"{text} [{ctx_str}]"
+        return text
+
+
+def _context_record_factory(
+    previous: Callable[..., logging.LogRecord],
+) -> Callable[..., logging.LogRecord]:
+    """Wrap ``previous`` so new records carry the active log context."""
+
+    def factory(*args: Any, **kwargs: Any) -> logging.LogRecord:
+        record = previous(*args, **kwargs)
+        setattr(record, _RECORD_ATTR, _log_context.get())
+        return record
+
+    return factory
 
 
 @contextmanager
@@ -42,6 +68,9 @@ def log_context(**fields: Any) -> Iterator[None]:
 
     Fields are merged with any existing context and restored on exit.
     """
+    if not fields:
+        yield
+        return
     current = _log_context.get()
     merged = {**current, **fields}
     token = _log_context.set(merged)
@@ -60,6 +89,9 @@ LogContext = log_context
 # ---------------------------------------------------------------------------
 
 _configured = False
+# Serialises configure_logging and the get_logger fallback so concurrent
+# start-up paths cannot install duplicate handlers.
+_configure_lock = threading.Lock()
 
 
 def configure_logging(
@@ -80,7 +112,15 @@ def configure_logging(
     global _configured
     if _configured:
         return
-    _configured = True
+    with _configure_lock:
+        if _configured:
+            return
+        _configure(level, third_party_level, use_json)
+        _configured = True
+
+
+def _configure(level: int, third_party_level: int, use_json: bool) -> None:
+    logging.setLogRecordFactory(_context_record_factory(logging.getLogRecordFactory()))
 
     # Root logger configuration
     root = logging.getLogger()
@@ -122,8 +162,12 @@ def get_logger(name: str) -> logging.Logger:
         A logging.Logger instance.
     """
     logger = logging.getLogger(name)
+    if _configured:
+        return logger
     # Fallback if configure_logging was not called
-    if not _configured and not logger.handlers and not logging.getLogger().handlers:
+    with _configure_lock:
+        if _configured or logger.handlers or logging.getLogger().handlers:
+            return logger
         handler = logging.StreamHandler()
         formatter = logging.Formatter(
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -147,11 +191,20 @@ def log_exception(
 ) -> None:
     """Log an exception with context fields.
 
+    The message is formatted only if the record is emitted; likewise, pass
+    ``%s`` arguments to logger calls (``logger.info("Synced %s", code)``)
+    rather than pre-formatted f-strings.
+
     Args:
         logger: Logger instance.
         message: Human-readable message describing the error.
         exc: The exception that was raised.
         **context: Additional context fields to include.
     """
+    if not logger.isEnabledFor(logging.ERROR):
+        return
+    if not context:
+        logger.exception("%s: %s", message, exc)
+        return
     with log_context(**context):
-        logger.exception(f"{message}: {exc}")
+        logger.exception("%s: %s", message, exc)
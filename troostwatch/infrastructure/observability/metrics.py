@@ -10,8 +10,11 @@ to use prometheus_client, but currently uses simple dictionaries.
 
 from __future__ import annotations
 
+import functools
+import sys
 import time
 import threading
+from bisect import bisect_left
 from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Mapping
@@ -22,45 +25,112 @@ from typing import Mapping
 # ---------------------------------------------------------------------------
 
 
+def _labels_to_key(
+    labels: Mapping[str, str | None] | None,
+) -> tuple[tuple[str, str | None], ...]:
+    """Return the sorted ``(name, value)`` key identifying a label set."""
+    if not labels:
+        return ()
+    items = tuple(labels.items())
+    try:
+        return _sorted_label_key(items)
+    except TypeError:  # unhashable label value
+        return tuple(sorted(items))
+
+
+@functools.lru_cache(maxsize=4096)
+def _sorted_label_key(
+    items: tuple[tuple[str, str | None], ...],
+) -> tuple[tuple[str, str | None], ...]:
+    # Label sets repeat constantly; intern the strings so every series key
+    # built for the same labels shares them.
+    return tuple(
+        sorted(
+            (sys.intern(name), sys.intern(value) if isinstance(value, str) else value)
+            for name, value in items
+        )
+    )
+
+
 @dataclass
 class Counter:
-    """A monotonically increasing counter."""
+    """A monotonically increasing counter.
+
+    Each writer thread increments its own shard, so ``inc`` takes no lock;
+    the lock only guards shard registration and reads.  Shards of exited
+    threads are folded into ``_retired`` on the next registration or read, so
+    read cost follows the number of live writer threads.
+    """
 
     name: str
     help_text: str = ""
-    _values: dict[tuple[tuple[str, str | None], ...], float] = field(
-        default_factory=lambda: defaultdict(float)
+    _shards: dict[
+        threading.Thread, dict[tuple[tuple[str, str | None], ...], float]
+    ] = field(default_factory=dict)
+    _retired: dict[tuple[tuple[str, str | None], ...], float] = field(
+        default_factory=dict
     )
+    _local: threading.local = field(default_factory=threading.local)
     _lock: threading.Lock = field(default_factory=threading.Lock)
 
     def inc(
         self, value: float = 1.0, labels: Mapping[str, str | None] | None = None
     ) -> None:
         """Increment the counter by the given value."""
-        key = self._labels_to_key(labels)
-        with self._lock:
-            self._values[key] += value
+        self.inc_key(_labels_to_key(labels), value)
+
+    def inc_key(
+        self, key: tuple[tuple[str, str | None], ...], value: float = 1.0
+    ) -> None:
+        """Increment the series for ``key``, a label tuple sorted by name."""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._local.shard = defaultdict(float)
+            with self._lock:
+                self._fold_exited()
+                self._shards[threading.current_thread()] = shard
+        # Only this thread writes to its shard, so no update is lost.
+        shard[key] += value
 
     def get(self, labels: Mapping[str, str | None] | None = None) -> float:
         """Get the current counter value."""
-        key = self._labels_to_key(labels)
+        key = _labels_to_key(labels)
         with self._lock:
-            return self._values[key]
+            self._fold_exited()
+            retired = self._retired.get(key, 0.0)
+            shards = list(self._shards.values())
+        return retired + sum(shard.get(key, 0.0) for shard in shards)
 
-    def _labels_to_key(
-        self, labels: Mapping[str, str | None] | None
-    ) -> tuple[tuple[str, str | None], ...]:
-        if labels is None:
-            return ()
-        return tuple(sorted(labels.items()))
+    def values(self) -> dict[tuple[tuple[str, str | None], ...], float]:
+        """Return the current value of every label set."""
+        with self._lock:
+            self._fold_exited()
+            totals = defaultdict(float, self._retired)
+            shards = list(self._shards.values())
+        for shard in shards:
+            for key, value in shard.copy().items():
+                totals[key] += value
+        return dict(totals)
+
+    def _fold_exited(self) -> None:
+        # Called with _lock held.  An exited thread no longer writes to its
+        # shard, so the shard can be merged into _retired and dropped.
+        for thread in [t for t in self._shards if not t.is_alive()]:
+            for key, value in self._shards.pop(thread).items():
+                self._retired[key] = self._retired.get(key, 0.0) + value
 
 
 @dataclass
 class Histogram:
     """A histogram for recording distributions of values.
 
-    Uses predefined buckets for simplicity. Values are accumulated into
-    buckets and a sum/count is maintained for average calculation.
+    Uses predefined buckets for simplicity. Each label set keeps one counter
+    per bucket (plus a final ``+Inf`` bucket) and a running count and sum, so
+    memory does not grow with the number of observations.  Like
+    :class:`Counter`, writer threads update their own shard without locking;
+    each shard maps a label key to ``[*bucket_counts, count, sum]`` and is
+    folded into ``_retired`` once its thread has exited.
     """
 
     name: str
@@ -78,38 +148,114 @@ class Histogram:
         5,
         10,
     )
-    _observations: dict[tuple[tuple[str, str | None], ...], list[float]] = field(
-        default_factory=lambda: defaultdict(list)
+    _shards: dict[
+        threading.Thread, dict[tuple[tuple[str, str | None], ...], list[float]]
+    ] = field(default_factory=dict)
+    _retired: dict[tuple[tuple[str, str | None], ...], list[float]] = field(
+        default_factory=dict
     )
+    _local: threading.local = field(default_factory=threading.local)
     _lock: threading.Lock = field(default_factory=threading.Lock)
 
     def observe(
         self, value: float, labels: Mapping[str, str | None] | None = None
     ) -> None:
         """Record an observation."""
-        key = self._labels_to_key(labels)
-        with self._lock:
-            self._observations[key].append(value)
+        self.observe_key(_labels_to_key(labels), value)
+
+    def observe_key(
+        self, key: tuple[tuple[str, str | None], ...], value: float
+    ) -> None:
+        """Record ``value`` for ``key``, a label tuple sorted by name."""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._fold_exited()
+                self._shards[threading.current_thread()] = shard
+        series = shard.get(key)
+        if series is None:
+            series = shard[key] = [0] * (len(self.buckets) + 3)
+        # Values equal to a bound belong to that bucket (Prometheus ``le``).
+        series[bisect_left(self.buckets, value)] += 1
+        series[-2] += 1
+        series[-1] += value
 
     def get_stats(self, labels: Mapping[str, str | None] | None = None) -> dict[str, float]:
         """Get summary statistics for the histogram."""
-        key = self._labels_to_key(labels)
+        series = self._merged(_labels_to_key(labels))
+        if series is None or not series[-2]:
+            return {"count": 0, "sum": 0.0, "avg": 0.0}
+        count, total = int(series[-2]), float(series[-1])
+        return {"count": count, "sum": total, "avg": total / count}
+
+    def get_buckets(
+        self, labels: Mapping[str, str | None] | None = None
+    ) -> list[tuple[str, int]]:
+        """Return cumulative ``(le, count)`` pairs, ending with ``+Inf``."""
+        series = self._merged(_labels_to_key(labels))
+        counts = series[:-2] if series else [0] * (len(self.buckets) + 1)
+        bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+        cumulative = 0
+        result = []
+        for bound, count in zip(bounds, counts):
+            cumulative += int(count)
+            result.append((bound, cumulative))
+        return result
+
+    def label_keys(self) -> list[tuple[tuple[str, str | None], ...]]:
+        """Return every label key observed so far."""
         with self._lock:
-            values = self._observations[key]
-            if not values:
-                return {"count": 0, "sum": 0.0, "avg": 0.0}
-            return {
-                "count": len(values),
-                "sum": sum(values),
-                "avg": sum(values) / len(values),
-            }
+            self._fold_exited()
+            keys = dict.fromkeys(self._retired)
+            shards = list(self._shards.values())
+        for shard in shards:
+            keys.update(dict.fromkeys(shard.copy()))
+        return list(keys)
+
+    def snapshot(self) -> dict[tuple[tuple[str, str | None], ...], list[float]]:
+        """Return ``[*bucket_counts, count, sum]`` for every label key at once."""
+        with self._lock:
+            self._fold_exited()
+            merged = {key: list(series) for key, series in self._retired.items()}
+            shards = list(self._shards.values())
+        for shard in shards:
+            for key, series in shard.copy().items():
+                total = merged.get(key)
+                if total is None:
+                    merged[key] = list(series)
+                else:
+                    merged[key] = [a + b for a, b in zip(total, series)]
+        return merged
+
+    def _merged(
+        self, key: tuple[tuple[str, str | None], ...]
+    ) -> list[float] | None:
+        with self._lock:
+            self._fold_exited()
+            retired = self._retired.get(key)
+            merged = list(retired) if retired is not None else None
+            shards = list(self._shards.values())
+        for shard in shards:
+            series = shard.get(key)
+            if series is None:
+                continue
+            if merged is None:
+                merged = list(series)
+            else:
+                merged = [a + b for a, b in zip(merged, series)]
+        return merged
 
-    def _labels_to_key(
-        self, labels: Mapping[str, str | None] | None
-    ) -> tuple[tuple[str, str | None], ...]:
-        if labels is None:
-            return ()
-        return tuple(sorted(labels.items()))
+    def _fold_exited(self) -> None:
+        # Called with _lock held; see Counter._fold_exited.
+        for thread in [t for t in self._shards if not t.is_alive()]:
+            for key, series in self._shards.pop(thread).items():
+                retired = self._retired.get(key)
+                if retired is None:
+                    self._retired[key] = list(series)
+                else:
+                    self._retired[key] = [a + b for a, b in zip(retired, series)]
 
 
 # ---------------------------------------------------------------------------
@@ -127,6 +273,11 @@ class MetricRegistry:
 
     def counter(self, name: str, help_text: str = "") -> Counter:
         """Get or create a counter."""
+        counter = self._counters.get(name)
+        if counter is not None:
+            return counter
+        # Only creation takes the lock, so racing creators share one instance
+        # and all_counters() sees a consistent dict.
         with self._lock:
             if name not in self._counters:
                 self._counters[name] = Counter(name=name, help_text=help_text)
@@ -139,6 +290,9 @@ class MetricRegistry:
         buckets: tuple[float, ...] | None = None,
     ) -> Histogram:
         """Get or create a histogram."""
+        histogram = self._histograms.get(name)
+        if histogram is not None:
+            return histogram
         with self._lock:
             if name not in self._histograms:
                 kwargs: dict[str, object] = {"name": name, "help_text": help_text}
@@ -242,17 +396,47 @@ EXTRACTED_CODES = "extracted_codes_total"
 CODE_APPROVALS = "code_approvals_total"
 
 
+# Metric objects used by the record_* helpers, resolved once.  The helpers
+# pass label keys already sorted by label name to inc_key/observe_key.
+_API_REQUESTS = _registry.counter(API_REQUESTS, "Total API requests")
+_API_REQUEST_DURATION = _registry.histogram(
+    API_REQUEST_DURATION, "API request duration in seconds"
+)
+_SYNC_RUNS = _registry.counter(SYNC_RUNS, "Total sync runs")
+_SYNC_RUN_DURATION = _registry.histogram(
+    SYNC_RUN_DURATION, "Sync run duration in seconds"
+)
+_SYNC_LOTS_PROCESSED = _registry.counter(
+    SYNC_LOTS_PROCESSED, "Total lots processed by sync"
+)
+_BIDS = _registry.counter(BIDS, "Total bid attempts")
+_IMAGE_DOWNLOADS = _registry.counter(IMAGE_DOWNLOADS, "Total image download attempts")
+_IMAGE_DOWNLOAD_DURATION = _registry.histogram(
+    IMAGE_DOWNLOAD_DURATION, "Image download duration in seconds"
+)
+_IMAGE_DOWNLOADS_BYTES = _registry.counter(
+    IMAGE_DOWNLOADS_BYTES, "Total bytes downloaded for images"
+)
+_IMAGE_ANALYSIS = _registry.counter(IMAGE_ANALYSIS, "Total image analysis operations")
+_IMAGE_ANALYSIS_DURATION = _registry.histogram(
+    IMAGE_ANALYSIS_DURATION, "Image analysis duration in seconds"
+)
+_EXTRACTED_CODES = _registry.counter(
+    EXTRACTED_CODES, "Total codes extracted from images"
+)
+_CODE_APPROVALS = _registry.counter(CODE_APPROVALS, "Total code approval events")
+
+
 def record_api_request(
     endpoint: str, method: str, status_code: int, duration: float
 ) -> None:
     """Record an API request with its outcome and duration."""
-    labels = {"endpoint": endpoint, "method": method, "status": str(status_code)}
-    increment_counter(API_REQUESTS, labels=labels, help_text="Total API requests")
-    observe_histogram(
-        API_REQUEST_DURATION,
-        duration,
-        labels={"endpoint": endpoint, "method": method},
-        help_text="API request duration in seconds",
+    _API_REQUESTS.inc_key(
+        (("endpoint", endpoint), ("method", method), ("status", str(status_code))),
+        1.0,
+    )
+    _API_REQUEST_DURATION.observe_key(
+        (("endpoint", endpoint), ("method", method)), duration
     )
 
 
@@ -260,32 +444,15 @@ def record_sync_run(
     auction_code: str, status: str, duration: float, lots_processed: int
 ) -> None:
     """Record a completed sync run."""
-    increment_counter(
-        SYNC_RUNS,
-        labels={"auction_code": auction_code, "status": status},
-        help_text="Total sync runs",
-    )
-    observe_histogram(
-        SYNC_RUN_DURATION,
-        duration,
-        labels={"auction_code": auction_code},
-        help_text="Sync run duration in seconds",
-    )
-    increment_counter(
-        SYNC_LOTS_PROCESSED,
-        value=float(lots_processed),
-        labels={"auction_code": auction_code},
-        help_text="Total lots processed by sync",
-    )
+    auction_key = (("auction_code", auction_code),)
+    _SYNC_RUNS.inc_key((("auction_code", auction_code), ("status", status)), 1.0)
+    _SYNC_RUN_DURATION.observe_key(auction_key, duration)
+    _SYNC_LOTS_PROCESSED.inc_key(auction_key, float(lots_processed))
 
 
 def record_bid(outcome: str, auction_code: str, lot_code: str) -> None:
     """Record a bid attempt with its outcome."""
-    increment_counter(
-        BIDS,
-        labels={"outcome": outcome, "auction_code": auction_code},
-        help_text="Total bid attempts",
-    )
+    _BIDS.inc_key((("auction_code", auction_code), ("outcome", outcome)), 1.0)
 
 
 def record_image_download(
@@ -298,23 +465,11 @@ def record_image_download(
         duration: Download time in seconds
         bytes_downloaded: Size of downloaded image
     """
-    increment_counter(
-        IMAGE_DOWNLOADS,
-        labels={"status": status},
-        help_text="Total image download attempts",
-    )
-    observe_histogram(
-        IMAGE_DOWNLOAD_DURATION,
-        duration,
-        labels={"status": status},
-        help_text="Image download duration in seconds",
-    )
+    status_key = (("status", status),)
+    _IMAGE_DOWNLOADS.inc_key(status_key, 1.0)
+    _IMAGE_DOWNLOAD_DURATION.observe_key(status_key, duration)
     if bytes_downloaded > 0:
-        increment_counter(
-            IMAGE_DOWNLOADS_BYTES,
-            value=float(bytes_downloaded),
-            help_text="Total bytes downloaded for images",
-        )
+        _IMAGE_DOWNLOADS_BYTES.inc_key((), float(bytes_downloaded))
 
 
 def record_image_analysis(
@@ -328,24 +483,11 @@ def record_image_analysis(
         duration: Analysis time in seconds
         codes_extracted: Number of codes extracted
     """
-    increment_counter(
-        IMAGE_ANALYSIS,
-        labels={"backend": backend, "status": status},
-        help_text="Total image analysis operations",
-    )
-    observe_histogram(
-        IMAGE_ANALYSIS_DURATION,
-        duration,
-        labels={"backend": backend},
-        help_text="Image analysis duration in seconds",
-    )
+    backend_key = (("backend", backend),)
+    _IMAGE_ANALYSIS.inc_key((("backend", backend), ("status", status)), 1.0)
+    _IMAGE_ANALYSIS_DURATION.observe_key(backend_key, duration)
     if codes_extracted > 0:
-        increment_counter(
-            EXTRACTED_CODES,
-            value=float(codes_extracted),
-            labels={"backend": backend},
-            help_text="Total codes extracted from images",
-        )
+        _EXTRACTED_CODES.inc_key(backend_key, float(codes_extracted))
 
 
 def record_code_approval(approval_type: str, code_type: str) -> None:
@@ -355,10 +497,8 @@ def record_code_approval(approval_type: str, code_type: str) -> None:
         approval_type: 'auto', 'manual', or 'rejected'
         code_type: 'ean', 'serial_number', 'model_number', 'product_code'
     """
-    increment_counter(
-        CODE_APPROVALS,
-        labels={"approval_type": approval_type, "code_type": code_type},
-        help_text="Total code approval events",
+    _CODE_APPROVALS.inc_key(
+        (("approval_type", approval_type), ("code_type", code_type)), 1.0
     )
 
 
@@ -367,10 +507,10 @@ def get_image_pipeline_stats() -> dict[str, object]:
 
     Returns a dictionary suitable for CLI display or API response.
     """
-    downloads = _registry.counter(IMAGE_DOWNLOADS)
-    analysis = _registry.counter(IMAGE_ANALYSIS)
-    codes = _registry.counter(EXTRACTED_CODES)
-    approvals = _registry.counter(CODE_APPROVALS)
+    downloads = _IMAGE_DOWNLOADS
+    analysis = _IMAGE_ANALYSIS
+    codes = _EXTRACTED_CODES
+    approvals = _CODE_APPROVALS
 
     return {
         "downloads": {
@@ -403,22 +543,30 @@ def get_image_pipeline_stats() -> dict[str, object]:
 # ---------------------------------------------------------------------------
 
 
+@functools.lru_cache(maxsize=4096)
+def _summary_label(key: tuple[tuple[str, str | None], ...]) -> str:
+    return ",".join(f"{k}={v}" for k, v in key) if key else "default"
+
+
 def get_metrics_summary() -> dict[str, object]:
     """Return a summary of all metrics for logging or API response."""
     result: dict[str, object] = {"counters": {}, "histograms": {}}
 
     for name, counter in _registry.all_counters().items():
-        values = {}
-        for key, value in counter._values.items():
-            label_str = ",".join(f"{k}={v}" for k, v in key) if key else "default"
-            values[label_str] = value
-        result["counters"][name] = values  # type: ignore[index]
+        result["counters"][name] = {  # type: ignore[index]
+            _summary_label(key): value for key, value in counter.values().items()
+        }
 
     for name, histogram in _registry.all_histograms().items():
         stats = {}
-        for key in histogram._observations:
-            label_str = ",".join(f"{k}={v}" for k, v in key) if key else "default"
-            stats[label_str] = histogram.get_stats(dict(key) if key else None)
+        # One merged snapshot per histogram instead of a lookup per series.
+        for key, series in histogram.snapshot().items():
+            count, total = int(series[-2]), float(series[-1])
+            stats[_summary_label(key)] = {
+                "count": count,
+                "sum": total,
+                "avg": total / count if count else 0.0,
+            }
         result["histograms"][name] = stats  # type: ignore[index]
 
     return result
@@ -427,30 +575,34 @@ def get_metrics_summary() -> dict[str, object]:
 def format_prometheus() -> str:
     """Format metrics in Prometheus text exposition format."""
     lines: list[str] = []
+    append = lines.append
 
     for name, counter in _registry.all_counters().items():
         if counter.help_text:
-            lines.append(f"# HELP {name} {counter.help_text}")
-        lines.append(f"# TYPE {name} counter")
-        for key, value in counter._values.items():
+            append(f"# HELP {name} {counter.help_text}")
+        append(f"# TYPE {name} counter")
+        for key, value in counter.values().items():
             if key:
                 label_str = ",".join(f'{k}="{v}"' for k, v in key)
-                lines.append(f"{name}{{{label_str}}} {value}")
+                append(f"{name}{{{label_str}}} {value}")
             else:
-                lines.append(f"{name} {value}")
+                append(f"{name} {value}")
 
     for name, histogram in _registry.all_histograms().items():
         if histogram.help_text:
-            lines.append(f"# HELP {name} {histogram.help_text}")
-        lines.append(f"# TYPE {name} histogram")
-        for key in histogram._observations:
-            stats = histogram.get_stats(dict(key) if key else None)
-            if key:
-                label_str = ",".join(f'{k}="{v}"' for k, v in key)
-                lines.append(f"{name}_count{{{label_str}}} {stats['count']}")
-                lines.append(f"{name}_sum{{{label_str}}} {stats['sum']}")
-            else:
-                lines.append(f"{name}_count {stats['count']}")
-                lines.append(f"{name}_sum {stats['sum']}")
+            append(f"# HELP {name} {histogram.help_text}")
+        append(f"# TYPE {name} histogram")
+        bounds = [f'le="{bound}"' for bound in histogram.buckets] + ['le="+Inf"']
+        # One merged snapshot per histogram instead of a lookup per series.
+        for key, series in histogram.snapshot().items():
+            label_str = ",".join(f'{k}="{v}"' for k, v in key)
+            prefix = f"{label_str}," if label_str else ""
+            cumulative = 0
+            for bound, count in zip(bounds, series[:-2]):
+                cumulative += int(count)
+                append(f"{name}_bucket{{{prefix}{bound}}} {cumulative}")
+            suffix = f"{{{label_str}}}" if label_str else ""
+            append(f"{name}_count{suffix} {int(series[-2])}")
+            append(f"{name}_sum{suffix} {float(series[-1])}")
 
     return "\n".join(lines)
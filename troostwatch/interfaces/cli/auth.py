@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from troostwatch.infrastructure.http import LoginCredentials, TroostwatchHttpClient
+if TYPE_CHECKING:
+    from troostwatch.infrastructure.http import TroostwatchHttpClient
 
 
 def build_http_client(
@@ -26,6 +28,11 @@ def build_http_client(
     if not username and not token_path:
         return None
 
+    from troostwatch.infrastructure.http import (
+        LoginCredentials,
+        TroostwatchHttpClient,
+    )
+
     creds = LoginCredentials(
         username=username,
         password=password,
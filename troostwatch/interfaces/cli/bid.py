@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import click
-from troostwatch.infrastructure.http import AuthenticationError
 from troostwatch.services.bidding import BidError, BiddingService
 
 from .auth import build_http_client
@@ -99,6 +98,8 @@ def bid(
         click.echo(f"Authentication failed: {exc}")
         return
 
+    from troostwatch.infrastructure.http import AuthenticationError
+
     if db_path:
         service = BiddingService.from_sqlite_path(
             client, db_path, api_base_url=api_base_url
@@ -12,9 +12,8 @@ from contextlib import contextmanager
 from contextlib import AbstractContextManager as ContextManager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TypeVar
+from typing import TYPE_CHECKING, TypeVar
 
-from troostwatch.infrastructure.http import TroostwatchHttpClient
 from troostwatch.infrastructure.db import (
     ensure_schema,
     get_connection,
@@ -32,6 +31,9 @@ from troostwatch.services.lots import LotManagementService, LotViewService
 
 from .auth import build_http_client
 
+if TYPE_CHECKING:
+    from troostwatch.infrastructure.http import TroostwatchHttpClient
+
 RepositoryT = TypeVar("RepositoryT", bound=BaseRepository)
 
 
@@ -49,13 +49,18 @@ def debug(ctx: click.Context, db_path: str) -> None:
 
 
 @debug.command(name="stats")
+@click.option(
+    "--approximate",
+    is_flag=True,
+    help="Use ANALYZE statistics instead of counting rows where available.",
+)
 @click.pass_context
-def stats_cmd(ctx: click.Context) -> None:
+def stats_cmd(ctx: click.Context, approximate: bool) -> None:
     """Show row counts for all tables in the database."""
     db_path = ctx.obj["db_path"]
     cli_context = build_cli_context(db_path)
     with cli_context.connect() as conn:
-        for entry in db_stats(conn):
+        for entry in db_stats(conn, approximate=approximate):
             console.print(f"{entry['table']}: {entry['rows']}")
 
 
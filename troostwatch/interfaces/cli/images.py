@@ -476,6 +476,12 @@ def openai_analyze(db_path: str, limit: int, images_dir: str | None) -> None:
     default=None,
     help="Maximum number of records to export.",
 )
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Decode token data in this many worker processes.",
+)
 @click.option(
     "--images-dir",
     type=click.Path(),
@@ -487,6 +493,7 @@ def export_tokens(
     output: str,
     include_reviewed: bool,
     limit: int | None,
+    workers: int | None,
     images_dir: str | None,
 ) -> None:
     """Export OCR token data for ML training.
@@ -505,6 +512,7 @@ def export_tokens(
         output_path=output,
         include_reviewed=include_reviewed,
         limit=limit,
+        workers=workers,
     )
 
     console.print()
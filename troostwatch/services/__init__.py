@@ -7,7 +7,17 @@ from .image_analysis import (  # noqa: F401
     ImageAnalysisService,
 )
 from .positions import PositionsService  # noqa: F401
-from .sync import *  # noqa: F401,F403
+from .sync import (  # noqa: F401
+    HttpFetcher,
+    PageResult,
+    RateLimiter,
+    RequestResult,
+    SyncRunResult,
+    compute_detail_hash,
+    compute_listing_hash,
+    sync_auction,
+    sync_auction_to_db,
+)
 from .sync_service import SyncService  # noqa: F401
 
 __all__ = [
@@ -16,20 +26,16 @@ __all__ = [
     "BidResult",
     "BiddingService",
     "DownloadStats",
+    "HttpFetcher",
     "ImageAnalysisService",
+    "PageResult",
     "PositionsService",
-] + [
-    name
-    for name in dir()
-    if not name.startswith("_")
-    and name
-    not in {
-        "AnalysisStats",
-        "BidError",
-        "BidResult",
-        "BiddingService",
-        "DownloadStats",
-        "ImageAnalysisService",
-        "PositionsService",
-    }
+    "RateLimiter",
+    "RequestResult",
+    "SyncRunResult",
+    "SyncService",
+    "compute_detail_hash",
+    "compute_listing_hash",
+    "sync_auction",
+    "sync_auction_to_db",
 ]
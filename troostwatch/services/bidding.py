@@ -4,15 +4,17 @@ from __future__ import annotations
 
 import sqlite3
 from contextlib import AbstractContextManager
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, Callable
 from urllib.parse import urljoin
 
 from troostwatch.infrastructure.db import ensure_schema, get_connection
 from troostwatch.infrastructure.db.repositories import BidRepository
-from troostwatch.infrastructure.http import AuthenticationError, TroostwatchHttpClient
 from troostwatch.infrastructure.observability import get_logger, log_context
 from troostwatch.services.dto import BidResultDTO
 
+if TYPE_CHECKING:
+    from troostwatch.infrastructure.http import TroostwatchHttpClient
+
 ConnectionFactory = Callable[[], AbstractContextManager[sqlite3.Connection]]
 
 # Re-export for backward compatibility
@@ -82,6 +84,8 @@ class BiddingService:
         if amount_eur <= 0:
             raise ValueError("Bid amount must be positive")
 
+        from troostwatch.infrastructure.http import AuthenticationError
+
         with log_context(
             auction_code=auction_code, lot_code=lot_code, buyer=buyer_label
         ):
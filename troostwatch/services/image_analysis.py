@@ -13,6 +13,8 @@ from __future__ import annotations
 
 import asyncio
 import json
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable, Literal, cast
@@ -770,6 +772,7 @@ class ImageAnalysisService(BaseService):
         output_path: str | Path,
         include_reviewed: bool = False,
         limit: int | None = None,
+        workers: int | None = None,
     ) -> int:
         """Export OCR token data for ML training.
 
@@ -777,18 +780,28 @@ class ImageAnalysisService(BaseService):
             output_path: Path for the output JSON file.
             include_reviewed: Include manually reviewed/labeled data.
             limit: Maximum number of records to export.
+            workers: Decode token payloads in this many worker processes
+                while rows are read. ``None`` or ``1`` decodes inline.
 
         Returns:
             Number of records exported.
         """
-        with self._connection_factory() as conn:
+        executor_cm: AbstractContextManager[Executor | None] = (
+            ProcessPoolExecutor(max_workers=workers)
+            if workers and workers > 1
+            else nullcontext()
+        )
+        with executor_cm as executor, self._connection_factory() as conn:
             token_repo = OcrTokenRepository(conn)
-            image_repo = LotImageRepository(conn)
 
             if include_reviewed:
-                records = token_repo.get_for_training(limit=limit or 10000)
+                records = token_repo.get_for_training(
+                    limit=limit or 10000, executor=executor
+                )
             else:
-                records = token_repo.get_all_for_export(limit=limit)
+                records = token_repo.get_all_for_export(
+                    limit=limit, executor=executor
+                )
 
             export_data: dict[str, Any] = {
                 "version": "1.0",
@@ -14,11 +14,11 @@ import threading
 import time
 from collections.abc import Iterable
 from dataclasses import dataclass
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable
 from urllib.parse import urlparse
 
-import aiohttp
-import requests
+if TYPE_CHECKING:
+    import aiohttp
 
 
 @dataclass
@@ -115,6 +115,8 @@ class HttpFetcher:
         return self.backoff_base_seconds * (2**attempt)
 
     def fetch_sync(self, url: str) -> RequestResult:
+        import requests
+
         host = self._host_from_url(url)
         self.rate_limiter.wait_sync(host)
         for attempt in range(self.retry_attempts):
@@ -141,6 +143,8 @@ class HttpFetcher:
     async def _fetch_once_async(
         self, session: aiohttp.ClientSession, url: str
     ) -> RequestResult:
+        import aiohttp
+
         host = self._host_from_url(url)
         await self.rate_limiter.wait_async(host)
         for attempt in range(self.retry_attempts):
@@ -170,6 +174,8 @@ class HttpFetcher:
         return RequestResult(url=url, text=None, error="Unknown error", status=None)
 
     async def _fetch_many_asyncio(self, urls: Iterable[str]) -> list[RequestResult]:
+        import aiohttp
+
         semaphore = asyncio.Semaphore(self.max_concurrent_requests)
 
         async def _bounded_fetch(
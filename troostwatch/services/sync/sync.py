@@ -10,12 +10,12 @@ import time
 from collections.abc import Iterable
 from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlsplit
 from urllib.request import Request, urlopen
 
 from troostwatch.infrastructure.db import (
-    ensure_core_schema,
     ensure_schema,
     get_connection,
     iso_utcnow,
@@ -24,8 +24,8 @@ from troostwatch.infrastructure.db.repositories import (
     AuctionRepository,
     LotImageRepository,
     LotRepository,
+    ParsedLot,
 )
-from troostwatch.infrastructure.http import TroostwatchHttpClient
 from troostwatch.infrastructure.web.parsers import (
     LotCardData,
     LotDetailData,
@@ -35,6 +35,9 @@ from troostwatch.infrastructure.web.parsers import (
     parse_lot_detail,
 )
 
+if TYPE_CHECKING:
+    from troostwatch.infrastructure.http import TroostwatchHttpClient
+
 from .fetcher import HttpFetcher, RequestResult
 
 
@@ -262,13 +265,6 @@ def _upsert_auction(
     return repo.upsert(auction_code, auction_url, auction_title, pagination_pages)
 
 
-def _choose_value(*values):
-    for value in values:
-        if value is not None:
-            return value
-    return None
-
-
 def _hash_payload(payload: dict) -> str:
     canonical = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=True)
     return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -334,23 +330,50 @@ def _upsert_lot(
     Returns:
         The lot ID if successful, None otherwise.
     """
-    repo = repository or LotRepository(conn)
-    lot_id = repo.upsert_from_parsed(
+    lot_ids = _upsert_lots(
+        conn,
         auction_id,
-        card,
-        detail,
-        listing_hash=listing_hash,
-        detail_hash=detail_hash,
-        last_seen_at=last_seen_at,
-        detail_last_seen_at=detail_last_seen_at,
+        [
+            ParsedLot(
+                card,
+                detail,
+                listing_hash=listing_hash,
+                detail_hash=detail_hash,
+                last_seen_at=last_seen_at,
+                detail_last_seen_at=detail_last_seen_at,
+            )
+        ],
+        repository=repository,
+        image_repository=image_repository,
     )
+    return lot_ids.get(card.lot_code)
+
+
+def _upsert_lots(
+    conn,
+    auction_id: int,
+    lots: list[ParsedLot],
+    *,
+    repository: LotRepository | None = None,
+    image_repository: LotImageRepository | None = None,
+) -> dict[str, int]:
+    """Upsert a batch of lots in one statement, then store their images.
+
+    Returns:
+        Mapping of lot code to lot ID.
+    """
+    repo = repository or LotRepository(conn)
+    lot_ids = repo.upsert_many_from_parsed(auction_id, lots)
 
     # Store image URLs if available
-    if lot_id and detail.image_urls:
-        img_repo = image_repository or LotImageRepository(conn)
-        img_repo.insert_images(lot_id, detail.image_urls)
+    img_repo = image_repository
+    for lot in lots:
+        lot_id = lot_ids.get(lot.card.lot_code)
+        if lot_id and lot.detail.image_urls:
+            img_repo = img_repo or LotImageRepository(conn)
+            img_repo.insert_images(lot_id, lot.detail.image_urls)
 
-    return lot_id
+    return lot_ids
 
 
 def sync_auction_to_db(
@@ -379,7 +402,6 @@ def sync_auction_to_db(
     discovered_page_urls: list[str] = []
 
     with get_connection(db_path) as conn:
-        ensure_core_schema(conn)
         ensure_schema(conn)
         auction_repo = AuctionRepository(conn)
         lot_repo = LotRepository(conn)
@@ -572,6 +594,7 @@ def sync_auction_to_db(
 
                     cards_needing_detail.append((card, listing_hash, detail_html))
 
+            detail_batch: list[ParsedLot] = []
             for card, listing_hash, detail_text in cards_needing_detail:
                 parsed_detail: LotDetailData
                 parsed_hash: str | None = None
@@ -593,19 +616,22 @@ def sync_auction_to_db(
                 if not dry_run and auction_id is not None:
                     detail_seen_at = iso_utcnow() if detail_text else None
                     last_seen = detail_seen_at or iso_utcnow()
-                    _upsert_lot(
-                        conn,
-                        auction_id,
-                        card,
-                        parsed_detail,
-                        listing_hash=listing_hash,
-                        detail_hash=parsed_hash,
-                        last_seen_at=last_seen,
-                        detail_last_seen_at=detail_seen_at or last_seen,
-                        repository=lot_repo,
+                    detail_batch.append(
+                        ParsedLot(
+                            card,
+                            parsed_detail,
+                            listing_hash=listing_hash,
+                            detail_hash=parsed_hash,
+                            last_seen_at=last_seen,
+                            detail_last_seen_at=detail_seen_at or last_seen,
+                        )
                     )
-                    lots_updated += 1
-                    _log(f"  Upserted lot {card.lot_code}", verbose, log_path)
+
+            if detail_batch and auction_id is not None:
+                _upsert_lots(conn, auction_id, detail_batch, repository=lot_repo)
+                lots_updated += len(detail_batch)
+                for lot in detail_batch:
+                    _log(f"  Upserted lot {lot.card.lot_code}", verbose, log_path)
 
             if not dry_run:
                 conn.commit()
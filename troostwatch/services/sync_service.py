@@ -2,10 +2,9 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING
 
-from troostwatch.infrastructure.http import TroostwatchHttpClient
 from troostwatch.infrastructure.db import (
-    ensure_core_schema,
     ensure_schema,
     get_connection,
     get_path_config,
@@ -23,6 +22,9 @@ from troostwatch.services.live_runner import (
 )
 from troostwatch.services.sync import SyncRunResult, sync_auction_to_db
 
+if TYPE_CHECKING:
+    from troostwatch.infrastructure.http import TroostwatchHttpClient
+
 
 @dataclass(frozen=True)
 class AuctionSelection:
@@ -287,7 +289,6 @@ class SyncService:
 
     def _load_auctions(self, *, include_inactive: bool) -> list[dict[str, str | None]]:
         with get_connection(self._db_path) as conn:
-            ensure_core_schema(conn)
             ensure_schema(conn)
             repository = AuctionRepository(conn)
             return repository.list(only_active=not include_inactive)
@@ -296,7 +297,6 @@ class SyncService:
         self, *, include_inactive: bool
     ) -> tuple[list[dict[str, str | None]], str | None]:
         with get_connection(self._db_path) as conn:
-            ensure_core_schema(conn)
             ensure_schema(conn)
             auction_repo = AuctionRepository(conn)
             preference_repo = PreferenceRepository(conn)